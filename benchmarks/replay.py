@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Reproduce sin pantalla una sesión grabada desde Herramientas > Grabar sesión y mide la
+# latencia de cada evento (cálculo, redibujo y total) por los mismos caminos que la interfaz.
+#   python benchmarks/replay.py sesion.jsonl.gz
+#   python benchmarks/replay.py sesion.jsonl.gz --speed recorded -o latencias.json
+#   python benchmarks/replay.py sesion.jsonl.gz --compare latencias.json
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('MPLBACKEND', 'Agg')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+COMPUTE = ('solve_worker', 'calculate_stages')
+REDRAW = ('update_plot',)
+WINDOW_ACTIONS = {
+    'press': '_slider_pressed',
+    'release': '_slider_released',
+    'reset': '_reset',
+    'revert': '_revert_to_valid',
+    'stages': '_calculate_and_plot_stages',
+    'rmin': '_calculate_rmin',
+}
+
+class _NoDialog:
+    # Sustituye al aviso modal: la reversión, si la hubo, viene grabada como evento propio
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def exec(self):
+        return 0
+
+def _window(header):
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    import ui.main_window
+    from ui.main_window import DistillationWindow
+    from utils.plotting import update_plot
+    from utils.session import build_model
+    ui.main_window.WarningDialog = _NoDialog
+    window = DistillationWindow()
+    window.resize(1160, 860)
+    window.show()
+    window.set_model(build_model(header['model']))
+    for param, value in header['state'].items():
+        if param in window.sliders:
+            window.sliders[param].setValue(int(round(value * 100)))
+    window.state.update(header['state'])
+    window.scheduler.wait()
+    app.processEvents()
+    update_plot(window)
+    app.processEvents()
+    return app, window
+
+def _dispatch(window, kind, payload):
+    from utils.session import build_model
+    if kind == 'param':
+        window.sliders[payload['param']].setValue(payload['value'])
+    elif kind == 'model':
+        window.set_model(build_model(payload))
+    elif kind == 'exact':
+        window.exact_checkbox.setChecked(payload['enabled'])
+    elif kind in WINDOW_ACTIONS:
+        getattr(window, WINDOW_ACTIONS[kind])()
+    else:
+        raise ValueError(f"Evento desconocido en la sesión: {kind}")
+
+def _totals():
+    from utils.profiling import PROFILER
+    return {name: item['total_s'] for name, item in PROFILER.summary().items()}
+
+def _delta(before, after, names):
+    return sum(after.get(name, 0.0) - before.get(name, 0.0) for name in names)
+
+def replay(path, speed='max'):
+    from utils.profiling import PROFILER
+    from utils.session import load_session
+    header, events = load_session(path)
+    app, window = _window(header)
+    PROFILER.reset()
+    PROFILER.enable()
+    samples = []
+    origin = time.perf_counter()
+    for t, kind, payload in events:
+        if speed == 'recorded':
+            # Respeta los tiempos grabados sin bloquear el bucle de eventos
+            while time.perf_counter() - origin < t:
+                app.processEvents()
+                time.sleep(0.001)
+        before = _totals()
+        start = time.perf_counter()
+        _dispatch(window, kind, payload)
+        window.scheduler.wait()
+        app.processEvents()
+        wall = time.perf_counter() - start
+        after = _totals()
+        samples.append((kind, _delta(before, after, COMPUTE), _delta(before, after, REDRAW), wall))
+    PROFILER.enable(False)
+    window.close()
+    return summarize(samples)
+
+def _percentiles(values):
+    values = np.asarray(values) * 1e3
+    return {f'p{p}_ms': float(np.percentile(values, p)) for p in PERCENTILES}
+
+def summarize(samples):
+    # Una sesión sin eventos (grabar y parar enseguida) no tiene percentiles que informar
+    if not samples:
+        return {'events': 0, 'results': {}}
+    groups = {'all': samples}
+    for sample in samples:
+        groups.setdefault(sample[0], []).append(sample)
+    results = {}
+    for name, group in groups.items():
+        _, compute, redraw, wall = zip(*group)
+        results[name] = {'events': len(group), 'compute': _percentiles(compute),
+                         'redraw': _percentiles(redraw), 'total': _percentiles(wall)}
+    return {'events': len(samples), 'results': results}
+
+def report(current):
+    if not current['events']:
+        print("La sesión no tiene eventos", file=sys.stderr)
+    for name, result in current['results'].items():
+        for metric in ('compute', 'redraw', 'total'):
+            values = " ".join(f"{result[metric][f'p{p}_ms']:8.2f}" for p in PERCENTILES)
+            print(f"{name:8s} {metric:8s} {result['events']:6d} {values} ms", file=sys.stderr)
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        for metric in ('compute', 'redraw', 'total'):
+            ratio = result[metric]['p95_ms'] / max(reference[metric]['p95_ms'], 1e-3)
+            marker = 'REGRESIÓN' if ratio > tolerance else ''
+            print(f"{name:8s} {metric:8s} p95 x{ratio:6.2f} {marker}", file=sys.stderr)
+            if ratio > tolerance:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce una sesión grabada y mide latencias")
+    parser.add_argument('session', help="Archivo de sesión (.jsonl.gz)")
+    parser.add_argument('--speed', choices=('max', 'recorded'), default='max',
+                        help="max: un evento tras otro; recorded: respetar los tiempos grabados")
+    parser.add_argument('-o', '--output', help="Archivo JSON de resultados")
+    parser.add_argument('--compare', help="Comparar el p95 con un resultado JSON anterior")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="Razón máxima admitida del p95")
+    args = parser.parse_args(argv)
+    current = replay(args.session, args.speed)
+    report(current)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            return 1
+    if not args.output:
+        json.dump(current, sys.stdout, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
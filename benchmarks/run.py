@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Banco de pruebas de rendimiento reproducible; funciona sin pantalla (Qt offscreen + Agg).
+#   python benchmarks/run.py -o resultados.json
+#   python benchmarks/run.py --compare benchmarks/baseline.json
+#   python benchmarks/run.py --save-baseline
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('MPLBACKEND', 'Agg')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+def measure(func, repeats, min_time=0.05):
+    # Cada repetición ejecuta la función las veces necesarias para superar min_time
+    func()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        samples.append((time.perf_counter() - start) / loops)
+    return {'median_s': statistics.median(samples), 'min_s': min(samples), 'loops': loops, 'repeats': repeats}
+
+def _window():
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    from ui.main_window import DistillationWindow
+    window = DistillationWindow()
+    window.resize(1160, 860)
+    window.canvas.draw()
+    return app, window
+
+# --- Solver ---------------------------------------------------------------------------
+
+STAGE_CASES = {
+    # Casos con un número de etapas creciente (Raoult)
+    'few': dict(R=2.0, q=0.5, xD=0.8, zF=0.5, xB=0.2, alpha=2.5),
+    'medium': dict(R=2.5, q=1.0, xD=0.95, zF=0.5, xB=0.05, alpha=2.0),
+    'capped': dict(R=0.8, q=1.0, xD=0.95, zF=0.5, xB=0.05, alpha=1.3),
+}
+
+def _spec(case):
+    from models.raoult import RaoultModel
+    from utils.solver import ColumnSpec
+    case = dict(case)
+    return ColumnSpec(model=RaoultModel(case.pop('alpha')), **case)
+
+for _label, _case in STAGE_CASES.items():
+    @benchmark(f'calculate_stages[{_label}]')
+    def _bench(case=_case):
+        from utils import solver
+        spec = _spec(case)
+        point = solver.intersection(spec)
+        return lambda: solver.step_stages(spec, point)
+
+@benchmark('find_curve_intersection')
+def _bench_intersection():
+    from utils import solver
+    spec = _spec(STAGE_CASES['few'])
+    return lambda: solver.curve_intersection(spec)
+
+@benchmark('calculate_rmin')
+def _bench_rmin():
+    from utils import solver
+    spec = _spec(STAGE_CASES['few'])
+    return lambda: solver.minimum_reflux(spec)
+
+# --- Modelos de equilibrio ------------------------------------------------------------
+
+X_EVAL = np.linspace(0, 1, 1000)
+
+@benchmark('calculate_y[raoult]')
+def _bench_raoult():
+    from models.raoult import RaoultModel
+    model = RaoultModel()
+    return lambda: model.calculate_y(X_EVAL)
+
+for _points in (10, 1000, 100000):
+    @benchmark(f'calculate_y[custom-{_points}]')
+    def _bench(points=_points):
+        from models.custom_data import CustomDataModel
+        from models.raoult import RaoultModel
+        x = np.linspace(0, 1, points)
+        model = CustomDataModel(x, RaoultModel().calculate_y(x))
+        return lambda: model.calculate_y(X_EVAL)
+
+@benchmark('calculate_y[peng-robinson]')
+def _bench_pr():
+    from models.peng_robinson import PengRobinsonModel
+    model = PengRobinsonModel()
+    return lambda: model.calculate_y(X_EVAL)
+
+@benchmark('peng-robinson[table-build]')
+def _bench_pr_build():
+    from models.peng_robinson import PengRobinsonModel, TABLE_POINTS
+    model = PengRobinsonModel()
+    x = np.linspace(0, 1, TABLE_POINTS)
+    return lambda: model.bubble_point(x)
+
+# --- Interfaz -------------------------------------------------------------------------
+
+@benchmark('update_plot[slider-tick]')
+def _bench_update_plot():
+    from utils.calculations import calculate_stages
+    from utils.plotting import update_plot
+    app, window = _window()
+    calculate_stages(window)
+    values = iter(np.tile(np.r_[np.arange(150, 300), np.arange(300, 150, -1)] / 100, 1 << 20))
+    def tick():
+        window.state['R'] = next(values)
+        window.solver_cache.invalidate()
+        calculate_stages(window)
+        update_plot(window)
+    return tick
+
+@benchmark('calculate_energy_balance')
+def _bench_energy():
+    from utils.energy_balance import calculate_energy_balance
+    app, window = _window()
+    return lambda: calculate_energy_balance(window)
+
+def run(selected=None, repeats=7):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if selected and not any(s in name for s in selected):
+            continue
+        results[name] = measure(setup(), repeats)
+        print(f"{name:32s} {results[name]['median_s'] * 1e6:12.1f} µs", file=sys.stderr)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+        },
+        'results': results,
+    }
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for name, result in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        ratio = result['median_s'] / reference['median_s']
+        marker = 'REGRESIÓN' if ratio > tolerance else ''
+        print(f"{name:32s} x{ratio:6.2f} {marker}", file=sys.stderr)
+        if ratio > tolerance:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los caminos críticos")
+    parser.add_argument('-k', dest='selected', action='append', help="Ejecutar solo los que contengan este texto")
+    parser.add_argument('-o', '--output', help="Archivo JSON de resultados")
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--compare', nargs='?', const=BASELINE, help="Comparar con una línea base JSON")
+    parser.add_argument('--tolerance', type=float, default=1.5, help="Razón máxima admitida frente a la línea base")
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args(argv)
+    current = run(args.selected, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.save_baseline:
+        with open(BASELINE, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            return 1
+    if not args.output and not args.save_baseline:
+        json.dump(current, sys.stdout, indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import numpy as np
+from utils.session import build_model
+
+# Entrada sin interfaz gráfica: resuelve archivos de casos sin importar PyQt6 ni pyplot.
+#   python -m cli solve casos.csv -o resultados.csv
+#   python main.py solve casos.json
+#   python main.py report casos.csv --pdf informe.pdf --table etapas.parquet
+#   python main.py sweep --R 0.9:5:42 --xB 0.05,0.1,0.2 -o barrido.csv
+
+CASE_FIELDS = ('R', 'q', 'xD', 'zF', 'xB')
+RESULT_FIELDS = ('valid', 'n_stages', 'feed_stage', 'x_int', 'y_int', 'rmin', 'tangent_pinch')
+
+def read_cases(path):
+    if path.lower().endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        return data['cases'] if isinstance(data, dict) else data
+    with open(path, newline='') as f:
+        return [{k: v for k, v in row.items() if v not in (None, '')} for row in csv.DictReader(f)]
+
+def build_models(cases, base_dir='.'):
+    # Especificación del modelo por caso (model = raoult | peng-robinson | custom, ver
+    # utils.session.build_model). Un mismo modelo (por huella) se comparte entre los casos
+    models, shared, parsed = [], {}, {}
+    for case in cases:
+        model = build_model(case, base_dir, cache=parsed)
+        models.append(shared.setdefault(model.fingerprint(), model))
+    return models
+
+def solve_cases(cases, base_dir='.', rmin=True):
+    from utils.batch import solve_batch
+    from utils.rmin import minimum_reflux
+    results = [None] * len(cases)
+    groups, models = {}, {}
+    for i, model in enumerate(build_models(cases, base_dir)):
+        key = model.fingerprint()
+        models.setdefault(key, model)
+        groups.setdefault(key, []).append(i)
+    for key, rows in groups.items():
+        model = models[key]
+        values = {f: np.array([float(cases[i][f]) for i in rows]) for f in CASE_FIELDS}
+        stages = solve_batch(values['R'], values['q'], values['xD'], values['zF'], values['xB'],
+                             model=model, trajectories=False)
+        pinch = minimum_reflux(model, values['q'], values['zF'], values['xD']) if rmin else None
+        for j, i in enumerate(rows):
+            results[i] = {
+                'valid': bool(stages.valid[j]),
+                'n_stages': int(stages.n_stages[j]),
+                'feed_stage': int(stages.feed_stage[j]),
+                'x_int': float(stages.intersection_x[j]),
+                'y_int': float(stages.intersection_y[j]),
+                'rmin': float(pinch.rmin[j]) if rmin else None,
+                'tangent_pinch': bool(pinch.tangent[j]) if rmin else None,
+            }
+    return results
+
+def write_results(path, cases, results):
+    rows = [dict(case, **result) for case, result in zip(cases, results)]
+    if path is None or path == '-':
+        writer = csv.DictWriter(sys.stdout, fieldnames=_fieldnames(rows))
+        writer.writeheader()
+        writer.writerows(rows)
+    elif path.lower().endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_fieldnames(rows))
+            writer.writeheader()
+            writer.writerows(rows)
+
+def parse_range(text):
+    # "0.5:5:46" -> 46 valores equiespaciados; "0.1,0.2" -> lista; "2.5" -> valor fijo
+    if ':' in text:
+        start, stop, num = text.split(':')
+        return np.linspace(float(start), float(stop), int(num))
+    if ',' in text:
+        return np.array([float(v) for v in text.split(',')])
+    return float(text)
+
+def run_sweep_command(args):
+    from utils.sweep import PARAMETERS, run_sweep, sweep_table
+    ranges = {p: getattr(args, p) for p in PARAMETERS if getattr(args, p) is not None}
+    spec = {'model': args.model, 'mixture': args.mixture, 'data': args.data}
+    # Raoult: alpha puede ser un eje del barrido; el resto de modelos fija la curva
+    model = None
+    if args.model != 'raoult':
+        if 'alpha' in ranges:
+            raise ValueError("alpha solo se puede barrer con el modelo de Raoult.")
+        model = build_model(spec)
+    result = run_sweep(ranges, model=model, max_workers=args.workers)
+    columns = sweep_table(ranges, result)
+    if model is not None:
+        del columns['alpha']
+    if args.output in (None, '-'):
+        writer = csv.writer(sys.stdout)
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+    else:
+        from utils.report import write_table
+        write_table(args.output, columns)
+    print(f"{result.feasible.size} puntos, {int(result.feasible.sum())} factibles", file=sys.stderr)
+    return 0
+
+def _fieldnames(rows):
+    names = []
+    for row in rows:
+        names.extend(k for k in row if k not in names)
+    return names
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='cli', description="Destilación binaria McCabe-Thiele sin interfaz gráfica")
+    commands = parser.add_subparsers(dest='command', required=True)
+    solve = commands.add_parser('solve', help="Resolver un archivo de casos (CSV o JSON)")
+    solve.add_argument('cases')
+    solve.add_argument('-o', '--output', default='-', help="CSV o JSON de salida (por defecto, stdout)")
+    solve.add_argument('--no-rmin', action='store_true', help="No calcular el reflujo mínimo")
+    report = commands.add_parser('report', help="Generar diagramas y tablas de etapas para un archivo de casos")
+    report.add_argument('cases')
+    report.add_argument('--pdf', help="PDF de varias páginas, una por caso")
+    report.add_argument('--png-dir', help="Directorio para un PNG por caso")
+    report.add_argument('--table', help="Tabla de etapas consolidada (CSV o Parquet)")
+    report.add_argument('--dpi', type=int, default=None)
+    report.add_argument('-j', '--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    sweep = commands.add_parser('sweep', help="Barrido paramétrico sobre una malla de parámetros")
+    for name in ('R', 'q', 'xD', 'zF', 'xB', 'alpha'):
+        sweep.add_argument(f'--{name}', type=parse_range,
+                           help="inicio:fin:puntos, lista separada por comas o valor fijo")
+    sweep.add_argument('--model', choices=('raoult', 'peng-robinson', 'custom'), default='raoult')
+    sweep.add_argument('--mixture', help="Mezcla para Peng-Robinson (p. ej. ethanol-water)")
+    sweep.add_argument('--data', help="CSV x, y para el modelo custom")
+    sweep.add_argument('-o', '--output', default='-', help="CSV o Parquet de salida (por defecto, stdout)")
+    sweep.add_argument('-j', '--workers', type=int, default=None, help="Procesos (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+    if args.command == 'sweep':
+        return run_sweep_command(args)
+    cases = read_cases(args.cases)
+    base_dir = os.path.dirname(os.path.abspath(args.cases))
+    if args.command == 'report':
+        from utils.report import REPORT_DPI, render_report
+        summary = render_report(cases, build_models(cases, base_dir), pdf=args.pdf, png_dir=args.png_dir,
+                                table=args.table, dpi=args.dpi or REPORT_DPI, max_workers=args.workers)
+        print(f"{len(cases)} casos, {sum(summary['valid'])} con solución", file=sys.stderr)
+        return 0
+    results = solve_cases(cases, base_dir=base_dir, rmin=not args.no_rmin)
+    write_results(args.output, cases, results)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
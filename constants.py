@@ -5,3 +5,11 @@ class Constants:
     INITIAL_VALUES = {
         'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2
     }
+    HVAP_LIGHT = 38.56  # kJ/mol, etanol
+    HVAP_HEAVY = 40.65  # kJ/mol, agua
+    FEED_FLOW = 1.0     # mol/s
+    PRESSURE = 101325   # Pa
+    LOG_HEIGHT = 40
+    PROFILE_LOG_HEIGHT = 160  # el desglose del perfilado ocupa varias líneas
+    SOLVER_CACHE_ENTRIES = 4096
+    SOLVER_CACHE_BYTES = 32 * 1024 * 1024
@@ -1,8 +1,11 @@
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import DistillationWindow
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("solve", "report", "sweep"):
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import DistillationWindow
     app = QApplication(sys.argv)
     window = DistillationWindow()
     window.show()
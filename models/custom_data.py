@@ -1,12 +1,69 @@
+import hashlib
 import numpy as np
 from scipy.interpolate import interp1d
 from models.equilibrium import EquilibriumModel
 
+def prepare_data(x_data, y_data, smooth=0):
+    # Ordena por x, promedia los x repetidos y, opcionalmente, suaviza con media móvil
+    # de 'smooth' puntos forzando después una curva no decreciente
+    x = np.asarray(x_data, dtype=float)
+    y = np.asarray(y_data, dtype=float)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[keep], y[keep]
+    x_unique, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+    y_mean = np.bincount(inverse, weights=y, minlength=len(x_unique)) / counts
+    if smooth and smooth > 1 and len(y_mean) > smooth:
+        kernel = np.ones(int(smooth)) / int(smooth)
+        padded = np.pad(y_mean, (int(smooth) // 2, (int(smooth) - 1) // 2), mode='edge')
+        y_mean = np.maximum.accumulate(np.convolve(padded, kernel, mode='valid'))
+    return x_unique, y_mean
+
 class CustomDataModel(EquilibriumModel):
-    def __init__(self, x_data, y_data):
-        self.x_data = np.array(x_data)
-        self.y_data = np.array(y_data)
-        self.interp = interp1d(self.x_data, self.y_data, kind='linear', fill_value="extrapolate")
+    def __init__(self, x_data, y_data, smooth=0, grid_points=None):
+        self.x_data, self.y_data = prepare_data(x_data, y_data, smooth)
+        if len(self.x_data) < 2:
+            raise ValueError("Se necesitan al menos 2 puntos válidos para ajustar la curva.")
+        self.grid_points = grid_points
+        if grid_points:
+            # Rejilla uniforme de tamaño fijo: la búsqueda es un índice directo, no una bisección
+            self.grid_x = np.linspace(self.x_data[0], self.x_data[-1], int(grid_points))
+            self.grid_y = np.interp(self.grid_x, self.x_data, self.y_data)
+            self.interp = interp1d(self.grid_x, self.grid_y, kind='linear', fill_value="extrapolate",
+                                   assume_sorted=True)
+        else:
+            self.interp = interp1d(self.x_data, self.y_data, kind='linear', fill_value="extrapolate",
+                                   assume_sorted=True)
+        self.inverse_interp = self._build_inverse()
+        digest = hashlib.sha1(np.ascontiguousarray(self.x_data, dtype=float).tobytes())
+        digest.update(np.ascontiguousarray(self.y_data, dtype=float).tobytes())
+        digest.update(repr((smooth, grid_points)).encode())
+        self.data_hash = digest.hexdigest()
+
+    def fingerprint(self):
+        return ('custom', self.data_hash)
+
+    def _build_inverse(self):
+        # Inversa monótona: se fuerza y no decreciente antes de invertir
+        x_sorted = self.interp.x
+        y_mono = np.maximum.accumulate(self.interp.y)
+        y_unique, first = np.unique(y_mono, return_index=True)
+        if len(y_unique) < 2:
+            return lambda y: np.full_like(np.asarray(y, dtype=float), x_sorted[0])
+        return interp1d(y_unique, x_sorted[first], kind='linear', fill_value="extrapolate", assume_sorted=True)
 
     def calculate_y(self, x):
+        if self.grid_points:
+            return self._grid_lookup(x)
         return self.interp(x)
+
+    def _grid_lookup(self, x):
+        x = np.asarray(x, dtype=float)
+        x0, x1 = self.grid_x[0], self.grid_x[-1]
+        n = len(self.grid_x) - 1
+        position = (x - x0) / (x1 - x0) * n
+        i = np.clip(np.floor(position).astype(np.int64), 0, n - 1)
+        t = position - i
+        return (self.grid_y[i] * (1 - t) + self.grid_y[i + 1] * t)[()]
+
+    def calculate_x(self, y):
+        return self.inverse_interp(y)
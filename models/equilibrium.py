@@ -1,13 +1,42 @@
-from dataclasses import dataclass
+import numpy as np
+from utils.profiling import timed
 
-@dataclass
-class StageData:
-    number: int
-    x_in: float
-    y_out: float
-    x_out: float
-    y_in: float
+# Registro por etapa: se almacena en arreglos estructurados contiguos en lugar de objetos
+STAGE_DTYPE = np.dtype([
+    ('number', np.int64),
+    ('x_in', np.float64),
+    ('y_out', np.float64),
+    ('x_out', np.float64),
+    ('y_in', np.float64),
+])
 
 class EquilibriumModel:
+    # Puntos de la tabla inversa x(y) que se construye una sola vez por modelo
+    INVERSE_POINTS = 2001
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'calculate_y' in cls.__dict__:
+            cls.calculate_y = timed('calculate_y')(cls.calculate_y)
+
     def calculate_y(self, x):
         raise NotImplementedError("Este método debe ser implementado por las subclases")
+
+    def fingerprint(self):
+        # Clave hashable del estado del modelo; las subclases con parámetros propios la redefinen
+        return (type(self).__name__, id(self), getattr(self, '_version', 0))
+
+    def calculate_x(self, y):
+        y_table, x_table = self._inverse_table()
+        return np.interp(y, y_table, x_table)
+
+    def _inverse_table(self):
+        if getattr(self, '_inverse', None) is None:
+            x = np.linspace(0, 1, self.INVERSE_POINTS)
+            y = np.maximum.accumulate(np.asarray(self.calculate_y(x), dtype=float))
+            self._inverse = (y, x)
+        return self._inverse
+
+    def invalidate(self):
+        self._inverse = None
+        self._version = getattr(self, '_version', 0) + 1
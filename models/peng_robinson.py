@@ -1,17 +1,142 @@
+import numpy as np
 from models.equilibrium import EquilibriumModel
+from models.properties import get_store
+from utils.curve_cache import load_curve, save_curve
+
+R_GAS = 8.314462618  # J/(mol K)
+SQRT2 = np.sqrt(2.0)
+TABLE_POINTS = 501
+
+# Tablas x-y ya generadas, compartidas entre instancias con la misma (mezcla, T, P); en disco
+# se guardan con utils.curve_cache para que volver a elegir una mezcla no las recalcule
+_TABLES = {}
+
+def cubic_roots(a2, a1, a0):
+    # Raíces reales mínima y máxima de Z^3 + a2 Z^2 + a1 Z + a0 = 0, en forma cerrada y vectorizada
+    a2, a1, a0 = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a2, a1, a0)))
+    p = a1 - a2 ** 2 / 3
+    q = 2 * a2 ** 3 / 27 - a2 * a1 / 3 + a0
+    disc = (q / 2) ** 2 + (p / 3) ** 3
+    shift = -a2 / 3
+    one_root = disc > 0
+    sq = np.sqrt(np.where(one_root, disc, 0.0))
+    t1 = np.cbrt(-q / 2 + sq) + np.cbrt(-q / 2 - sq)
+    p_neg = np.where(one_root, -1.0, np.minimum(p, -1e-300))
+    m = 2 * np.sqrt(-p_neg / 3)
+    theta = np.arccos(np.clip(3 * q / (p_neg * m), -1, 1)) / 3
+    t_max = m * np.cos(theta)
+    t_min = m * np.cos(theta + 2 * np.pi / 3)
+    z_min = np.where(one_root, t1, t_min) + shift
+    z_max = np.where(one_root, t1, t_max) + shift
+    return z_min, z_max
 
 class PengRobinsonModel(EquilibriumModel):
     def __init__(self, mixture='ethanol-water', T=300, P=101325):
+        # Curva x-y isobárica a P (punto de burbuja); T es la estimación inicial de temperatura
         self.mixture = mixture
         self.T = T
         self.P = P
         self.components = self._get_components(mixture)
+        self.x_table, self.y_table, self.T_table = self._table()
+
+    def fingerprint(self):
+        return ('peng-robinson', self.mixture, self.T, self.P)
 
     def _get_components(self, mixture):
-        if mixture == 'ethanol-water':
-            return {'c1': {'Tc': 513.9, 'Pc': 61.48e5, 'omega': 0.645},
-                    'c2': {'Tc': 647.1, 'Pc': 220.64e5, 'omega': 0.344}}
-        return {'c1': {'Tc': 0, 'Pc': 0, 'omega': 0}, 'c2': {'Tc': 0, 'Pc': 0, 'omega': 0}}
+        store = get_store()
+        light, heavy = store.split_mixture(mixture)
+        return {'c1': store.get(light), 'c2': store.get(heavy), 'kij': store.kij(light, heavy)}
+
+    def _table(self):
+        key = self.fingerprint()
+        if key not in _TABLES:
+            c1, c2 = self.components['c1'], self.components['c2']
+            disk_key = key + tuple(c[p] for c in (c1, c2) for p in ('Tc', 'Pc', 'omega')) + \
+                (self.components['kij'], TABLE_POINTS)
+            table = load_curve(disk_key)
+            if table is None:
+                x = np.linspace(0, 1, TABLE_POINTS)
+                T, y = self.bubble_point(x)
+                table = np.stack([x, y, T])
+                save_curve(disk_key, table)
+            # Vistas ndarray del memmap: np.interp sobre la subclase memmap es más lento
+            table = np.asarray(table)
+            _TABLES[key] = (table[0], table[1], table[2])
+        return _TABLES[key]
+
+    def _pure_parameters(self, T):
+        Tc = np.array([self.components['c1']['Tc'], self.components['c2']['Tc']])
+        Pc = np.array([self.components['c1']['Pc'], self.components['c2']['Pc']])
+        omega = np.array([self.components['c1']['omega'], self.components['c2']['omega']])
+        kappa = 0.37464 + 1.54226 * omega - 0.26992 * omega ** 2
+        T = np.asarray(T, dtype=float)[..., None]
+        alpha = (1 + kappa * (1 - np.sqrt(T / Tc))) ** 2
+        a = 0.45724 * R_GAS ** 2 * Tc ** 2 / Pc * alpha
+        b = 0.07780 * R_GAS * Tc / Pc
+        return a, np.broadcast_to(b, a.shape)
+
+    def ln_phi(self, z, T, phase):
+        # ln(phi_i) para composiciones z (..., 2) a temperaturas T (...); phase 'L' o 'V'
+        a, b = self._pure_parameters(T)
+        kij = self.components['kij']
+        a12 = np.sqrt(a[..., 0] * a[..., 1]) * (1 - kij)
+        sum_a = np.stack([z[..., 0] * a[..., 0] + z[..., 1] * a12,
+                          z[..., 0] * a12 + z[..., 1] * a[..., 1]], axis=-1)
+        a_mix = np.sum(z * sum_a, axis=-1)
+        b_mix = np.sum(z * b, axis=-1)
+        RT = R_GAS * np.asarray(T, dtype=float)
+        A = a_mix * self.P / RT ** 2
+        B = b_mix * self.P / RT
+        z_min, z_max = cubic_roots(-(1 - B), A - 3 * B ** 2 - 2 * B, -(A * B - B ** 2 - B ** 3))
+        Z = np.maximum(z_min, B * (1 + 1e-9)) if phase == 'L' else z_max
+        Z, A, B, a_mix, b_mix = (v[..., None] for v in (Z, A, B, a_mix, b_mix))
+        log_term = np.log((Z + (1 + SQRT2) * B) / (Z + (1 - SQRT2) * B))
+        return (b / b_mix * (Z - 1) - np.log(Z - B)
+                - A / (2 * SQRT2 * B) * (2 * sum_a / a_mix - b / b_mix) * log_term)
+
+    def _wilson_temperature(self, x):
+        Tc = np.array([self.components['c1']['Tc'], self.components['c2']['Tc']])
+        Pc = np.array([self.components['c1']['Pc'], self.components['c2']['Pc']])
+        omega = np.array([self.components['c1']['omega'], self.components['c2']['omega']])
+        T = np.full(x.shape[:-1], float(self.T))
+        for _ in range(50):
+            K = Pc / self.P * np.exp(5.373 * (1 + omega) * (1 - Tc / T[..., None]))
+            S = np.sum(K * x, axis=-1)
+            dS = np.sum(K * x * 5.373 * (1 + omega) * Tc / T[..., None] ** 2, axis=-1)
+            step = np.clip(-np.log(S) * S / dS, -50, 50)
+            T = T + step
+            if np.all(np.abs(step) < 1e-6):
+                break
+        return T
+
+    def bubble_point(self, x, tol=1e-10, max_iter=200):
+        # Temperatura y composición de vapor en el punto de burbuja, para todo el arreglo x a la vez
+        x1 = np.clip(np.asarray(x, dtype=float), 0, 1)
+        xz = np.stack([x1, 1 - x1], axis=-1)
+        T = self._wilson_temperature(xz)
+        Tc = np.array([self.components['c1']['Tc'], self.components['c2']['Tc']])
+        omega = np.array([self.components['c1']['omega'], self.components['c2']['omega']])
+        ln_phi_L = self.ln_phi(xz, T, 'L')
+        K = np.exp(ln_phi_L - self.ln_phi(xz, T, 'V'))
+        y = K * xz / np.sum(K * xz, axis=-1, keepdims=True)
+        active = np.ones(x1.shape, dtype=bool)
+        for _ in range(max_iter):
+            ln_phi_L = self.ln_phi(xz, T, 'L')
+            K = np.exp(ln_phi_L - self.ln_phi(y, T, 'V'))
+            S = np.sum(K * xz, axis=-1)
+            y_new = K * xz / S[..., None]
+            # Newton en T con la derivada aproximada de ln K de Wilson
+            dlnK = 5.373 * (1 + omega) * Tc / T[..., None] ** 2
+            step = np.clip(-np.log(S) / np.sum(y_new * dlnK, axis=-1), -20, 20)
+            T = np.where(active, T + step, T)
+            y = np.where(active[..., None], y_new, y)
+            active = active & ((np.abs(np.log(S)) > tol) | (np.abs(step) > 1e-8))
+            if not np.any(active):
+                break
+        return T, y[..., 0]
 
     def calculate_y(self, x):
-        return x  # Placeholder para implementación real
+        return np.interp(x, self.x_table, self.y_table)
+
+    def bubble_temperature(self, x):
+        return np.interp(x, self.x_table, self.T_table)
@@ -0,0 +1,144 @@
+import bisect
+import csv
+import os
+import threading
+import unicodedata
+import numpy as np
+
+# Base de propiedades de componentes puros y parámetros binarios, cargada de data/*.csv.
+# Unidades del CSV: Tc y Tb en K, Pc en bar, Hvap en kJ/mol (en Tb), Antoine con
+# log10(P/mmHg) = A - B / (C + T/°C). En memoria Pc se guarda en Pa.
+# El usuario puede añadir sus propios CSV con el mismo formato en DESTILACION_COMPONENTS y
+# DESTILACION_BINARY (varias rutas separadas por os.pathsep); un componente con el mismo
+# nombre que uno de la base lo reemplaza.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+COMPONENTS_FILE = os.path.join(DATA_DIR, 'components.csv')
+BINARY_FILE = os.path.join(DATA_DIR, 'binary_parameters.csv')
+NUMERIC_FIELDS = ('Tc', 'Pc', 'omega', 'Tb', 'Hvap', 'antoine_A', 'antoine_B', 'antoine_C')
+COMPONENT_FIELDS = ('name', 'alias', 'formula', 'cas') + NUMERIC_FIELDS
+BINARY_FIELDS = ('component_1', 'component_2', 'kij')
+MMHG = 133.322368  # Pa
+
+def normalize(text):
+    # Minúsculas y sin acentos, para buscar "acido" o "ácido" indistintamente
+    text = unicodedata.normalize('NFKD', str(text).strip().lower())
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+def read_rows(path, fields, numeric):
+    # Filas de un CSV con las columnas exigidas y los campos numéricos ya convertidos
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [name for name in fields if name not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"Faltan columnas en {path}: {', '.join(missing)}")
+        rows = list(reader)
+    for line, r in enumerate(rows, start=2):
+        for name in numeric:
+            try:
+                r[name] = float(r[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"Valor no numérico en {path}, línea {line}: {name} = {r[name]!r}") from None
+    return rows
+
+def user_files(variable):
+    return [path for path in os.environ.get(variable, '').split(os.pathsep) if path]
+
+class ComponentStore:
+    def __init__(self, components_path=COMPONENTS_FILE, binary_path=BINARY_FILE, user_components=(),
+                 user_binary=()):
+        merged = {}
+        for path in (components_path, *user_components):
+            for r in read_rows(path, COMPONENT_FIELDS, NUMERIC_FIELDS):
+                merged[normalize(r['name'])] = r
+        rows = list(merged.values())
+        self.names = [r['name'] for r in rows]
+        self.aliases = [r['alias'] for r in rows]
+        self.formulas = [r['formula'] for r in rows]
+        self.cas = [r['cas'] for r in rows]
+        # Propiedades por columnas: un arreglo estructurado indexado por fila
+        self.table = np.zeros(len(rows), dtype=[(name, float) for name in NUMERIC_FIELDS])
+        for name in NUMERIC_FIELDS:
+            self.table[name] = [r[name] for r in rows]
+        self.table['Pc'] *= 1e5
+        self.index = {}
+        for i in range(len(rows)):
+            for key in (self.names[i], self.aliases[i], self.cas[i]):
+                self.index.setdefault(normalize(key), i)
+        keys = {(normalize(k), i) for i in range(len(rows))
+                for k in (self.names[i], self.aliases[i], self.formulas[i], self.cas[i])}
+        self.search_keys = sorted(keys)
+        self.kij_table = {}
+        binary_paths = [binary_path] if os.path.exists(binary_path) else []
+        for path in binary_paths + list(user_binary):
+            for r in read_rows(path, BINARY_FIELDS, ('kij',)):
+                pair = frozenset((self.row(r['component_1']), self.row(r['component_2'])))
+                self.kij_table[pair] = r['kij']
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return normalize(name) in self.index
+
+    def row(self, name):
+        try:
+            return self.index[normalize(name)]
+        except KeyError:
+            raise ValueError(f"Componente desconocido: {name}") from None
+
+    def get(self, name):
+        i = self.row(name)
+        component = {field: float(self.table[field][i]) for field in NUMERIC_FIELDS}
+        component.update(name=self.names[i], alias=self.aliases[i], formula=self.formulas[i], cas=self.cas[i])
+        return component
+
+    def kij(self, a, b):
+        # Parámetro de interacción de Peng-Robinson; 0 si el par no tiene datos
+        return self.kij_table.get(frozenset((self.row(a), self.row(b))), 0.0)
+
+    def search(self, text, limit=50):
+        # Coincidencias por prefijo (bisección sobre las claves ordenadas) y luego por subcadena
+        query = normalize(text)
+        if not query:
+            return list(self.names[:limit])
+        found = []
+        start = bisect.bisect_left(self.search_keys, (query, -1))
+        for key, i in self.search_keys[start:]:
+            if not key.startswith(query):
+                break
+            if i not in found:
+                found.append(i)
+        for key, i in self.search_keys:
+            if query in key and i not in found:
+                found.append(i)
+        return [self.names[i] for i in found[:limit]]
+
+    def vapor_pressure(self, name, T):
+        # Presión de vapor de Antoine en Pa, con T en K
+        i = self.row(name)
+        A, B, C = (self.table[field][i] for field in ('antoine_A', 'antoine_B', 'antoine_C'))
+        return MMHG * 10 ** (A - B / (C + np.asarray(T, dtype=float) - 273.15))
+
+    def mixture_name(self, a, b):
+        # Nombre "ligero-pesado", ordenado por temperatura de ebullición normal
+        first, second = sorted((self.row(a), self.row(b)), key=lambda i: self.table['Tb'][i])
+        return f"{self.names[first]}-{self.names[second]}"
+
+    def split_mixture(self, mixture):
+        # "n-hexane-n-heptane" -> ("n-hexane", "n-heptane"): se prueba cada guion como separador
+        for position, char in enumerate(mixture):
+            if char == '-' and mixture[:position] in self and mixture[position + 1:] in self:
+                return self.names[self.row(mixture[:position])], self.names[self.row(mixture[position + 1:])]
+        raise ValueError(f"Mezcla sin parámetros para Peng-Robinson: {mixture}")
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+def get_store():
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ComponentStore(user_components=user_files('DESTILACION_COMPONENTS'),
+                                    user_binary=user_files('DESTILACION_BINARY'))
+        return _STORE
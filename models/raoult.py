@@ -1,3 +1,4 @@
+import numpy as np
 from models.equilibrium import EquilibriumModel
 from constants import Constants
 
@@ -5,8 +6,22 @@ class RaoultModel(EquilibriumModel):
     def __init__(self, alpha=Constants.RELATIVE_VOLATILITY):
         self.alpha = alpha
 
+    def fingerprint(self):
+        return ('raoult', float(self.alpha))
+
     def calculate_y(self, x):
         return (self.alpha * x) / (1 + (self.alpha - 1) * x)
 
+    def calculate_x(self, y):
+        if np.ndim(y) == 0:
+            a = self.alpha - (self.alpha - 1) * y
+            return y / a if abs(a) > 1e-4 else 0.0
+        y = np.asarray(y, dtype=float)
+        a = self.alpha - (self.alpha - 1) * y
+        safe = np.abs(a) > 1e-4
+        x = np.where(safe, y / np.where(safe, a, 1.0), 0.0)
+        return x[()]
+
     def set_alpha(self, alpha):
         self.alpha = alpha
+        self.invalidate()
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from models.custom_data import CustomDataModel
+from models.raoult import RaoultModel
+from utils import solver
+from utils.batch import solve_batch
+from utils.pinch_stepping import step_stages_exact
+
+def random_cases(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cases = (rng.uniform(0.05, 5, n), rng.uniform(-2, 3, n), rng.uniform(0.7, 0.95, n),
+             rng.uniform(0.27, 0.63, n), rng.uniform(0.05, 0.25, n), rng.uniform(1, 5, n))
+    cases[1][:10] = 1.0
+    return cases
+
+def test_batch_matches_scalar_solver():
+    R, q, xD, zF, xB, alpha = random_cases(400)
+    batch = solve_batch(R, q, xD, zF, xB, alpha)
+    for i in range(len(R)):
+        result = solver.solve(solver.ColumnSpec(R[i], q[i], xD[i], zF[i], xB[i], RaoultModel(alpha[i])))
+        n = result.n_stages
+        assert batch.valid[i] == result.valid
+        assert batch.n_stages[i] == n
+        assert (batch.intersection_x[i], batch.intersection_y[i]) == pytest.approx(result.intersection)
+        assert np.allclose(batch.x_out[i, :n], result.stages['x_out'])
+        assert np.allclose(batch.y_in[i, :n], result.stages['y_in'])
+
+def test_batch_with_model_matches_scalar_solver():
+    x = np.linspace(0, 1, 50)
+    model = CustomDataModel(x, RaoultModel(2.2).calculate_y(x))
+    R, q, xD, zF, xB, _ = random_cases(100, seed=1)
+    batch = solve_batch(R, q, xD, zF, xB, model=model)
+    for i in range(len(R)):
+        assert batch.n_stages[i] == solver.solve(solver.ColumnSpec(R[i], q[i], xD[i], zF[i], xB[i], model)).n_stages
+
+def test_batch_keeps_input_shape():
+    R = np.full((3, 4), 2.0)
+    batch = solve_batch(R, 0.5, 0.8, 0.5, 0.2, trajectories=False)
+    assert batch.n_stages.shape == (3, 4)
+    assert np.all(batch.n_stages == 5)
+
+@pytest.mark.parametrize('xB', [0.2, 0.05, 1e-6])
+def test_fractional_matches_exact_stepping(xB):
+    # También con xB casi nulo, donde el criterio |y_out - y| > 1e-3 frenaba el avance
+    batch = solve_batch(2.0, 0.5, 0.8, 0.5, xB, fractional=True, trajectories=False)
+    spec = solver.ColumnSpec(2.0, 0.5, 0.8, 0.5, xB, RaoultModel())
+    fractional = step_stages_exact(spec, solver.intersection(spec), accelerate=False)[1]
+    assert float(batch.fractional_stages) == pytest.approx(fractional, rel=1e-9)
@@ -0,0 +1,63 @@
+import csv
+import numpy as np
+import pytest
+import cli
+from utils import session
+
+def write_xy(path):
+    x = np.linspace(0, 1, 11)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['x', 'y'])
+        writer.writerows(zip(x, 2.5 * x / (1 + 1.5 * x)))
+
+def test_blank_cells_use_defaults():
+    model = session.build_model({'model': 'raoult', 'alpha': ''})
+    assert model.alpha == pytest.approx(2.5)
+    assert session.build_model({'model': '', 'alpha': '3'}).alpha == 3.0
+
+def test_custom_data_read_once(tmp_path, monkeypatch):
+    write_xy(tmp_path / 'datos.csv')
+    reads = []
+    read_xy = session._read_xy
+    monkeypatch.setattr(session, '_read_xy', lambda path: reads.append(path) or read_xy(path))
+    cases = [dict(R=R, q=0.5, xD=0.8, zF=0.5, xB=0.2, model='custom', data='datos.csv') for R in (1.5, 2.0, 3.0)]
+    models = cli.build_models(cases, base_dir=str(tmp_path))
+    assert len(reads) == 1
+    assert models[0] is models[1] is models[2]
+
+def test_solve_cases(tmp_path):
+    cases = [dict(R='2.0', q='0.5', xD='0.8', zF='0.5', xB='0.2'),
+             dict(R='0.5', q='0.5', xD='0.8', zF='0.5', xB='0.2', model='raoult', alpha='2.5')]
+    results = cli.solve_cases(cases)
+    assert results[0]['valid'] and results[0]['n_stages'] == 5
+    assert not results[1]['valid']
+    assert results[0]['rmin'] == pytest.approx(0.8324555, abs=1e-6)
+
+def test_main_solve(tmp_path):
+    path = tmp_path / 'casos.csv'
+    path.write_text("R,q,xD,zF,xB,alpha\n2.0,0.5,0.8,0.5,0.2,\n3.0,1.0,0.9,0.4,0.1,2.0\n")
+    output = tmp_path / 'resultados.csv'
+    assert cli.main(['solve', str(path), '-o', str(output)]) == 0
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['n_stages'] for row in rows][0] == '5'
+    assert len(rows) == 2
+
+def test_parse_range():
+    assert np.allclose(cli.parse_range('0.5:1:3'), [0.5, 0.75, 1.0])
+    assert np.allclose(cli.parse_range('0.1,0.2'), [0.1, 0.2])
+    assert cli.parse_range('2.5') == 2.5
+
+def test_main_sweep(tmp_path, capsys):
+    output = tmp_path / 'barrido.csv'
+    assert cli.main(['sweep', '--R', '1:3:5', '--xB', '0.1,0.2', '-j', '1', '-o', str(output)]) == 0
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10
+    assert rows[0]['R'] == '1.0' and rows[1]['xB'] == '0.2'
+    assert "10 puntos" in capsys.readouterr().err
+
+def test_sweep_rejects_alpha_for_other_models():
+    with pytest.raises(ValueError):
+        cli.main(['sweep', '--R', '1:3:3', '--alpha', '2,3', '--model', 'peng-robinson', '-j', '1'])
@@ -0,0 +1,44 @@
+import pytest
+from models.raoult import RaoultModel
+from utils import solver
+from utils.comparison import MAX_MODELS, ModelComparison
+
+STATE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+def test_entries_match_solver():
+    comparison = ModelComparison()
+    for alpha in (2.0, 2.5, 4.0):
+        comparison.add(RaoultModel(alpha))
+    entries = comparison.evaluate(STATE)
+    assert [entry.label for entry in entries] == [f"Raoult (α = {a:.2f})" for a in (2.0, 2.5, 4.0)]
+    for entry, slot in zip(entries, comparison.slots):
+        result = solver.solve(solver.ColumnSpec.from_state(STATE, slot.model))
+        assert entry.valid == result.valid
+        if result.valid:
+            assert entry.n_stages == result.n_stages
+        assert entry.rmin == pytest.approx(solver.minimum_reflux(solver.ColumnSpec.from_state(STATE, slot.model)))
+
+def test_slot_reuses_curve_and_rmin():
+    comparison = ModelComparison()
+    slot = comparison.add(RaoultModel(2.5))
+    first = comparison.evaluate(STATE)[0]
+    second = comparison.evaluate(dict(STATE, R=3.0, xB=0.1))[0]
+    assert second.x_curve is first.x_curve
+    assert len(slot.rmin) == 1 and len(slot.stages) == 2
+
+def test_model_is_copied():
+    model = RaoultModel(2.5)
+    comparison = ModelComparison()
+    comparison.add(model)
+    model.set_alpha(4.0)
+    assert comparison.slots[0].model.alpha == 2.5
+
+def test_add_rejects_duplicates_and_excess():
+    comparison = ModelComparison()
+    comparison.add(RaoultModel(2.5))
+    with pytest.raises(ValueError):
+        comparison.add(RaoultModel(2.5))
+    for i in range(1, MAX_MODELS):
+        comparison.add(RaoultModel(2.5 + i))
+    with pytest.raises(ValueError):
+        comparison.add(RaoultModel(10.0))
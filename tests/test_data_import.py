@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from models.custom_data import CustomDataModel, prepare_data
+from utils.data_import import ImportCancelled, read_xy_csv
+
+pytest.importorskip('pandas')
+
+def write_csv(path, rows, header="x,y"):
+    path.write_text(header + "\n" + "".join(f"{x},{y}\n" for x, y in rows))
+    return path
+
+def test_read_in_chunks_with_progress(tmp_path):
+    x = np.linspace(0, 1, 250)
+    path = write_csv(tmp_path / "datos.csv", zip(x, x ** 0.5))
+    fractions = []
+    x_read, y_read = read_xy_csv(path, chunk_rows=100, progress=fractions.append)
+    assert np.allclose(x_read, x) and np.allclose(y_read, x ** 0.5)
+    assert len(fractions) == 3
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+
+def test_non_numeric_rows_are_dropped(tmp_path):
+    path = write_csv(tmp_path / "datos.csv", [(0.1, 0.2), ("abc", 0.3), (0.5, ""), (0.9, 0.95)])
+    x, y = read_xy_csv(path)
+    assert x.tolist() == [0.1, 0.9] and y.tolist() == [0.2, 0.95]
+
+def test_cancel_between_chunks(tmp_path):
+    path = write_csv(tmp_path / "datos.csv", [(i / 300, i / 300) for i in range(300)])
+    calls = []
+    def cancelled():
+        calls.append(1)
+        return len(calls) == 2
+    with pytest.raises(ImportCancelled):
+        read_xy_csv(path, chunk_rows=100, cancelled=cancelled)
+    assert len(calls) == 2
+
+def test_missing_columns(tmp_path):
+    path = write_csv(tmp_path / "datos.csv", [(0.1, 0.2)], header="a,b")
+    with pytest.raises(ValueError):
+        read_xy_csv(path)
+
+def test_prepare_sorts_averages_and_drops_nan():
+    x, y = prepare_data([0.5, 0.1, 0.5, np.nan, 0.9], [0.6, 0.2, 0.8, 0.4, np.nan])
+    assert x.tolist() == [0.1, 0.5]
+    assert y == pytest.approx([0.2, 0.7])
+
+def test_smoothing_is_monotonic():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1, 200)
+    y = np.clip(x ** 0.5 + rng.normal(0, 0.05, x.size), 0, 1)
+    x_s, y_s = prepare_data(x, y, smooth=7)
+    assert np.array_equal(x_s, x)
+    assert np.all(np.diff(y_s) >= 0)
+    assert np.any(np.diff(prepare_data(x, y)[1]) < 0)
+
+def test_custom_model_needs_two_points():
+    with pytest.raises(ValueError):
+        CustomDataModel([0.5, 0.5, np.nan], [0.6, 0.7, 0.1])
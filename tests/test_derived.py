@@ -0,0 +1,73 @@
+from models.raoult import RaoultModel
+from utils import solver
+from utils.derived import NODES, DerivedState
+
+STATE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+def counting_state():
+    # Mismos nodos, pero contando las llamadas de cada uno
+    calls = {}
+    def counted(name, func):
+        def wrapper(*args):
+            calls[name] = calls.get(name, 0) + 1
+            return func(*args)
+        return wrapper
+    nodes = {name: (deps, counted(name, func)) for name, (deps, func) in NODES.items()}
+    derived = DerivedState(nodes)
+    derived.sync(STATE, RaoultModel())
+    return derived, calls
+
+def test_changing_R_keeps_curve_and_q_line():
+    derived, calls = counting_state()
+    for name in ('curve', 'q_line', 'intersection'):
+        derived.get(name)
+    curve, q_line = derived.get('curve'), derived.get('q_line')
+    derived.set('R', 3.0)
+    assert derived.get('curve') is curve
+    assert derived.get('q_line') is q_line
+    derived.get('intersection')
+    assert calls == {'curve': 1, 'q_line': 1, 'intersection': 2}
+
+def test_alpha_rebuilds_curve_not_q_line():
+    derived, calls = counting_state()
+    model = derived.get('model')
+    derived.get('curve'), derived.get('q_line')
+    model.set_alpha(3.0)
+    assert derived.set('model', model)
+    derived.get('curve'), derived.get('q_line')
+    assert calls == {'curve': 2, 'q_line': 1}
+
+def test_intersection_matches_solver():
+    derived, _ = counting_state()
+    spec = solver.ColumnSpec.from_state(STATE, RaoultModel())
+    assert derived.get('intersection') == solver.intersection(spec)
+    assert solver.operating_intersection(2.0, 0.5, 0.8, 0.5) == solver.intersection(spec)
+
+def test_set_same_value_keeps_version():
+    derived, _ = counting_state()
+    stamp = derived.stamp('duties')
+    assert not derived.set('R', 2.0)
+    assert derived.stamp('duties') == stamp
+    assert derived.set('energy', (30.0, 40.0, 2.0))
+    assert derived.stamp('duties') != stamp
+
+def test_notify_refreshes_only_dependent_views():
+    derived, _ = counting_state()
+
+    class View:
+        def __init__(self, *names):
+            self.depends_on = names
+            self.refreshed = 0
+
+        def refresh(self):
+            self.refreshed += 1
+
+    energy, stages = View('duties'), View('stages')
+    views = [energy, stages]
+    derived.notify(views)
+    derived.set('xB', 0.1)
+    derived.notify(views)
+    derived.touch('stages')
+    derived.notify(views)
+    derived.notify(views)
+    assert (energy.refreshed, stages.refreshed) == (2, 2)
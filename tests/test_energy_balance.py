@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+from utils.energy_balance import duties, energy_summary, flows
+
+def test_vectorized_matches_scalar():
+    rng = np.random.default_rng(0)
+    R = rng.uniform(0.5, 5, 50)
+    zF = rng.uniform(0.3, 0.6, 50)
+    xD = rng.uniform(0.7, 0.95, 50)
+    xB = rng.uniform(0.05, 0.25, 50)
+    batch = duties(R, zF, xD, xB)
+    for i in range(len(R)):
+        scalar = duties(float(R[i]), float(zF[i]), float(xD[i]), float(xB[i]))
+        for name in ('F', 'D', 'B', 'V', 'Q_R', 'Q_C'):
+            assert getattr(batch, name)[i] == pytest.approx(getattr(scalar, name), rel=1e-12)
+
+def test_scalar_path_values():
+    F, D, B = flows(0.5, 0.8, 0.2)
+    assert (F, D, B) == pytest.approx((1.0, 0.5, 0.5))
+    result = duties(2.0, 0.5, 0.8, 0.2, 38.56, 40.65, 1.0)
+    assert isinstance(result.Q_R, float)
+    assert result.V == pytest.approx(1.5)
+    assert result.Q_R == pytest.approx(1.5 * (0.2 * 40.65 + 0.8 * 38.56))
+    assert result.Q_C == pytest.approx(1.5 * (0.8 * 38.56 + 0.2 * 40.65))
+
+def test_broadcast_shapes():
+    # R en rejilla con composiciones escalares: todos los resultados con la forma de R
+    result = duties(np.linspace(0.5, 5, 7), 0.5, 0.8, 0.2)
+    for name in ('F', 'D', 'B', 'V', 'Q_R', 'Q_C'):
+        assert np.shape(getattr(result, name)) == (7,)
+
+def test_summary_ratio():
+    summary = energy_summary(duties(2.0, 0.5, 0.8, 0.2))
+    assert summary['Energy Ratio (Q_R/Q_C)'] == pytest.approx(1.0)
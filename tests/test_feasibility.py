@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from models.raoult import RaoultModel
+from utils.feasibility import (RANGES, VIEWS, FeasibilityCache, _evaluate, compute_feasibility, feasibility_key,
+                               iter_feasibility)
+
+STATE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+def brute_force(model, state, axes, size):
+    x = np.linspace(*RANGES[axes[0]], size)
+    y = np.linspace(*RANGES[axes[1]], size)
+    a, b = np.meshgrid(x, y, indexing='ij')
+    stages, feasible = _evaluate(model, state, axes, a.ravel(), b.ravel())
+    return stages.reshape(size, size), feasible.reshape(size, size)
+
+# Con R = 1 el mapa xD-xB también tiene frontera de factibilidad
+@pytest.mark.parametrize('view, R', [('R-q', 2.0), ('xD-xB', 1.0)])
+def test_refined_map_matches_full_grid(view, R):
+    axes, model, state = VIEWS[view], RaoultModel(2.5), dict(STATE, R=R)
+    result = compute_feasibility(model, state, axes, coarse=8, levels=2)
+    stages, feasible = brute_force(model, state, axes, 32)
+    assert result.complete is False and result.level == 2
+    assert 0 < feasible.mean() < 1
+    assert result.evaluated < feasible.size / 2
+    # La malla gruesa es exacta y el refinamiento deja muy pocos puntos heredados distintos
+    assert np.array_equal(result.feasible[::4, ::4], feasible[::4, ::4])
+    assert np.mean(result.feasible != feasible) < 0.03
+    both = result.feasible & feasible
+    assert np.mean(np.abs(result.n_stages[both] - stages[both]) > 2) < 0.03
+
+def test_levels_refine_only_boundary():
+    maps = list(iter_feasibility(RaoultModel(2.5), STATE, coarse=8, levels=3))
+    assert [m.level for m in maps] == [0, 1, 2, 3]
+    assert maps[-1].complete
+    counts = [m.evaluated for m in maps]
+    assert counts[0] == 64 and counts == sorted(counts)
+    assert counts[-1] < 64 ** 2 / 2
+
+def test_key_ignores_axes_and_rounds():
+    model = RaoultModel(2.5)
+    key = feasibility_key(model, STATE, VIEWS['R-q'])
+    assert feasibility_key(model, dict(STATE, R=4.0, q=1.5), VIEWS['R-q']) == key
+    assert feasibility_key(model, dict(STATE, xD=0.80000001), VIEWS['R-q']) == key
+    assert feasibility_key(model, dict(STATE, xD=0.81), VIEWS['R-q']) != key
+    assert feasibility_key(RaoultModel(3.0), STATE, VIEWS['R-q']) != key
+    assert feasibility_key(model, STATE, VIEWS['xD-xB']) != key
+
+def test_cache_lru_and_invalidate():
+    cache = FeasibilityCache(max_entries=2)
+    a, b = (('raoult', 2.5), 'R-q', ()), (('raoult', 3.0), 'R-q', ())
+    cache.put(a, 'A')
+    cache.put(b, 'B')
+    assert cache.get(a) == 'A'
+    cache.put((('raoult', 4.0), 'R-q', ()), 'C')
+    assert cache.get(b) is None and cache.get(a) == 'A'
+    cache.invalidate(('raoult', 2.5))
+    assert cache.get(a) is None and len(cache.entries) == 1
+    cache.invalidate()
+    assert not cache.entries
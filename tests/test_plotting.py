@@ -0,0 +1,58 @@
+import os
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+
+@pytest.fixture(scope='module')
+def window():
+    from ui.main_window import DistillationWindow
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    window = DistillationWindow()
+    window.show()
+    app.processEvents()
+    yield window
+    window.close()
+
+def test_savefig_keeps_blit_background(window, tmp_path):
+    # Exportar no debe dibujar sobre el lienzo PDF ni sustituir el fondo de la pantalla
+    window._calculate_and_plot_stages()
+    extents = window.background.get_extents()
+    window.fig.savefig(tmp_path / 'columna.pdf')
+    window.fig.savefig(tmp_path / 'columna.png', dpi=50)
+    assert (tmp_path / 'columna.pdf').stat().st_size > 0
+    assert window.background.get_extents() == extents
+
+def test_energy_window_sets_energy_on_edit(window):
+    # Redibujar no escribe la entrada compartida; editar los campos sí
+    window.open_energy_balance_window()
+    energy_window, derived = window.energy_window, window.derived
+    energy = derived.get('energy')
+    version = derived.versions['energy']
+    energy_window.refresh()
+    assert derived.versions['energy'] == version
+    energy_window.feed_flow_input.setText("2.5")
+    assert derived.get('energy') == energy[:2] + (2.5,)
+    assert energy_window.result_text.toPlainText()
+    energy_window.feed_flow_input.setText("-1")
+    assert derived.get('energy')[2] == 2.5
+    energy_window.close()
+
+def test_comparison_panel_reports_failures(window, monkeypatch):
+    # Un error en el hilo de trabajo debe llegar a la etiqueta de estado
+    window._toggle_comparison(True)
+    panel = window.comparison_panel
+    panel.timer.stop()
+    def fail(state, slots=None):
+        raise ValueError("modelo roto")
+    monkeypatch.setattr(panel.comparison, 'evaluate', fail)
+    panel._submit()
+    panel.pool.waitForDone()
+    QtWidgets.QApplication.processEvents()
+    assert panel.status_label.text() == "Error al comparar modelos: modelo roto"
+    monkeypatch.undo()
+    panel._submit()
+    panel.pool.waitForDone()
+    QtWidgets.QApplication.processEvents()
+    assert panel.status_label.text().startswith("1 modelos")
+    window._toggle_comparison(False)
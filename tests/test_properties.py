@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from models.properties import ComponentStore, normalize
+from utils import curve_cache
+
+COLUMNS = "name,alias,formula,cas,Tc,Pc,omega,Tb,Hvap,antoine_A,antoine_B,antoine_C\n"
+
+@pytest.fixture(scope='module')
+def store():
+    return ComponentStore()
+
+def test_lookup_by_name_alias_and_cas(store):
+    ethanol = store.get('ethanol')
+    assert store.get('etanol')['name'] == 'ethanol'
+    assert store.get(ethanol['cas'])['name'] == 'ethanol'
+    # Pc se guarda en Pa
+    assert ethanol['Pc'] == pytest.approx(61.48e5, rel=1e-3)
+    with pytest.raises(ValueError):
+        store.get('unobtainium')
+
+def test_search(store):
+    assert normalize('Ácido') == 'acido'
+    assert store.search('ethan')[0] in ('ethane', 'ethanol')
+    assert 'ethanol' in store.search('C2H6O')
+    assert len(store.search('', limit=5)) == 5
+
+def test_kij(store):
+    assert store.kij('ethanol', 'water') == store.kij('water', 'ethanol') == pytest.approx(-0.11)
+    assert store.kij('benzene', 'toluene') == 0.0
+
+def test_user_components_override(tmp_path):
+    path = tmp_path / 'propios.csv'
+    path.write_text(COLUMNS + "mycomp,micomp,C9X,999-99-9,600,30,0.3,420,40,7.0,1600,210\n"
+                    "ethanol,etanol,C2H6O,64-17-5,500,60,0.6,351.4,38.56,8.2,1642.9,230.3\n")
+    binary = tmp_path / 'kij.csv'
+    binary.write_text("component_1,component_2,kij\nmycomp,water,0.05\n")
+    base = ComponentStore()
+    store = ComponentStore(user_components=[path], user_binary=[binary])
+    assert len(store) == len(base) + 1
+    assert store.get('micomp')['Tc'] == 600
+    assert store.get('ethanol')['Tc'] == 500
+    assert store.kij('mycomp', 'water') == 0.05
+
+def test_user_file_errors(tmp_path):
+    missing = tmp_path / 'incompleto.csv'
+    missing.write_text("name,Tc\nx,1\n")
+    with pytest.raises(ValueError, match="Faltan columnas"):
+        ComponentStore(user_components=[missing])
+    bad = tmp_path / 'malo.csv'
+    bad.write_text(COLUMNS + "x,x,X,1-1-1,abc,30,0.3,420,40,7.0,1600,210\n")
+    with pytest.raises(ValueError, match="no numérico"):
+        ComponentStore(user_components=[bad])
+
+def test_curve_cache_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setenv('DESTILACION_CACHE', str(tmp_path))
+    key = ('peng-robinson', 'ethanol-water', 300.0)
+    assert curve_cache.load_curve(key) is None
+    table = np.random.default_rng(0).random((3, 50))
+    curve_cache.save_curve(key, table)
+    assert np.array_equal(curve_cache.load_curve(key), table)
+    assert curve_cache.load_curve(key + (1,)) is None
+    assert [p.suffix for p in tmp_path.iterdir()] == ['.npy']
+
+def test_failed_save_leaves_no_temporary(tmp_path, monkeypatch):
+    monkeypatch.setenv('DESTILACION_CACHE', str(tmp_path))
+    def fail(*args, **kwargs):
+        raise OSError("disco lleno")
+    monkeypatch.setattr(np, 'save', fail)
+    curve_cache.save_curve(('k',), np.zeros((3, 2)))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from models.custom_data import CustomDataModel
+from models.raoult import RaoultModel
+from utils.rmin import minimum_reflux
+
+# Etanol-agua a 1 atm: la curva se acerca a la diagonal cerca del azeótropo y el pinch
+# de reflujo mínimo es tangente, no el corte con la línea q
+ETHANOL_X = [0, 0.019, 0.0721, 0.0966, 0.1238, 0.1661, 0.2337, 0.2608, 0.3273, 0.3965, 0.5079,
+             0.5198, 0.5732, 0.6763, 0.7472, 0.8943, 1]
+ETHANOL_Y = [0, 0.17, 0.3891, 0.4375, 0.4704, 0.5089, 0.5445, 0.558, 0.5826, 0.6122, 0.6564,
+             0.6599, 0.6841, 0.7385, 0.7815, 0.8943, 1]
+
+def test_raoult_pinch_at_q_line():
+    result = minimum_reflux(RaoultModel(), 0.5, 0.5, 0.8)
+    assert not result.tangent
+    assert (result.x_pinch, result.y_pinch) == pytest.approx((result.x_q, result.y_q))
+    # Pendiente de la recta de operación que pasa por (xD, xD) y el corte con la línea q
+    slope = (0.8 - result.y_q) / (0.8 - result.x_q)
+    assert result.rmin == pytest.approx(slope / (1 - slope))
+    assert result.rmin == pytest.approx(0.8324555, abs=1e-6)
+
+def test_tangent_pinch():
+    model = CustomDataModel(np.array(ETHANOL_X), np.array(ETHANOL_Y))
+    xD = 0.85
+    result = minimum_reflux(model, 1.0, 0.3, xD)
+    assert result.tangent
+    assert result.x_q < result.x_pinch < xD
+    q_line_slope = (xD - result.y_q) / (xD - result.x_q)
+    assert result.rmin > q_line_slope / (1 - q_line_slope)
+    # Con Rmin la recta de operación toca la curva sin cruzarla entre la alimentación y xD
+    x = np.linspace(result.x_q, xD, 500)
+    line = xD + result.rmin / (result.rmin + 1) * (x - xD)
+    assert np.all(line <= np.asarray(model.calculate_y(x)) + 1e-3)
+
+def test_vectorized_matches_scalar():
+    q = np.array([0.0, 0.5, 1.0, 1.5])
+    zF = np.array([0.4, 0.5, 0.5, 0.6])
+    batch = minimum_reflux(RaoultModel(), q, zF, 0.8)
+    assert batch.rmin.shape == q.shape
+    for i in range(len(q)):
+        assert batch.rmin[i] == pytest.approx(minimum_reflux(RaoultModel(), q[i], zF[i], 0.8).rmin, rel=1e-9)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from models.raoult import RaoultModel
+from utils import solver
+from utils.pinch_stepping import step_stages_exact
+from utils.sensitivity import DERIVATIVE_OUTPUTS, OUTPUTS, sensitivity, sensitivity_table
+
+BASE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+def stages(**changes):
+    spec = solver.ColumnSpec.from_state(dict(BASE, **changes), RaoultModel())
+    return step_stages_exact(spec, solver.intersection(spec), accelerate=False)[1]
+
+def test_base_and_derivative():
+    result = sensitivity(BASE, RaoultModel())
+    assert result.parameters == ('R', 'q', 'xD', 'zF', 'xB', 'alpha')
+    assert result.base['fractional_stages'] == pytest.approx(4.2193837, abs=1e-6)
+    # Diferencia central frente a dos escalonados exactos independientes
+    manual = (stages(zF=0.501) - stages(zF=0.499)) / 0.002
+    assert result.derivatives['fractional_stages'][3] == pytest.approx(manual, rel=1e-6)
+    assert manual == pytest.approx(-3.7944, abs=1e-3)
+
+def test_swings_stay_in_range():
+    # xB = 0.002: el -Δ de 0.02 dejaría xB negativo y se recorta al margen
+    result = sensitivity(dict(BASE, xB=0.002), RaoultModel())
+    i = result.parameters.index('xB')
+    assert 0 < result.swing_low[i] < 0.002
+    assert result.swing_high[i] == pytest.approx(0.02)
+    assert np.isfinite(result.low['fractional_stages'][i])
+    assert np.isfinite(result.derivatives['fractional_stages']).all()
+
+def test_infeasible_cases_stay_nan():
+    # Cerca de Rmin el caso R-Δ no tiene solución: se informa NaN, no cero
+    result = sensitivity(dict(BASE, R=0.9), RaoultModel())
+    assert np.isnan(result.low['fractional_stages'][0])
+    assert np.isfinite(result.high['fractional_stages'][0])
+
+def test_feed_stage_reported_as_step_count():
+    result = sensitivity(BASE, RaoultModel())
+    assert 'feed_stage' not in result.derivatives
+    assert np.array_equal(result.feed_shift, result.high['feed_stage'] - result.low['feed_stage'])
+    assert np.all(result.feed_shift == np.round(result.feed_shift))
+
+def test_table_columns():
+    result = sensitivity(BASE, RaoultModel())
+    table = sensitivity_table(result)
+    assert table['parameter'] == list(result.parameters)
+    for output in OUTPUTS:
+        assert f'{output}_low' in table
+    for output in DERIVATIVE_OUTPUTS:
+        assert f'd_{output}' in table
+    assert all(len(column) == len(result.parameters) for column in table.values())
@@ -0,0 +1,63 @@
+import gzip
+import json
+import os
+import numpy as np
+import pytest
+from models.custom_data import CustomDataModel
+from models.peng_robinson import PengRobinsonModel
+from models.raoult import RaoultModel
+from utils.session import SessionRecorder, build_model, load_session, model_spec
+
+STATE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+@pytest.mark.parametrize('model', [
+    RaoultModel(3.0),
+    PengRobinsonModel(),
+    CustomDataModel(np.linspace(0, 1, 11), RaoultModel().calculate_y(np.linspace(0, 1, 11))),
+])
+def test_model_spec_round_trip(model):
+    spec = json.loads(json.dumps(model_spec(model)))
+    assert build_model(spec).fingerprint() == model.fingerprint()
+
+def test_save_and_load(tmp_path):
+    recorder = SessionRecorder(STATE, RaoultModel())
+    recorder.record('press')
+    recorder.record('param', {'param': 'R', 'value': 250})
+    recorder.record('release')
+    path = tmp_path / 'sesion.jsonl.gz'
+    recorder.save(path)
+    header, events = load_session(path)
+    assert header['state'] == STATE
+    assert header['model'] == {'model': 'raoult', 'alpha': 2.5}
+    assert [kind for _, kind, _ in events] == ['press', 'param', 'release']
+    assert events[1][2] == {'param': 'R', 'value': 250}
+    assert all(a[0] <= b[0] for a, b in zip(events, events[1:]))
+
+def test_unsupported_version(tmp_path):
+    path = tmp_path / 'sesion.jsonl.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps({'version': 99}) + "\n")
+    with pytest.raises(ValueError):
+        load_session(path)
+
+def test_summarize_empty_session():
+    from benchmarks.replay import summarize
+    assert summarize([]) == {'events': 0, 'results': {}}
+    summary = summarize([('param', 0.001, 0.002, 0.004), ('param', 0.002, 0.002, 0.005)])
+    assert summary['events'] == 2
+    assert set(summary['results']) == {'all', 'param'}
+
+def test_replay(tmp_path):
+    pytest.importorskip('PyQt6.QtWidgets')
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from benchmarks.replay import replay
+    recorder = SessionRecorder(STATE, RaoultModel())
+    for kind, payload in (('stages', None), ('press', None), ('param', {'param': 'R', 'value': 300}),
+                          ('release', None), ('model', {'model': 'raoult', 'alpha': 3.0}), ('reset', None)):
+        recorder.record(kind, payload)
+    path = tmp_path / 'sesion.jsonl.gz'
+    recorder.save(path)
+    assert replay(path)['results']['all']['events'] == 6
+    empty = tmp_path / 'vacia.jsonl.gz'
+    SessionRecorder(STATE, RaoultModel()).save(empty)
+    assert replay(empty) == {'events': 0, 'results': {}}
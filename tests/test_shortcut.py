@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+from models.raoult import RaoultModel
+from utils import solver
+from utils.rmin import minimum_reflux
+from utils.shortcut import effective_alpha, estimate, fenske, fug, gilliland, underwood
+
+def test_fenske():
+    assert fenske(0.8, 0.2, 2.5) == pytest.approx(np.log(16) / np.log(2.5))
+
+def test_underwood_matches_pinch_for_ideal_mixture():
+    # Con alpha constante el pinch está en la línea q: Underwood y McCabe-Thiele coinciden
+    for q, zF in ((0.5, 0.5), (1.0, 0.4), (0.0, 0.5), (1.5, 0.45)):
+        assert underwood(q, 0.8, zF, 2.5) == pytest.approx(minimum_reflux(RaoultModel(), q, zF, 0.8).rmin, rel=1e-6)
+
+def test_gilliland_limits():
+    assert gilliland(0.8, 0.83, 3.0) == np.inf
+    assert gilliland(1e6, 0.83, 3.0) == pytest.approx(3.0, rel=1e-3)
+
+def test_fug_close_to_staircase():
+    result = fug(2.0, 0.5, 0.8, 0.5, 0.2, 2.5)
+    assert result.nmin == pytest.approx(3.0259, abs=1e-4)
+    assert result.n_stages == pytest.approx(4.907, abs=1e-3)
+    assert 1 < result.feed_stage < result.n_stages
+    exact = solver.solve(solver.ColumnSpec(2.0, 0.5, 0.8, 0.5, 0.2, RaoultModel()), exact=True)
+    assert abs(result.n_stages - exact.fractional_stages) < 1.0
+
+def test_fug_vectorized():
+    R = np.array([1.0, 2.0, 3.0])
+    result = fug(R, 0.5, 0.8, 0.5, 0.2, 2.5)
+    assert result.n_stages.shape == (3,)
+    assert np.all(np.diff(result.n_stages) < 0)
+    assert result.n_stages[1] == pytest.approx(fug(2.0, 0.5, 0.8, 0.5, 0.2, 2.5).n_stages)
+
+def test_estimate_uses_model_alpha():
+    assert effective_alpha(RaoultModel(3.0)) == 3.0
+    spec = solver.ColumnSpec(2.0, 0.5, 0.8, 0.5, 0.2, RaoultModel(3.0))
+    assert estimate(spec).n_stages == pytest.approx(fug(2.0, 0.5, 0.8, 0.5, 0.2, 3.0).n_stages)
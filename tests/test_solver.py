@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from models.custom_data import CustomDataModel
+from models.raoult import RaoultModel
+from utils import solver
+from utils.cache import SolverCache
+from utils.pinch_stepping import step_stages_exact
+
+BASE = {'R': 2.0, 'q': 0.5, 'xD': 0.8, 'zF': 0.5, 'xB': 0.2}
+
+def spec(model=None, **changes):
+    return solver.ColumnSpec.from_state(dict(BASE, **changes), model or RaoultModel())
+
+def test_intersection_on_both_lines():
+    for q in (0.0, 0.5, 1.0, 2.0):
+        s = spec(q=q)
+        x, y = solver.intersection(s)
+        assert y == pytest.approx(solver.rectifying_line(s, x))
+        if q != 1.0:
+            assert y == pytest.approx(solver.q_line(s, x))
+
+def test_base_case_staircase():
+    result = solver.solve(spec())
+    assert result.valid
+    assert result.n_stages == 5
+    assert result.intersection == pytest.approx((0.44, 0.56))
+    stages = result.stages
+    assert stages['number'].tolist() == [1, 2, 3, 4, 5]
+    # Cada etapa sale del equilibrio y la escalera baja hasta cruzar 1.05·xB
+    assert np.all(np.diff(stages['x_out']) < 0)
+    assert stages['y_out'] == pytest.approx(RaoultModel().calculate_y(stages['x_out']), abs=1e-3)
+    assert stages['x_out'][-1] <= 1.05 * BASE['xB'] < stages['x_out'][-2]
+
+def test_segments_match_stage_rows():
+    result = solver.solve(spec())
+    rows = np.column_stack([result.stages[name] for name in ('x_in', 'y_out', 'x_out', 'y_in')])
+    stages, segments = solver.stage_arrays(rows)
+    assert np.array_equal(stages, result.stages)
+    assert np.allclose(segments, result.segments)
+
+def test_invalid_point():
+    # Por debajo de Rmin la intersección queda sobre la curva de equilibrio
+    s = spec(R=0.5)
+    assert not solver.is_valid(s, solver.intersection(s))
+    assert not solver.solve(s).valid
+
+def test_results_are_read_only():
+    result = solver.solve(spec())
+    with pytest.raises(ValueError):
+        result.stages['x_out'][0] = 0.0
+
+def test_custom_data_matches_raoult():
+    x = np.linspace(0, 1, 201)
+    model = CustomDataModel(x, RaoultModel().calculate_y(x))
+    assert solver.solve(spec(model)).n_stages == solver.solve(spec()).n_stages
+
+def test_cache_returns_same_result():
+    cache = SolverCache()
+    first = cache.solve(spec())
+    assert cache.solve(spec()) is first
+    assert cache.solve(spec(), exact=True) is not first
+
+def test_exact_stepping_fractional():
+    s = spec()
+    rows, fractional, pinched = step_stages_exact(s, solver.intersection(s))
+    assert not pinched
+    assert fractional == pytest.approx(4.2193837, abs=1e-6)
+    assert len(rows) == int(np.ceil(fractional))
+    # El último escalón cruza xB y la fracción interpola dentro de él
+    assert rows[-1, 2] <= BASE['xB'] < rows[-2, 2]
+
+def test_exact_stepping_reaches_small_xB():
+    # El escalonado normal se corta en MAX_STAGES; el exacto sigue hasta xB
+    s = spec(R=0.833)
+    assert solver.solve(s).n_stages == solver.MAX_STAGES
+    result = solver.solve(s, exact=True)
+    assert result.fractional_stages == pytest.approx(20.58, abs=0.01)
+    assert result.stages['x_out'][-1] <= BASE['xB']
+
+def test_exact_stepping_acceleration_is_consistent():
+    s = spec(R=0.8326)
+    point = solver.intersection(s)
+    fast = step_stages_exact(s, point)[1]
+    slow = step_stages_exact(s, point, accelerate=False)[1]
+    assert fast == pytest.approx(slow, rel=1e-3)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from utils.batch import solve_batch
+from utils.sweep import build_grid, min_cost_reflux, run_sweep, stages_vs_reflux, sweep_table
+
+RANGES = {'R': np.linspace(0.9, 4, 12), 'xB': np.array([0.05, 0.1, 0.2])}
+
+def test_grid_axes_and_fixed_values():
+    axes, flat = build_grid(RANGES)
+    assert list(axes) == ['R', 'xB']
+    assert flat['R'].size == 36
+    assert np.all(flat['zF'] == 0.5)
+
+def test_sweep_matches_batch():
+    result = run_sweep(RANGES, max_workers=1)
+    assert result.n_stages.shape == (12, 3)
+    R, xB = np.meshgrid(RANGES['R'], RANGES['xB'], indexing='ij')
+    batch = solve_batch(R, 0.5, 0.8, 0.5, xB, 2.5, trajectories=False)
+    assert np.array_equal(result.n_stages, batch.n_stages)
+    assert np.array_equal(result.valid, batch.valid)
+
+def test_chunks_reassemble_in_order():
+    whole = run_sweep(RANGES, max_workers=1)
+    chunked = run_sweep(RANGES, max_workers=1, chunk_size=5)
+    assert np.array_equal(whole.n_stages, chunked.n_stages)
+    assert np.array_equal(whole.Q_R, chunked.Q_R)
+
+def test_reflux_helpers():
+    result = run_sweep(RANGES, max_workers=1)
+    R, stages = stages_vs_reflux(result)
+    assert stages.shape == (3, 12)
+    # Más reflujo, menos etapas (los puntos no factibles quedan en NaN)
+    finite = stages[:, np.isfinite(stages).all(axis=0)]
+    assert np.all(np.diff(finite, axis=-1) <= 0)
+    R_opt, cost = min_cost_reflux(result, stage_cost=10.0, duty_cost=1.0)
+    assert R_opt.shape == (3,)
+    assert np.all(np.isfinite(cost))
+    with pytest.raises(ValueError):
+        min_cost_reflux(run_sweep({'xB': RANGES['xB']}, max_workers=1))
+
+def test_table_rows_follow_grid():
+    result = run_sweep(RANGES, max_workers=1)
+    table = sweep_table(RANGES, result)
+    assert all(len(column) == 36 for column in table.values())
+    assert table['n_stages'][3 * 5 + 1] == result.n_stages[5, 1]
+    assert table['R'][3 * 5 + 1] == RANGES['R'][5]
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from models.peng_robinson import PengRobinsonModel
+from models.raoult import RaoultModel
+from utils import solver
+from utils.temperature import bubble_temperature, has_temperature, stage_temperatures, with_temperature
+
+def test_peng_robinson_stage_temperatures():
+    model = PengRobinsonModel()
+    result = solver.solve(solver.ColumnSpec(2.0, 0.5, 0.8, 0.5, 0.2, model))
+    T = stage_temperatures(model, result.stages)
+    assert len(T) == result.n_stages
+    # La columna se calienta de la cabeza al fondo, entre los puntos de ebullición puros
+    assert np.all(np.diff(T) > 0)
+    assert bubble_temperature(model, 1.0) < T[0] and T[-1] < bubble_temperature(model, 0.0)
+    assert np.array_equal(with_temperature(result.stages, T)['T'], T)
+
+def test_models_without_components():
+    model = RaoultModel()
+    assert not has_temperature(model)
+    result = solver.solve(solver.ColumnSpec(2.0, 0.5, 0.8, 0.5, 0.2, model))
+    assert np.isnan(stage_temperatures(model, result.stages)).all()
+    with pytest.raises(ValueError):
+        bubble_temperature(model, 0.5)
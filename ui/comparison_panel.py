@@ -0,0 +1,201 @@
+import numpy as np
+from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                             QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_hex
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from constants import Constants
+from utils.comparison import ModelComparison
+
+# Panel acoplable que superpone varios modelos de equilibrio sobre la misma columna. Los
+# modelos se resuelven en un único hilo de trabajo fuera de la interfaz; cada uno con su caché.
+
+COLORS = ('tab:red', 'tab:blue', 'tab:green', 'tab:purple', 'tab:brown', 'tab:cyan')
+HEADERS = ("Modelo", "Etapas", "Alimentación", "Rmin", "Estado")
+
+class _CompareSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class _CompareJob(QRunnable):
+    def __init__(self, panel, generation, slots, state):
+        super().__init__()
+        self.panel = panel
+        self.generation = generation
+        self.slots = slots
+        self.state = state
+
+    def run(self):
+        if self.generation != self.panel.generation:
+            return
+        try:
+            entries = self.panel.comparison.evaluate(self.state, self.slots)
+        except Exception as e:
+            print(f"Error al comparar modelos: {e}")
+            self.panel.signals.failed.emit(self.generation, str(e))
+            return
+        self.panel.signals.finished.emit(self.generation, entries)
+
+class ComparisonPanel(QDockWidget):
+    INTERVAL_MS = 30
+    depends_on = ('R', 'q', 'xD', 'zF', 'xB')
+
+    def __init__(self, window):
+        super().__init__("Comparación de modelos", window)
+        self.main_window = window
+        self.comparison = ModelComparison()
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self._submit)
+        self.signals = _CompareSignals(self)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.failed.connect(self._on_failed)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        widget = QWidget()
+        layout = QVBoxLayout()
+        buttons = QHBoxLayout()
+        for text, callback in [("Añadir modelo actual", self.add_current_model),
+                               ("Quitar", self._remove_selected), ("Vaciar", self.clear)]:
+            button = QPushButton(text)
+            button.clicked.connect(callback)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+        self.fig = Figure(figsize=(4, 4))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvas(self.fig)
+        layout.addWidget(self.canvas, stretch=3)
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table, stretch=1)
+        self.status_label = QLabel("Añada modelos con el botón o desde el menú Termodinámica")
+        layout.addWidget(self.status_label)
+        widget.setLayout(layout)
+        self.setWidget(widget)
+        self._create_artists()
+
+    def _create_artists(self):
+        ax = self.ax
+        ax.clear()
+        ax.set_xlim(*Constants.X_RANGE)
+        ax.set_ylim(*Constants.Y_RANGE)
+        ax.set_aspect('equal')
+        ax.grid(True, color='lightgray')
+        ax.set_xlabel("x")
+        ax.set_ylabel("y")
+        ax.plot([0, 1], [0, 1], 'k-', linewidth=0.8)
+        self.q_line, = ax.plot([], [], color='purple', linewidth=1)
+        self.operating, = ax.plot([], [], color='gray', linewidth=1)
+        self.curves = []
+        self.staircases = []
+
+    def add_current_model(self):
+        try:
+            self.comparison.add(self.main_window.current_model)
+        except ValueError as e:
+            print(f"Error al añadir el modelo: {e}")
+            return
+        self._sync_artists()
+        self.refresh()
+
+    def _remove_selected(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.comparison.remove(row)
+        if rows:
+            self._sync_artists()
+            self.refresh()
+
+    def clear(self):
+        self.comparison.clear()
+        self._sync_artists()
+        self.refresh()
+
+    def _sync_artists(self):
+        # Una curva y una escalera por modelo, con el mismo color en el gráfico y en la tabla
+        self.cancel()
+        for artist in self.curves + self.staircases:
+            artist.remove()
+        self.curves, self.staircases = [], []
+        for i, slot in enumerate(self.comparison.slots):
+            color = COLORS[i % len(COLORS)]
+            curve, = self.ax.plot([], [], color=color, label=slot.label)
+            self.curves.append(curve)
+            self.staircases.append(self.ax.add_collection(
+                LineCollection([], colors=color, linewidths=0.8, linestyles='--'), autolim=False))
+        if self.curves:
+            self.ax.legend(loc='lower right', fontsize=8)
+        elif self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        self.table.setRowCount(len(self.comparison))
+        for i, slot in enumerate(self.comparison.slots):
+            item = QTableWidgetItem(slot.label)
+            item.setForeground(QColor(to_hex(COLORS[i % len(COLORS)])))
+            self.table.setItem(i, 0, item)
+            for column in range(1, len(HEADERS)):
+                self.table.setItem(i, column, QTableWidgetItem("-"))
+        self.canvas.draw_idle()
+
+    def refresh(self):
+        # Llamado tras cada actualización del gráfico principal
+        if not self.isVisible():
+            return
+        self._update_operating_lines()
+        if not len(self.comparison):
+            self.canvas.draw_idle()
+            return
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def cancel(self):
+        self.timer.stop()
+        self.pool.clear()
+        self.generation += 1
+
+    def shutdown(self):
+        # El trabajo en curso termina solo; su generación ya no coincide y se descarta
+        self.cancel()
+
+    def _submit(self):
+        self.generation += 1
+        self.pool.clear()
+        self.status_label.setText("Calculando...")
+        self.pool.start(_CompareJob(self, self.generation, list(self.comparison.slots), dict(self.main_window.state)))
+
+    def _update_operating_lines(self):
+        # Línea q e intersección compartidas con el gráfico principal
+        state, derived = self.main_window.state, self.main_window.derived
+        x_int, y_int = derived.get('intersection')
+        self.q_line.set_data(*derived.get('q_line'))
+        self.operating.set_data([state['xD'], x_int, state['xB']], [state['xD'], y_int, state['xB']])
+
+    def _on_finished(self, generation, entries):
+        if generation != self.generation or len(entries) != len(self.curves):
+            return
+        for i, entry in enumerate(entries):
+            self.curves[i].set_data(entry.x_curve, entry.y_curve)
+            self.staircases[i].set_segments(entry.segments)
+            values = ("-", "-", "Sin solución") if not entry.valid else (
+                str(entry.n_stages), str(entry.feed_stage), "Válido")
+            rmin = f"{entry.rmin:.2f}" if np.isfinite(entry.rmin) else "-"
+            for column, text in zip(range(1, len(HEADERS)), (values[0], values[1], rmin, values[2])):
+                self.table.item(i, column).setText(text)
+        self.status_label.setText(f"{len(entries)} modelos · xD = {self.main_window.state['xD']:.2f}, "
+                                  f"xB = {self.main_window.state['xB']:.2f}, R = {self.main_window.state['R']:.2f}")
+        self.canvas.draw_idle()
+
+    def _on_failed(self, generation, message):
+        if generation != self.generation:
+            return
+        self.status_label.setText(f"Error al comparar modelos: {message}")
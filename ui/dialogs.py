@@ -1,78 +1,156 @@
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QComboBox, QDialogButtonBox, 
-                             QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QLabel)
-from PyQt6.QtCore import Qt
-import pandas as pd
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QDialogButtonBox, QTableView,
+                             QPushButton, QFileDialog, QLabel, QProgressBar, QSpinBox, QLineEdit, QListWidget)
+from PyQt6.QtCore import Qt, QThreadPool
+from ui.widgets import XYTableModel, CsvImportJob
 
 class MixtureSelectionDialog(QDialog):
     def __init__(self, parent):
         super().__init__(parent)
+        from models.properties import get_store
+        self.store = get_store()
         self.setWindowTitle("Seleccionar Mezcla")
         layout = QVBoxLayout()
-        self.combo = QComboBox()
-        self.combo.addItems(["ethanol-water", "otra-mezcla"])
-        layout.addWidget(self.combo)
+        lists = QHBoxLayout()
+        self.searches, self.lists = [], []
+        for title, default in (("Componente 1", "ethanol"), ("Componente 2", "water")):
+            column = QVBoxLayout()
+            column.addWidget(QLabel(title))
+            search = QLineEdit()
+            search.setPlaceholderText("Buscar por nombre, fórmula o CAS...")
+            column.addWidget(search)
+            component_list = QListWidget()
+            column.addWidget(component_list)
+            search.textChanged.connect(lambda text, w=component_list: self._filter(w, text))
+            self._filter(component_list, "")
+            matches = component_list.findItems(default, Qt.MatchFlag.MatchExactly)
+            if matches:
+                component_list.setCurrentItem(matches[0])
+            self.searches.append(search)
+            self.lists.append(component_list)
+            lists.addLayout(column)
+        layout.addLayout(lists)
+        for component_list in self.lists:
+            component_list.currentTextChanged.connect(lambda _: self._update_info())
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
         buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
         self.setLayout(layout)
+        self._update_info()
+
+    def _filter(self, component_list, text):
+        current = component_list.currentItem().text() if component_list.currentItem() else None
+        component_list.clear()
+        component_list.addItems(self.store.search(text, limit=len(self.store)))
+        matches = component_list.findItems(current, Qt.MatchFlag.MatchExactly) if current else []
+        if matches:
+            component_list.setCurrentItem(matches[0])
+
+    def _selected(self):
+        return [w.currentItem().text() if w.currentItem() else None for w in self.lists]
+
+    def _update_info(self):
+        first, second = self._selected()
+        if not first or not second or first == second:
+            self.info_label.setText("Seleccione dos componentes distintos.")
+            return
+        self.info_label.setText(f"Mezcla: {self.store.mixture_name(first, second)} · "
+                                f"kij = {self.store.kij(first, second):.4f}")
+
+    def accept(self):
+        first, second = self._selected()
+        if first and second and first != second:
+            super().accept()
 
     def get_mixture(self):
-        return self.combo.currentText()
+        return self.store.mixture_name(*self._selected())
 
 class CustomDataDialog(QDialog):
     def __init__(self, parent):
         super().__init__(parent)
         self.setWindowTitle("Ingresar Datos de Equilibrio")
         layout = QVBoxLayout()
-        self.table = QTableWidget(100, 2)
-        self.table.setHorizontalHeaderLabels(["x", "y"])
+        self.table_model = XYTableModel(100, self)
+        self.table = QTableView()
+        self.table.setModel(self.table_model)
         layout.addWidget(self.table)
         import_btn = QPushButton("Importar CSV")
         import_btn.clicked.connect(self.import_csv)
         layout.addWidget(import_btn)
-        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        layout.addWidget(buttons)
+        self.progress = QProgressBar()
+        self.progress.setVisible(False)
+        layout.addWidget(self.progress)
+        self.cancel_btn = QPushButton("Cancelar importación")
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.clicked.connect(self.cancel_import)
+        layout.addWidget(self.cancel_btn)
+        options = QFormLayout()
+        self.smooth_input = QSpinBox()
+        self.smooth_input.setRange(0, 1001)
+        self.smooth_input.setSpecialValueText("Sin suavizado")
+        options.addRow("Suavizado (puntos):", self.smooth_input)
+        self.grid_input = QSpinBox()
+        self.grid_input.setRange(0, 100000)
+        self.grid_input.setSingleStep(100)
+        self.grid_input.setSpecialValueText("Datos originales")
+        options.addRow("Rejilla de interpolación:", self.grid_input)
+        layout.addLayout(options)
+        self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
         self.setLayout(layout)
+        self.import_job = None
+        self.pool = QThreadPool(self)
 
     def import_csv(self):
         file_name, _ = QFileDialog.getOpenFileName(self, "Abrir archivo CSV", "", "CSV files (*.csv)")
         if file_name:
-            try:
-                df = pd.read_csv(file_name)
-                if 'x' not in df.columns or 'y' not in df.columns:
-                    raise ValueError("El archivo CSV debe tener columnas 'x' y 'y'.")
-                x_data = df['x'].dropna().tolist()
-                y_data = df['y'].dropna().tolist()
-                if len(x_data) > 100 or len(y_data) > 100:
-                    x_data = x_data[:100]
-                    y_data = y_data[:100]
-                for row in range(min(len(x_data), len(y_data))):
-                    self.table.setItem(row, 0, QTableWidgetItem(str(x_data[row])))
-                    self.table.setItem(row, 1, QTableWidgetItem(str(y_data[row])))
-            except Exception as e:
-                print(f"Error al importar CSV: {e}")
+            self.import_job = CsvImportJob(file_name)
+            self.import_job.signals.progress.connect(self.progress.setValue)
+            self.import_job.signals.finished.connect(self._import_finished)
+            self.import_job.signals.failed.connect(self._import_failed)
+            self.import_job.signals.cancelled.connect(self._import_done)
+            self._set_importing(True)
+            self.pool.start(self.import_job)
+
+    def cancel_import(self):
+        if self.import_job is not None:
+            self.import_job.cancel()
+
+    def _set_importing(self, importing):
+        self.progress.setValue(0)
+        self.progress.setVisible(importing)
+        self.cancel_btn.setVisible(importing)
+        self.buttons.button(QDialogButtonBox.StandardButton.Ok).setEnabled(not importing)
+
+    def _import_finished(self, x_data, y_data):
+        self.table_model.set_arrays(x_data, y_data)
+        self._import_done()
+
+    def _import_failed(self, message):
+        print(f"Error al importar CSV: {message}")
+        self._import_done()
+
+    def _import_done(self):
+        self.import_job = None
+        self._set_importing(False)
+
+    def reject(self):
+        self.cancel_import()
+        super().reject()
 
     def get_data(self):
-        x_data = []
-        y_data = []
-        for row in range(self.table.rowCount()):
-            x_item = self.table.item(row, 0)
-            y_item = self.table.item(row, 1)
-            if x_item and y_item:
-                try:
-                    x_val = float(x_item.text())
-                    y_val = float(y_item.text())
-                    x_data.append(x_val)
-                    y_data.append(y_val)
-                except ValueError:
-                    pass
+        x_data, y_data = self.table_model.arrays()
         if len(x_data) < 2 or len(y_data) < 2:
             raise ValueError("Se necesitan al menos 2 puntos válidos para ajustar la curva.")
         return x_data, y_data
 
+    def get_options(self):
+        return {'smooth': self.smooth_input.value(), 'grid_points': self.grid_input.value() or None}
+
 class WarningDialog(QDialog):
     def __init__(self, parent, callback):
         super().__init__(parent)
@@ -1,16 +1,27 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
                              QPushButton, QTextEdit, QMessageBox)
 from PyQt6.QtCore import Qt
-from utils.energy_balance import calculate_energy_balance
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from constants import Constants
+from utils.derived import R_GRID, R_RANGE
+from utils.energy_balance import energy_summary
 
 class EnergyBalanceWindow(QMainWindow):
+    # Nodos del estado derivado que usa; la ventana principal solo la refresca si cambian
+    depends_on = ('duties', 'duty_curve', 'rmin')
+
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
         self.setWindowTitle("Balance Energético")
-        self.setGeometry(200, 200, 600, 400)
+        self.setGeometry(200, 200, 900, 560)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         
         self._setup_ui()
+        self._on_energy_edited()
+        self.refresh()
 
     def _setup_ui(self):
         main_widget = QWidget()
@@ -19,11 +30,12 @@ class EnergyBalanceWindow(QMainWindow):
         # Panel izquierdo: Entrada de datos
         input_panel = QVBoxLayout()
         input_panel.addWidget(QLabel("Entalpía de vaporización componente ligero (kJ/mol):"))
-        self.hvap_light_input = QLineEdit("38.56")  # Valor por defecto: etanol
+        hvap_light, hvap_heavy = self._default_hvap()
+        self.hvap_light_input = QLineEdit(f"{hvap_light:.2f}")
         input_panel.addWidget(self.hvap_light_input)
 
         input_panel.addWidget(QLabel("Entalpía de vaporización componente pesado (kJ/mol):"))
-        self.hvap_heavy_input = QLineEdit("40.65")  # Valor por defecto: agua
+        self.hvap_heavy_input = QLineEdit(f"{hvap_heavy:.2f}")
         input_panel.addWidget(self.hvap_heavy_input)
 
         input_panel.addWidget(QLabel("Flujo de alimentación (mol/s):"))
@@ -32,6 +44,8 @@ class EnergyBalanceWindow(QMainWindow):
 
         calc_btn = QPushButton("Calcular")
         calc_btn.clicked.connect(self.calculate_and_show)
+        for field in (self.hvap_light_input, self.hvap_heavy_input, self.feed_flow_input):
+            field.textChanged.connect(lambda _: self._on_energy_edited())
         input_panel.addWidget(calc_btn)
         
         input_panel.addStretch()  # Espacio flexible para empujar los elementos arriba
@@ -44,27 +58,91 @@ class EnergyBalanceWindow(QMainWindow):
         result_panel.addWidget(QLabel("Resultados:"))
         result_panel.addWidget(self.result_text)
         
-        # Placeholder para un dibujo (puedes agregar un QCanvas o matplotlib aquí más adelante)
-        self.drawing_area = QLabel("Área reservada para dibujo (pendiente)")
-        self.drawing_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        result_panel.addWidget(self.drawing_area)
+        # Servicios frente a R: los artistas se crean una vez y solo se actualizan sus datos
+        self.fig = Figure(figsize=(5, 3.5))
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlabel("Relación de reflujo R")
+        self.ax.set_ylabel("Calor (kJ/s)")
+        self.ax.grid(True, color='lightgray')
+        self.lines = {
+            'Q_R': self.ax.plot([], [], 'r-', label="Q_R (hervidor)")[0],
+            'Q_C': self.ax.plot([], [], 'b-', label="Q_C (condensador)")[0],
+            'current': self.ax.plot([], [], 'ko', label="R actual")[0],
+            'rmin': self.ax.axvline(np.nan, color='gray', linestyle='--', label="Rmin"),
+        }
+        self.ax.set_xlim(*R_RANGE)
+        self.ax.legend(loc='upper left', fontsize=8)
+        self.fig.tight_layout()
+        self.drawing_area = FigureCanvas(self.fig)
+        result_panel.addWidget(self.drawing_area, stretch=2)
         
         main_layout.addLayout(result_panel, stretch=2)
 
         main_widget.setLayout(main_layout)
         self.setCentralWidget(main_widget)
 
+    def _default_hvap(self):
+        # Con Peng-Robinson se usan los ΔHvap de la base de componentes; si no, etanol-agua
+        components = getattr(self.parent.current_model, 'components', None)
+        if components:
+            return components['c1']['Hvap'], components['c2']['Hvap']
+        return Constants.HVAP_LIGHT, Constants.HVAP_HEAVY
+
+    def _inputs(self):
+        hvap_light = float(self.hvap_light_input.text())
+        hvap_heavy = float(self.hvap_heavy_input.text())
+        feed_flow = float(self.feed_flow_input.text())
+        if hvap_light <= 0 or hvap_heavy <= 0 or feed_flow <= 0:
+            raise ValueError("Los valores deben ser positivos.")
+        return hvap_light, hvap_heavy, feed_flow
+
+    def _apply_energy(self):
+        # 'energy' es una entrada compartida: se fija al editar los campos, no al redibujar
+        try:
+            energy = self._inputs()
+        except ValueError:
+            return False
+        return self.parent.derived.set('energy', energy)
+
+    def _on_energy_edited(self):
+        # Entradas inválidas se ignoran; las vistas que dependen de 'energy' se refrescan
+        if self._apply_energy():
+            self.parent.derived.notify(self.parent.views)
+
+    def refresh(self):
+        # Llamado por la ventana principal cuando cambian los nodos de depends_on
+        derived = self.parent.derived
+        state = self.parent.state
+        # La curva frente a R no depende de R ni del modelo; Rmin no depende de R ni de xB
+        curve = derived.get('duty_curve')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current = derived.get('duties')
+        self.lines['Q_R'].set_data(R_GRID, curve.Q_R)
+        self.lines['Q_C'].set_data(R_GRID, curve.Q_C)
+        self.lines['current'].set_data([state['R'], state['R']], [current.Q_R, current.Q_C])
+        rmin = derived.get('rmin')
+        self.lines['rmin'].set_xdata([rmin, rmin])
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view(scalex=False)
+        self.drawing_area.draw_idle()
+        self._show_summary(energy_summary(current), rmin)
+
+    def _show_summary(self, summary, rmin):
+        result_text = "\n".join(f"{k}: {v:.2f}" for k, v in summary.items())
+        if np.isfinite(rmin):
+            result_text += f"\nRmin: {rmin:.2f}"
+        self.result_text.setText(result_text)
+
+    def closeEvent(self, event):
+        if self in self.parent.views:
+            self.parent.views.remove(self)
+        super().closeEvent(event)
+
     def calculate_and_show(self):
         try:
-            hvap_light = float(self.hvap_light_input.text())
-            hvap_heavy = float(self.hvap_heavy_input.text())
-            feed_flow = float(self.feed_flow_input.text())
-            if hvap_light <= 0 or hvap_heavy <= 0 or feed_flow <= 0:
-                raise ValueError("Los valores deben ser positivos.")
-            
-            # Calcular el balance energético con los valores ingresados
-            summary = calculate_energy_balance(self.parent, hvap_light, hvap_heavy, feed_flow)
-            result_text = "\n".join(f"{k}: {v:.2f}" for k, v in summary.items())
-            self.result_text.setText(result_text)
+            self._inputs()
         except ValueError as e:
             QMessageBox.warning(self, "Error", f"Entrada inválida: {e}")
+            return
+        self._on_energy_edited()
+        self.refresh()
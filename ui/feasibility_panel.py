@@ -0,0 +1,140 @@
+import copy
+import numpy as np
+from PyQt6.QtWidgets import QDockWidget, QWidget, QVBoxLayout, QComboBox, QLabel
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from utils.feasibility import LEVELS, RANGES, VIEWS, feasibility_key, iter_feasibility
+
+# Panel acoplable con el mapa de factibilidad del modelo actual. El cálculo corre en un hilo
+# de trabajo y cada nivel de refinamiento se muestra en cuanto está listo.
+
+class _MapSignals(QObject):
+    level = pyqtSignal(int, object)
+
+class _MapJob(QRunnable):
+    def __init__(self, panel, generation, key, model, state, axes):
+        super().__init__()
+        self.panel = panel
+        self.generation = generation
+        self.key = key
+        self.model = model
+        self.state = state
+        self.axes = axes
+
+    def run(self):
+        for result in iter_feasibility(self.model, self.state, self.axes):
+            if self.generation != self.panel.generation:
+                return
+            if result.complete:
+                self.panel.main_window.feasibility_cache.put(self.key, result)
+            self.panel.signals.level.emit(self.generation, result)
+
+class FeasibilityPanel(QDockWidget):
+    DELAY_MS = 250
+    depends_on = ('spec',)
+
+    def __init__(self, window):
+        super().__init__("Mapa de factibilidad", window)
+        self.main_window = window
+        self.generation = 0
+        self.key = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY_MS)
+        self.timer.timeout.connect(self._submit)
+        self.signals = _MapSignals(self)
+        self.signals.level.connect(self._on_level)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        widget = QWidget()
+        layout = QVBoxLayout()
+        self.view_combo = QComboBox()
+        self.view_combo.addItem("R × q", 'R-q')
+        self.view_combo.addItem("xD × xB", 'xD-xB')
+        self.view_combo.currentIndexChanged.connect(lambda _: self.refresh())
+        layout.addWidget(self.view_combo)
+        self.fig = Figure(figsize=(4, 4))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvas(self.fig)
+        layout.addWidget(self.canvas)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        widget.setLayout(layout)
+        self.setWidget(widget)
+        self.image = None
+        self.image_axes = None
+        self.marker = None
+        self.colorbar = None
+
+    def axes(self):
+        return VIEWS[self.view_combo.currentData()]
+
+    def refresh(self):
+        # Llamado tras cada actualización del gráfico principal: mueve el marcador y, si cambió
+        # el modelo o algún parámetro fijo, programa el recálculo sin bloquear la interfaz
+        if not self.isVisible():
+            return
+        axes = self.axes()
+        key = feasibility_key(self.main_window.current_model, self.main_window.state, axes)
+        if key != self.key:
+            self.cancel()
+            self.key = key
+            cached = self.main_window.feasibility_cache.get(key)
+            if cached is not None:
+                self._show(cached)
+            else:
+                self.timer.start()
+        self._update_marker()
+
+    def cancel(self):
+        self.timer.stop()
+        self.pool.clear()
+        self.generation += 1
+        self.key = None
+
+    def _submit(self):
+        window = self.main_window
+        self.generation += 1
+        self.pool.clear()
+        self.status_label.setText("Calculando...")
+        self.pool.start(_MapJob(self, self.generation, self.key, copy.copy(window.current_model),
+                                dict(window.state), self.axes()))
+
+    def _on_level(self, generation, result):
+        if generation != self.generation:
+            return
+        self._show(result)
+
+    def _show(self, result):
+        data = np.ma.masked_invalid(result.n_stages.T)
+        extent = (*RANGES[result.axes[0]], *RANGES[result.axes[1]])
+        if self.image is None or self.image_axes != result.axes:
+            self.ax.clear()
+            self.image = self.ax.imshow(data, origin='lower', extent=extent, aspect='auto', cmap='viridis')
+            self.image.cmap.set_bad('lightgray')
+            self.image_axes = result.axes
+            self.marker, = self.ax.plot([], [], 'r+', markersize=12, markeredgewidth=2)
+            self.ax.set_xlabel(result.axes[0])
+            self.ax.set_ylabel(result.axes[1])
+            if self.colorbar is None:
+                self.colorbar = self.fig.colorbar(self.image, ax=self.ax, label="Etapas")
+            else:
+                self.colorbar.update_normal(self.image)
+        else:
+            self.image.set_data(data)
+        if data.count():
+            self.image.set_clim(data.min(), data.max())
+        self.status_label.setText(f"Nivel {result.level}/{LEVELS} · {result.evaluated} casos evaluados "
+                                  f"· gris: sin solución")
+        self._update_marker()
+
+    def _update_marker(self):
+        if self.marker is None:
+            return
+        x_name, y_name = self.axes()
+        self.marker.set_data([self.main_window.state[x_name]], [self.main_window.state[y_name]])
+        self.canvas.draw_idle()
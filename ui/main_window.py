@@ -1,15 +1,21 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSlider, 
-                             QPushButton, QTextEdit, QMenu)
+                             QPushButton, QTextEdit, QMenu, QCheckBox)
 from PyQt6.QtCore import Qt
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from constants import Constants
 from models.raoult import RaoultModel
 from ui.dialogs import MixtureSelectionDialog, CustomDataDialog, WarningDialog
-from ui.energy_balance_window import EnergyBalanceWindow
-from utils.calculations import (update_intersection, calculate_stages, calculate_rmin, 
+from ui.scheduler import SolveScheduler
+from utils.calculations import (update_intersection, calculate_stages, calculate_rmin, clear_stages,
                                is_point_valid, q_line, find_curve_intersection)
+from utils.cache import SolverCache
+from utils.derived import DerivedState
+from utils.feasibility import FeasibilityCache
 from utils.plotting import update_plot
+from utils.profiling import PROFILER
+from utils.session import SessionRecorder, model_spec, recorded
+from utils.temperature import has_temperature, with_temperature
 
 class DistillationWindow(QMainWindow):
     def __init__(self):
@@ -21,18 +27,28 @@ class DistillationWindow(QMainWindow):
         self.valid_state = self.state.copy()
         self.valid_alpha = Constants.RELATIVE_VOLATILITY
         self.intersection = {'x': 0, 'y': 0}
-        self.stages_calculated = False
-        self.stages_horiz = []
-        self.stages_vert = []
-        self.stages_table = []
+        self.derived = DerivedState()
+        self.exact_stages = False
+        clear_stages(self)
         self.point_outside = False
         self.slider_active = False
         self.rmin = None
         self.current_model = RaoultModel()
+        self.solver_cache = SolverCache()
+        self.feasibility_cache = FeasibilityCache()
+        self.feasibility_panel = None
+        self.comparison_panel = None
+        # Vistas secundarias con refresh(), avisadas tras cada actualización del gráfico
+        self.views = []
+        self.recorder = None
+        self.artists = None
+        self.background = None
         
-        self.fig, self.ax = plt.subplots(figsize=(10, 10))
+        self.fig = Figure(figsize=(10, 10))
+        self.ax = self.fig.add_subplot()
         self.ax.set_aspect('equal')
         self.canvas = FigureCanvas(self.fig)
+        self.scheduler = SolveScheduler(self)
         
         self._setup_menu()
         self._setup_ui()
@@ -54,6 +70,28 @@ class DistillationWindow(QMainWindow):
         energy_action.triggered.connect(self.open_energy_balance_window)
         mass_action = balance_menu.addAction("Masa")
         mass_action.triggered.connect(self._placeholder_mass_balance)
+        # Menú Herramientas
+        tools_menu = menu_bar.addMenu("Herramientas")
+        profile_action = tools_menu.addAction("Perfilado en vivo")
+        profile_action.setCheckable(True)
+        profile_action.toggled.connect(self._toggle_profiling)
+        feasibility_action = tools_menu.addAction("Mapa de factibilidad")
+        feasibility_action.setCheckable(True)
+        feasibility_action.toggled.connect(self._toggle_feasibility)
+        self.feasibility_action = feasibility_action
+        comparison_action = tools_menu.addAction("Comparar modelos")
+        comparison_action.setCheckable(True)
+        comparison_action.toggled.connect(self._toggle_comparison)
+        self.comparison_action = comparison_action
+        sensitivity_action = tools_menu.addAction("Análisis de sensibilidad")
+        sensitivity_action.triggered.connect(self.open_sensitivity_window)
+        txy_action = tools_menu.addAction("Diagrama T-x-y")
+        txy_action.triggered.connect(self.open_txy_window)
+        record_action = tools_menu.addAction("Grabar sesión")
+        record_action.setCheckable(True)
+        record_action.toggled.connect(self._toggle_recording)
+        dump_action = tools_menu.addAction("Exportar perfil (JSON)")
+        dump_action.triggered.connect(self._export_profile)
 
     def _setup_ui(self):
         main_layout = QHBoxLayout()
@@ -66,7 +104,7 @@ class DistillationWindow(QMainWindow):
         graph_layout.addWidget(self.canvas, stretch=4)
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(40)
+        self.log_text.setMaximumHeight(Constants.LOG_HEIGHT)
         graph_layout.addWidget(self.log_text)
         main_layout.addLayout(graph_layout, stretch=4)
         central_widget = QWidget()
@@ -108,7 +146,7 @@ class DistillationWindow(QMainWindow):
 
     def _create_buttons(self, layout):
         buttons = [
-            ('Cálculo de Rmin', lambda: calculate_rmin(self)),
+            ('Cálculo de Rmin', self._calculate_rmin),
             ('Reset', self._reset),
             ('Etapas', self._calculate_and_plot_stages),
             ('Exportar Informe', self._export_report),
@@ -118,22 +156,26 @@ class DistillationWindow(QMainWindow):
             btn = QPushButton(text)
             btn.clicked.connect(callback)
             layout.addWidget(btn)
+        self.exact_checkbox = QCheckBox("Escalonado exacto (etapas fraccionarias)")
+        self.exact_checkbox.toggled.connect(self._toggle_exact)
+        layout.addWidget(self.exact_checkbox)
         self.rmin_label = QLabel("Rmin: -")
         layout.addWidget(self.rmin_label)
 
+    @recorded('press')
     def _slider_pressed(self):
         self.slider_active = True
 
+    @recorded('release')
     def _slider_released(self):
         self.slider_active = False
         update_intersection(self)
         self.point_outside = not is_point_valid(self)
-        if self.stages_calculated:
-            calculate_stages(self)
         if self.point_outside:
             WarningDialog(self, self._revert_to_valid).exec()
-        update_plot(self)
+        self.scheduler.request()
 
+    @recorded('param', lambda param, value: {'param': param, 'value': value})
     def _update_param(self, param, value):
         value = value / 100
         if param == 'alpha' and isinstance(self.current_model, RaoultModel):
@@ -142,14 +184,27 @@ class DistillationWindow(QMainWindow):
             self.state[param] = value
         label_text = self.slider_labels[param].text().split(":")[0]
         self.slider_labels[param].setText(f"{label_text}: {value:.2f}")
-        if self.stages_calculated:
-            calculate_stages(self)
-        update_plot(self)
+        self.scheduler.request()
+
+    @recorded('rmin', silence=True)
+    def _calculate_rmin(self):
+        calculate_rmin(self)
 
+    @recorded('stages')
     def _calculate_and_plot_stages(self):
+        self.scheduler.cancel()
         calculate_stages(self)
         update_plot(self)
 
+    @recorded('exact', lambda enabled: {'enabled': enabled})
+    def _toggle_exact(self, enabled):
+        self.exact_stages = enabled
+        if self.stages_calculated:
+            self.scheduler.cancel()
+            calculate_stages(self)
+            update_plot(self)
+
+    @recorded('reset', silence=True)
     def _reset(self):
         self.state = Constants.INITIAL_VALUES.copy()
         for param, slider in self.sliders.items():
@@ -163,10 +218,8 @@ class DistillationWindow(QMainWindow):
                 label_text = self.slider_labels[param].text().split(":")[0]
                 self.slider_labels[param].setText(f"{label_text}: {self.state[param]:.2f}")
         self.sliders['alpha'].setEnabled(isinstance(self.current_model, RaoultModel))
-        self.stages_calculated = False
-        self.stages_horiz.clear()
-        self.stages_vert.clear()
-        self.stages_table.clear()
+        self.scheduler.cancel()
+        clear_stages(self)
         self.rmin = None
         self.rmin_label.setText("Rmin: -")
         update_plot(self)
@@ -176,7 +229,11 @@ class DistillationWindow(QMainWindow):
         import pandas as pd
         if not self.stages_calculated or self.point_outside:
             return
-        df = pd.DataFrame([vars(stage) for stage in self.stages_table])
+        # La columna T solo se exporta si el modelo tiene componentes (Peng-Robinson)
+        table = self.stages_table
+        if has_temperature(self.current_model):
+            table = with_temperature(table, self.stage_temperatures)
+        df = pd.DataFrame(table)
         file, _ = QFileDialog.getSaveFileName(self, "Guardar Informe", "", "CSV files (*.csv)")
         if file:
             df.to_csv(file, index=False)
@@ -189,6 +246,56 @@ class DistillationWindow(QMainWindow):
             self.fig.savefig(file)
             print(f"PDF exportado a: {file}")
 
+    def _toggle_profiling(self, enabled):
+        PROFILER.reset()
+        PROFILER.enable(enabled)
+        self.log_text.setMaximumHeight(Constants.PROFILE_LOG_HEIGHT if enabled else Constants.LOG_HEIGHT)
+        update_plot(self)
+
+    def _toggle_feasibility(self, enabled):
+        if self.feasibility_panel is None:
+            from ui.feasibility_panel import FeasibilityPanel
+            self.feasibility_panel = FeasibilityPanel(self)
+            self.views.append(self.feasibility_panel)
+            self.feasibility_panel.visibilityChanged.connect(self.feasibility_action.setChecked)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.feasibility_panel)
+        self.feasibility_panel.setVisible(enabled)
+        if not enabled:
+            self.feasibility_panel.cancel()
+        self.feasibility_panel.refresh()
+
+    def _toggle_comparison(self, enabled):
+        if self.comparison_panel is None:
+            from ui.comparison_panel import ComparisonPanel
+            self.comparison_panel = ComparisonPanel(self)
+            self.views.append(self.comparison_panel)
+            self.comparison_panel.visibilityChanged.connect(self.comparison_action.setChecked)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.comparison_panel)
+            self.comparison_panel.add_current_model()
+        self.comparison_panel.setVisible(enabled)
+        if not enabled:
+            self.comparison_panel.cancel()
+        self.comparison_panel.refresh()
+
+    def _toggle_recording(self, enabled):
+        if enabled:
+            self.recorder = SessionRecorder(self.state, self.current_model)
+            return
+        recorder, self.recorder = self.recorder, None
+        from PyQt6.QtWidgets import QFileDialog
+        file, _ = QFileDialog.getSaveFileName(self, "Guardar Sesión", "", "Sesiones (*.jsonl.gz)")
+        if file:
+            recorder.save(file)
+            print(f"Sesión guardada en: {file} ({len(recorder.events)} eventos)")
+
+    def _export_profile(self):
+        from PyQt6.QtWidgets import QFileDialog
+        file, _ = QFileDialog.getSaveFileName(self, "Guardar Perfil", "", "JSON files (*.json)")
+        if file:
+            PROFILER.dump(file)
+            print(f"Perfil exportado a: {file}")
+
+    @recorded('revert', silence=True)
     def _revert_to_valid(self):
         self.state = self.valid_state.copy()
         for param, slider in self.sliders.items():
@@ -201,18 +308,24 @@ class DistillationWindow(QMainWindow):
                 label_text = self.slider_labels[param].text().split(":")[0]
                 self.slider_labels[param].setText(f"{label_text}: {self.state[param]:.2f}")
         self.sliders['alpha'].setEnabled(isinstance(self.current_model, RaoultModel))
-        self.stages_calculated = False
-        self.stages_horiz.clear()
-        self.stages_vert.clear()
-        self.stages_table.clear()
+        self.scheduler.cancel()
+        clear_stages(self)
         update_plot(self)
 
     def open_peng_robinson_dialog(self):
         from models.peng_robinson import PengRobinsonModel
-        dialog = MixtureSelectionDialog(self)
+        try:
+            dialog = MixtureSelectionDialog(self)
+        except ValueError as e:
+            # Un CSV de componentes del usuario mal formado
+            print(f"Error al cargar los componentes: {e}")
+            return
         if dialog.exec():
             mixture = dialog.get_mixture()
-            self.set_model(PengRobinsonModel(mixture=mixture))
+            try:
+                self.set_model(PengRobinsonModel(mixture=mixture))
+            except ValueError as e:
+                print(f"Error al crear el modelo: {e}")
 
     def open_custom_data_dialog(self):
         from models.custom_data import CustomDataModel
@@ -220,28 +333,52 @@ class DistillationWindow(QMainWindow):
         if dialog.exec():
             try:
                 x_data, y_data = dialog.get_data()
-                if x_data and y_data:
-                    self.set_model(CustomDataModel(x_data, y_data))
+                if len(x_data) and len(y_data):
+                    self.set_model(CustomDataModel(x_data, y_data, **dialog.get_options()))
             except ValueError as e:
                 print(f"Error al procesar datos: {e}")
 
+    @recorded('model', lambda model: model_spec(model), silence=True)
     def set_model(self, model):
         from models.custom_data import CustomDataModel
         if isinstance(self.current_model, CustomDataModel) and isinstance(model, RaoultModel):
             self._reset()
+        if self.current_model.fingerprint() != model.fingerprint():
+            self.solver_cache.invalidate(self.current_model.fingerprint())
         self.current_model = model
         self.sliders['alpha'].setEnabled(isinstance(self.current_model, RaoultModel))
         if isinstance(self.current_model, RaoultModel):
             self.sliders['alpha'].setValue(int(self.current_model.alpha * 100))
             self.slider_labels['alpha'].setText(f"Volatilidad Relativa: {self.current_model.alpha:.2f}")
             self.valid_alpha = self.current_model.alpha
+        self.scheduler.cancel()
         self.stages_calculated = False
         update_plot(self)
 
+    def closeEvent(self, event):
+        # Detiene los hilos de la comparación de modelos antes de cerrar
+        if self.comparison_panel is not None:
+            self.comparison_panel.shutdown()
+        super().closeEvent(event)
+
     def open_energy_balance_window(self):
+        from ui.energy_balance_window import EnergyBalanceWindow
         self.energy_window = EnergyBalanceWindow(self)
+        self.views.append(self.energy_window)
         self.energy_window.show()
 
+    def open_sensitivity_window(self):
+        from ui.sensitivity_window import SensitivityWindow
+        self.sensitivity_window = SensitivityWindow(self)
+        self.views.append(self.sensitivity_window)
+        self.sensitivity_window.show()
+
+    def open_txy_window(self):
+        from ui.txy_window import TxyWindow
+        self.txy_window = TxyWindow(self)
+        self.views.append(self.txy_window)
+        self.txy_window.show()
+
     def _placeholder_mass_balance(self):
         from PyQt6.QtWidgets import QMessageBox
         QMessageBox.information(self, "Balance de Masa", "Funcionalidad aún no implementada.")
@@ -0,0 +1,81 @@
+import copy
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from utils import solver
+from utils.calculations import apply_stages, solve_stages
+from utils.plotting import update_plot
+from utils.profiling import span
+
+# Agrupa los cambios de los sliders: como máximo un cálculo por intervalo, resuelto en un
+# hilo de trabajo. Los resultados de una generación anterior se descartan.
+
+class _SolveSignals(QObject):
+    finished = pyqtSignal(int, object)
+
+class _SolveJob(QRunnable):
+    def __init__(self, scheduler, generation, spec, exact):
+        super().__init__()
+        self.scheduler = scheduler
+        self.generation = generation
+        self.spec = spec
+        self.exact = exact
+
+    def run(self):
+        if self.generation != self.scheduler.generation:
+            return
+        with span('solve_worker'):
+            result = solve_stages(self.scheduler.window.solver_cache, self.spec, self.exact)
+        self.scheduler.signals.finished.emit(self.generation, result)
+
+class SolveScheduler(QObject):
+    INTERVAL_MS = 15
+
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.generation = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.INTERVAL_MS)
+        self.timer.timeout.connect(self._submit)
+        self.signals = _SolveSignals(self)
+        self.signals.finished.connect(self._on_finished)
+
+    def request(self):
+        # Un cambio nuevo invalida el cálculo que esté en curso
+        self.generation += 1
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def cancel(self):
+        self.timer.stop()
+        self.pool.clear()
+        self.generation += 1
+
+    def wait(self):
+        # Vacía el temporizador y espera al último cálculo (útil sin bucle de eventos)
+        if self.timer.isActive():
+            self.timer.stop()
+            self._submit()
+        self.pool.waitForDone()
+
+    def _submit(self):
+        window = self.window
+        self.generation += 1
+        self.pool.clear()
+        # Durante el arrastre basta la estimación FUG, que update_plot calcula en el hilo de
+        # la interfaz; solo la escalera va al hilo de trabajo, al soltar el slider
+        if not window.stages_calculated or window.slider_active:
+            update_plot(window)
+            return
+        # Instantánea del estado: el hilo de trabajo nunca toca la ventana ni el modelo vivo
+        spec = solver.ColumnSpec.from_state(window.state, copy.copy(window.current_model))
+        self.pool.start(_SolveJob(self, self.generation, spec, window.exact_stages))
+
+    def _on_finished(self, generation, result):
+        if generation != self.generation:
+            return
+        if self.window.stages_calculated:
+            apply_stages(self.window, result)
+        update_plot(self.window)
@@ -0,0 +1,133 @@
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QPushButton,
+                             QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog)
+from PyQt6.QtCore import Qt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from utils.report import write_table
+from utils.sensitivity import DERIVATIVE_OUTPUTS, LABELS, OUTPUTS, sensitivity_table
+
+HEADERS = ("Parámetro", "−Δ / +Δ", "dN/dp", "dRmin/dp", "dQ_R/dp", "dQ_C/dp", "Salto alim. en ±Δ (etapas)",
+           "Δp hasta salto")
+
+class SensitivityWindow(QMainWindow):
+    # El lote de perturbaciones es un nodo del estado derivado compartido
+    depends_on = ('sensitivity',)
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Análisis de sensibilidad")
+        self.setGeometry(240, 240, 860, 640)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.result = None
+        self._setup_ui()
+        self.refresh()
+
+    def _setup_ui(self):
+        main_widget = QWidget()
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Resultado:"))
+        self.output_combo = QComboBox()
+        for output in OUTPUTS:
+            self.output_combo.addItem(LABELS[output], output)
+        self.output_combo.currentIndexChanged.connect(lambda _: self._draw_tornado())
+        controls.addWidget(self.output_combo)
+        controls.addStretch()
+        export_btn = QPushButton("Exportar tabla")
+        export_btn.clicked.connect(self._export)
+        controls.addWidget(export_btn)
+        layout.addLayout(controls)
+        self.fig = Figure(figsize=(6, 3.5))
+        self.ax = self.fig.add_subplot()
+        self.canvas = FigureCanvas(self.fig)
+        layout.addWidget(self.canvas, stretch=3)
+        self.table = QTableWidget(0, len(HEADERS))
+        self.table.setHorizontalHeaderLabels(HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table, stretch=2)
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+        main_widget.setLayout(layout)
+        self.setCentralWidget(main_widget)
+
+    def refresh(self):
+        window = self.parent
+        if window.point_outside:
+            self.info_label.setText("Punto de operación sin solución")
+            return
+        try:
+            self.result = window.derived.get('sensitivity')
+        except ValueError as e:
+            print(f"Error en el análisis de sensibilidad: {e}")
+            return
+        self._fill_table()
+        self._draw_tornado()
+        stages = self.result.base['fractional_stages']
+        self.info_label.setText(f"Etapas fraccionarias: {stages:.3f} · Δp hasta salto: cambio del parámetro "
+                                f"que lleva al siguiente número entero de etapas")
+
+    def _fill_table(self):
+        result = self.result
+        self.table.setRowCount(len(result.parameters))
+        for i, name in enumerate(result.parameters):
+            values = [result.derivatives[output][i] for output in DERIVATIVE_OUTPUTS]
+            values += [result.feed_shift[i], result.stage_margin[i]]
+            swing = f"{result.swing_low[i]:g} / {result.swing_high[i]:g}"
+            cells = [name, swing] + [f"{v:.4g}" if np.isfinite(v) else "-" for v in values]
+            for column, text in enumerate(cells):
+                self.table.setItem(i, column, QTableWidgetItem(text))
+
+    def _draw_tornado(self):
+        # Barras de base-Δ a base+Δ, ordenadas por amplitud (la mayor arriba)
+        if self.result is None:
+            return
+        output = self.output_combo.currentData()
+        result = self.result
+        base = result.base[output]
+        low, high = result.low[output] - base, result.high[output] - base
+        order = np.argsort(np.nan_to_num(np.abs(high - low)))
+        labels = [self._swing_label(i) for i in order]
+        ax = self.ax
+        ax.clear()
+        positions = np.arange(len(order))
+        ax.barh(positions, np.nan_to_num(low[order]), color='tab:blue', label="−Δ")
+        ax.barh(positions, np.nan_to_num(high[order]), color='tab:red', label="+Δ")
+        # Un caso perturbado sin solución se marca en lugar de dibujarse como barra nula
+        for position, i in enumerate(order):
+            for value, align in ((low[i], 'right'), (high[i], 'left')):
+                if not np.isfinite(value):
+                    ax.text(0, position, " sin solución ", ha=align, va='center', color='gray', fontsize=8)
+        ax.axvline(0, color='k', linewidth=0.8)
+        ax.set_yticks(positions, labels)
+        ax.set_xlabel(f"Cambio en {LABELS[output]} (base {base:.3g})")
+        ax.legend(loc='lower right', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas.draw_idle()
+
+    def _swing_label(self, i):
+        result = self.result
+        name, low, high = result.parameters[i], result.swing_low[i], result.swing_high[i]
+        if np.isclose(low, high):
+            return f"{name} ±{high:g}"
+        return f"{name} −{low:g}/+{high:g}"
+
+    def _export(self):
+        if self.result is None:
+            return
+        file, _ = QFileDialog.getSaveFileName(self, "Guardar Sensibilidad", "",
+                                              "CSV files (*.csv);;Parquet files (*.parquet)")
+        if not file:
+            return
+        try:
+            write_table(file, sensitivity_table(self.result))
+            print(f"Sensibilidad exportada a: {file}")
+        except (ImportError, ValueError) as e:
+            print(f"Error al exportar la sensibilidad: {e}")
+
+    def closeEvent(self, event):
+        if self in self.parent.views:
+            self.parent.views.remove(self)
+        super().closeEvent(event)
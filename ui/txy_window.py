@@ -0,0 +1,90 @@
+from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from utils.temperature import bubble_temperature, has_temperature
+
+CURVE_POINTS = 200
+KELVIN = 273.15
+
+class TxyWindow(QMainWindow):
+    # Curvas del modelo más el perfil de la escalera mostrada
+    depends_on = ('model', 'stages')
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Diagrama T-x-y")
+        self.setGeometry(220, 220, 640, 560)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.curve_key = None
+        self._setup_ui()
+        self.refresh()
+
+    def _setup_ui(self):
+        main_widget = QWidget()
+        layout = QVBoxLayout()
+        # Curvas de burbuja y rocío más las etapas; solo se actualizan los datos de los artistas
+        self.fig = Figure(figsize=(5, 4))
+        self.ax = self.fig.add_subplot()
+        self.ax.set_xlabel("Fracción molar del componente ligero (x, y)")
+        self.ax.set_ylabel("Temperatura (°C)")
+        self.ax.set_xlim(0, 1)
+        self.ax.grid(True, color='lightgray')
+        self.lines = {
+            'bubble': self.ax.plot([], [], 'b-', label="Burbuja T(x)")[0],
+            'dew': self.ax.plot([], [], 'r-', label="Rocío T(y)")[0],
+            'liquid': self.ax.plot([], [], 'bo', markersize=4, label="Etapas (líquido)")[0],
+            'vapor': self.ax.plot([], [], 'r^', markersize=4, label="Etapas (vapor)")[0],
+        }
+        self.ax.legend(loc='upper right', fontsize=8)
+        self.fig.tight_layout()
+        self.canvas = FigureCanvas(self.fig)
+        layout.addWidget(self.canvas)
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+        main_widget.setLayout(layout)
+        self.setCentralWidget(main_widget)
+
+    def refresh(self):
+        # Las curvas dependen solo del modelo; las etapas se redibujan en cada actualización
+        window = self.parent
+        model = window.current_model
+        if not has_temperature(model):
+            # Raoult y los datos personalizados no tienen componentes de los que sacar T
+            for line in self.lines.values():
+                line.set_data([], [])
+            self.curve_key = None
+            self.info_label.setText("El diagrama T-x-y requiere un modelo con componentes (Peng-Robinson)")
+            self.canvas.draw_idle()
+            return
+        try:
+            if model.fingerprint() != self.curve_key:
+                x = np.linspace(0, 1, CURVE_POINTS)
+                T = bubble_temperature(model, x) - KELVIN
+                self.lines['bubble'].set_data(x, T)
+                self.lines['dew'].set_data(np.asarray(model.calculate_y(x), dtype=float), T)
+                self.ax.set_ylim(T.min() - 2, T.max() + 2)
+                self.ax.set_title(f"{model.mixture} a {model.P / 1e5:.3g} bar", fontsize=10)
+                self.curve_key = model.fingerprint()
+        except ValueError as e:
+            print(f"Error al calcular temperaturas: {e}")
+            return
+        stages, T = window.stages_table, window.stage_temperatures
+        visible = window.stages_calculated and not window.point_outside and len(T) == len(stages)
+        if visible:
+            self.lines['liquid'].set_data(stages['x_out'], T - KELVIN)
+            self.lines['vapor'].set_data(stages['y_out'], T - KELVIN)
+            self.info_label.setText(f"{len(T)} etapas · T cabeza {T[0] - KELVIN:.1f} °C"
+                                    f" · T fondo {T[-1] - KELVIN:.1f} °C" if len(T) else "")
+        else:
+            self.lines['liquid'].set_data([], [])
+            self.lines['vapor'].set_data([], [])
+            self.info_label.setText("Pulse Etapas para ver el perfil de temperatura")
+        self.canvas.draw_idle()
+
+    def closeEvent(self, event):
+        if self in self.parent.views:
+            self.parent.views.remove(self)
+        super().closeEvent(event)
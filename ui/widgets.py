@@ -0,0 +1,83 @@
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, QRunnable, Qt, pyqtSignal
+from utils.data_import import ImportCancelled, read_xy_csv
+
+class XYTableModel(QAbstractTableModel):
+    # Vista virtualizada sobre dos arreglos de numpy; las celdas vacías se guardan como NaN
+    HEADERS = ("x", "y")
+
+    def __init__(self, rows=100, parent=None):
+        super().__init__(parent)
+        self.data_array = np.full((rows, 2), np.nan)
+
+    def set_arrays(self, x, y):
+        self.beginResetModel()
+        self.data_array = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+        self.endResetModel()
+
+    def arrays(self):
+        valid = self.data_array[~np.isnan(self.data_array).any(axis=1)]
+        return valid[:, 0], valid[:, 1]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.data_array)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        value = self.data_array[index.row(), index.column()]
+        return "" if np.isnan(value) else f"{value:.6g}"
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        try:
+            number = float(value) if str(value).strip() else np.nan
+        except ValueError:
+            return False
+        self.data_array[index.row(), index.column()] = number
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return str(section + 1)
+
+class _ImportSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+class CsvImportJob(QRunnable):
+    # Lee el CSV fuera del hilo de la interfaz; cancel() se atiende entre bloques
+    def __init__(self, file_name):
+        super().__init__()
+        self.file_name = file_name
+        self.signals = _ImportSignals()
+        self._cancelled = False
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            x, y = read_xy_csv(self.file_name,
+                               progress=lambda fraction: self.signals.progress.emit(int(fraction * 100)),
+                               cancelled=lambda: self._cancelled)
+        except ImportCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(x, y)
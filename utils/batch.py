@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+import numpy as np
+from constants import Constants
+from utils.pinch_stepping import PINCH_TOL
+from utils.solver import MAX_STAGES
+
+# Motor McCabe-Thiele por lotes: avanza N casos a la vez sobre arreglos de numpy, con las
+# mismas reglas que utils.solver.step_stages pero con una máscara de terminación por caso.
+
+@dataclass(frozen=True)
+class BatchResult:
+    intersection_x: np.ndarray
+    intersection_y: np.ndarray
+    valid: np.ndarray
+    n_stages: np.ndarray
+    feed_stage: np.ndarray
+    x_in: np.ndarray = None
+    y_out: np.ndarray = None
+    x_out: np.ndarray = None
+    y_in: np.ndarray = None
+    fractional_stages: np.ndarray = None
+
+def raoult_y(alpha, x):
+    return (alpha * x) / (1 + (alpha - 1) * x)
+
+def raoult_x(alpha, y):
+    a = alpha - (alpha - 1) * y
+    safe = np.abs(a) > 1e-4
+    return np.where(safe, y / np.where(safe, a, 1.0), 0.0)
+
+def intersection(R, q, xD, zF):
+    # Versión vectorizada de utils.solver.intersection
+    q_is_one = np.abs(q - 1) < 1e-6
+    q_safe = np.where(q_is_one, 2.0, q)
+    slope_q = q_safe / (q_safe - 1)
+    intercept_q = -zF / (q_safe - 1)
+    slope_rect = R / (R + 1)
+    intercept_rect = xD / (R + 1)
+    denom = slope_q - slope_rect
+    parallel = np.abs(denom) < 1e-6
+    x = np.where(parallel, zF, (intercept_rect - intercept_q) / np.where(parallel, 1.0, denom))
+    y = slope_q * x + intercept_q
+    x = np.where(q_is_one, zF, x)
+    y = np.where(q_is_one, slope_rect * zF + intercept_rect, y)
+    return np.clip(x, *Constants.X_RANGE), np.clip(y, *Constants.Y_RANGE)
+
+def _equilibrium(alpha, model):
+    if model is None:
+        return (lambda idx, x: raoult_y(alpha[idx], x)), (lambda idx, y: raoult_x(alpha[idx], y))
+    return (lambda idx, x: np.asarray(model.calculate_y(x), dtype=float)), \
+           (lambda idx, y: np.asarray(model.calculate_x(y), dtype=float))
+
+def solve_batch(R, q, xD, zF, xB, alpha=Constants.RELATIVE_VOLATILITY, model=None,
+                max_stages=MAX_STAGES, trajectories=True, fractional=False):
+    # Con model=None se usa Raoult con alpha por caso; si no, un único modelo para todos.
+    # fractional=True escalona hasta xB (no 1.05 xB) e interpola la última etapa, como
+    # utils.pinch_stepping; los casos con pinch o sin llegar a xB quedan en NaN
+    R, q, xD, zF, xB, alpha = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (R, q, xD, zF, xB, alpha)))
+    shape = R.shape
+    R, q, xD, zF, xB, alpha = (v.ravel() for v in (R, q, xD, zF, xB, alpha))
+    n = R.size
+    calc_y, calc_x = _equilibrium(alpha, model)
+    everything = np.arange(n)
+
+    x_int, y_int = intersection(R, q, xD, zF)
+    valid = (xB <= x_int) & (x_int <= xD) & (y_int <= calc_y(everything, x_int))
+    slope_rect = R / (R + 1)
+    intercept_rect = xD / (R + 1)
+    run = x_int - xB
+    slope_strip = (y_int - xB) / np.where(run == 0, np.nan, run)
+    intercept_strip = y_int - slope_strip * x_int
+
+    n_stages = np.zeros(n, dtype=np.int64)
+    feed_stage = np.zeros(n, dtype=np.int64)
+    history = []
+    x, y = xD.copy(), xD.copy()
+    threshold = xB.copy() if fractional else xB * 1.05
+    fractional_stages = np.full(n, np.nan)
+    idx = np.flatnonzero(x > threshold)
+    stage = 0
+    while idx.size and stage < max_stages:
+        xi, yi = x[idx], y[idx]
+        y_out = np.clip(calc_y(idx, xi), *Constants.Y_RANGE)
+        # En modo fraccionario siempre se escalona en horizontal, como utils.pinch_stepping
+        step = fractional | (np.abs(y_out - yi) > 1e-3)
+        x_out = np.where(step, calc_x(idx, yi), xi)
+        y_out = np.where(step, yi, y_out)
+        x_out = np.clip(x_out, *Constants.X_RANGE)
+        rectifying = x_out > x_int[idx]
+        y_new = np.where(rectifying, slope_rect[idx] * x_out + intercept_rect[idx],
+                         np.where(x_out <= xB[idx], x_out, slope_strip[idx] * x_out + intercept_strip[idx]))
+        y_new = np.clip(y_new, *Constants.Y_RANGE)
+        stage += 1
+        n_stages[idx] = stage
+        first_strip = idx[~rectifying & (feed_stage[idx] == 0)]
+        feed_stage[first_strip] = stage
+        if trajectories:
+            history.append((idx, xi, y_out, x_out, y_new))
+        x[idx], y[idx] = x_out, y_new
+        remaining = x_out > threshold[idx]
+        if fractional:
+            done = ~remaining
+            fractional_stages[idx[done]] = stage - 1 + (xi[done] - xB[idx[done]]) / (xi[done] - x_out[done])
+            remaining &= x_out < xi - PINCH_TOL
+        idx = idx[remaining]
+
+    padded = {}
+    if trajectories:
+        for name in ('x_in', 'y_out', 'x_out', 'y_in'):
+            padded[name] = np.full((n, stage), np.nan)
+        for column, (rows, *values) in enumerate(history):
+            for name, value in zip(('x_in', 'y_out', 'x_out', 'y_in'), values):
+                padded[name][rows, column] = value
+        padded = {name: value.reshape(shape + (stage,)) for name, value in padded.items()}
+    if fractional:
+        padded['fractional_stages'] = fractional_stages.reshape(shape)
+    return BatchResult(x_int.reshape(shape), y_int.reshape(shape), valid.reshape(shape),
+                       n_stages.reshape(shape), feed_stage.reshape(shape), **padded)
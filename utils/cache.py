@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from constants import Constants
+from utils import solver
+
+# Caché LRU de resultados del solver, acotada en entradas y en bytes. La clave combina la
+# huella del modelo de equilibrio con el estado cuantizado de la columna.
+
+STATE_DECIMALS = 6
+ENTRY_OVERHEAD = 512
+
+def state_key(spec):
+    return tuple(round(float(v), STATE_DECIMALS) for v in (spec.R, spec.q, spec.xD, spec.zF, spec.xB))
+
+def result_size(result):
+    return ENTRY_OVERHEAD + result.stages.nbytes + result.segments.nbytes
+
+class SolverCache:
+    def __init__(self, max_entries=Constants.SOLVER_CACHE_ENTRIES, max_bytes=Constants.SOLVER_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def solve(self, spec, stages=True, rmin=False, max_stages=solver.MAX_STAGES, exact=False):
+        key = (spec.model.fingerprint(), state_key(spec), stages, rmin, max_stages, exact)
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        result = solver.solve(spec, stages=stages, rmin=rmin, max_stages=max_stages, exact=exact)
+        self._store(key, result)
+        return result
+
+    def _store(self, key, result):
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = result
+            self.nbytes += size
+            while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.nbytes -= result_size(evicted)
+
+    def invalidate(self, fingerprint=None):
+        with self.lock:
+            if fingerprint is None:
+                self.entries.clear()
+                self.nbytes = 0
+                return
+            for key in [k for k in self.entries if k[0] == fingerprint]:
+                self.nbytes -= result_size(self.entries.pop(key))
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
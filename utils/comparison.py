@@ -0,0 +1,108 @@
+import copy
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from constants import Constants
+from utils import solver
+from utils.batch import solve_batch
+from utils.cache import STATE_DECIMALS, state_key
+
+# Comparación de varios modelos de equilibrio sobre la misma columna. Cada modelo guarda sus
+# propios resultados: la curva depende solo del modelo, Rmin de (q, zF, xD) y la escalera del
+# estado completo, así que mover R o xB no vuelve a calcular ni la curva ni Rmin. La
+# evaluación es secuencial: el panel ya la ejecuta en su propio hilo de trabajo.
+
+CURVE_POINTS = 200
+RMIN_ENTRIES = 256
+SLOT_CACHE_ENTRIES = 512
+MAX_MODELS = 6
+
+@dataclass(frozen=True)
+class ComparisonEntry:
+    label: str
+    x_curve: np.ndarray
+    y_curve: np.ndarray
+    valid: bool
+    n_stages: int
+    feed_stage: int
+    segments: np.ndarray
+    rmin: float
+
+def model_label(model):
+    from models.custom_data import CustomDataModel
+    from models.peng_robinson import PengRobinsonModel
+    from models.raoult import RaoultModel
+    if isinstance(model, RaoultModel):
+        return f"Raoult (α = {model.alpha:.2f})"
+    if isinstance(model, PengRobinsonModel):
+        return f"Peng-Robinson: {model.mixture}"
+    if isinstance(model, CustomDataModel):
+        return f"Datos personalizados ({len(model.x_data)} puntos)"
+    return type(model).__name__
+
+class ModelSlot:
+    def __init__(self, model, label=None):
+        # Copia propia: los cambios del modelo de la ventana no alteran la comparación
+        self.model = copy.copy(model)
+        self.label = label or model_label(model)
+        self.fingerprint = self.model.fingerprint()
+        self.stages = OrderedDict()
+        self.curve = None
+        self.rmin = {}
+
+    def evaluate(self, state):
+        spec = solver.ColumnSpec.from_state(state, self.model)
+        if self.curve is None:
+            x = np.linspace(Constants.X_RANGE[0], 1.0, CURVE_POINTS)
+            self.curve = (x, np.asarray(self.model.calculate_y(x), dtype=float))
+        stages = self._stages(spec)
+        key = tuple(round(float(state[name]), STATE_DECIMALS) for name in ('q', 'zF', 'xD'))
+        rmin = self.rmin.get(key)
+        if rmin is None:
+            if len(self.rmin) >= RMIN_ENTRIES:
+                self.rmin.clear()
+            rmin = self.rmin[key] = solver.minimum_reflux(spec)
+        return ComparisonEntry(self.label, *self.curve, *stages, rmin)
+
+    def _stages(self, spec):
+        # Escalera con el motor por lotes (un caso), que ya informa la etapa de alimentación
+        key = state_key(spec)
+        if key in self.stages:
+            self.stages.move_to_end(key)
+            return self.stages[key]
+        batch = solve_batch(spec.R, spec.q, spec.xD, spec.zF, spec.xB, model=self.model)
+        n = int(batch.n_stages)
+        valid = bool(batch.valid)
+        rows = np.column_stack([getattr(batch, name)[:n] for name in ('x_in', 'y_out', 'x_out', 'y_in')])
+        segments = solver.stage_arrays(rows)[1] if valid else solver.empty_segments()
+        entry = self.stages[key] = (valid, n, int(batch.feed_stage), segments)
+        if len(self.stages) > SLOT_CACHE_ENTRIES:
+            self.stages.popitem(last=False)
+        return entry
+
+class ModelComparison:
+    def __init__(self):
+        self.slots = []
+
+    def __len__(self):
+        return len(self.slots)
+
+    def add(self, model, label=None):
+        slot = ModelSlot(model, label)
+        if any(s.fingerprint == slot.fingerprint for s in self.slots):
+            raise ValueError(f"El modelo ya está en la comparación: {slot.label}")
+        if len(self.slots) >= MAX_MODELS:
+            raise ValueError(f"Se pueden comparar como máximo {MAX_MODELS} modelos")
+        self.slots.append(slot)
+        return slot
+
+    def remove(self, index):
+        del self.slots[index]
+
+    def clear(self):
+        self.slots = []
+
+    def evaluate(self, state, slots=None):
+        slots = list(self.slots if slots is None else slots)
+        state = dict(state)
+        return [slot.evaluate(state) for slot in slots]
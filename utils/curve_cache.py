@@ -0,0 +1,47 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+
+# Caché en disco de curvas x-y generadas: un .npy por clave, abierto con memmap al cargar.
+# La clave incluye los parámetros de los componentes, así que editar la base invalida la
+# curva sin borrar nada a mano. DESTILACION_CACHE permite cambiar el directorio.
+
+CURVE_VERSION = 1
+
+def cache_dir():
+    return os.environ.get('DESTILACION_CACHE',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'destilacion', 'curves'))
+
+def curve_path(key):
+    digest = hashlib.sha1(repr((CURVE_VERSION,) + tuple(key)).encode()).hexdigest()
+    return os.path.join(cache_dir(), f"{digest}.npy")
+
+def load_curve(key):
+    path = curve_path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return np.load(path, mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+
+def save_curve(key, table):
+    # Escritura atómica; si el directorio no es escribible la caché simplemente no se usa
+    path = curve_path(key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(path))
+    except OSError as e:
+        print(f"Error al guardar la curva en caché: {e}")
+        return
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, np.ascontiguousarray(table, dtype=np.float64))
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"Error al guardar la curva en caché: {e}")
+    finally:
+        # Si algo falló antes del replace no queda un temporal huérfano
+        if os.path.exists(tmp):
+            os.unlink(tmp)
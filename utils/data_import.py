@@ -0,0 +1,31 @@
+import os
+import numpy as np
+
+# Importación por bloques de datos x-y a arreglos de numpy, pensada para 10^4-10^6 filas.
+# progress(fracción) informa del avance; cancelled() permite abortar entre bloques.
+
+CHUNK_ROWS = 100000
+
+class ImportCancelled(Exception):
+    pass
+
+def read_xy_csv(path, chunk_rows=CHUNK_ROWS, progress=None, cancelled=None):
+    import pandas as pd
+    size = os.path.getsize(path) or 1
+    xs, ys = [], []
+    with open(path, 'rb') as f:
+        reader = pd.read_csv(f, chunksize=chunk_rows)
+        for chunk in reader:
+            if 'x' not in chunk.columns or 'y' not in chunk.columns:
+                raise ValueError("El archivo CSV debe tener columnas 'x' y 'y'.")
+            block = chunk[['x', 'y']].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            block = block[~np.isnan(block).any(axis=1)]
+            xs.append(block[:, 0])
+            ys.append(block[:, 1])
+            if cancelled is not None and cancelled():
+                raise ImportCancelled()
+            if progress is not None:
+                progress(min(f.tell() / size, 1.0))
+    if not xs:
+        return np.empty(0), np.empty(0)
+    return np.concatenate(xs), np.concatenate(ys)
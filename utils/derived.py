@@ -0,0 +1,153 @@
+import weakref
+import numpy as np
+from constants import Constants
+from utils import solver
+from utils.energy_balance import duties, flows
+from utils.profiling import PROFILER
+from utils.rmin import minimum_reflux
+from utils.sensitivity import sensitivity
+from utils.shortcut import estimate
+
+# Estado derivado con dependencias declaradas. Cada nodo lista sus entradas (o nodos de los
+# que depende) y se memoriza con las versiones de las entradas que alcanza: mover R no vuelve
+# a muestrear la curva ni la línea q, y cambiar alpha no reconstruye la línea q. Las vistas
+# piden los nodos que usan y solo se refrescan cuando alguno de ellos cambió. La escalera se
+# resuelve fuera del grafo (SolverCache, en el hilo de trabajo); 'stages' es la versión de la
+# escalera mostrada y la ventana la avanza con touch al aplicarla o borrarla.
+
+INPUTS = ('R', 'q', 'xD', 'zF', 'xB', 'model', 'energy', 'stages')
+CURVE_POINTS = 100
+Q_LINE_POINTS = 100
+R_RANGE = (0.05, 5.0)
+R_GRID = np.linspace(*R_RANGE, 200)
+NODES = {}
+
+def node(name, *deps):
+    def register(func):
+        NODES[name] = (deps, func)
+        return func
+    return register
+
+@node('spec', 'R', 'q', 'xD', 'zF', 'xB', 'model')
+def _spec(R, q, xD, zF, xB, model):
+    return solver.ColumnSpec(R, q, xD, zF, xB, model)
+
+@node('curve', 'model')
+def _curve(model):
+    x = np.linspace(Constants.X_RANGE[0], 1.0, CURVE_POINTS)
+    return x, np.asarray(model.calculate_y(x), dtype=float)
+
+@node('q_line', 'q', 'zF')
+def _q_line(q, zF):
+    if abs(q - 1) < 1e-6:
+        return np.array([zF, zF]), np.array(Constants.Y_RANGE, dtype=float)
+    x = np.linspace(*Constants.X_RANGE, Q_LINE_POINTS)
+    return x, (q * x - zF) / (q - 1)
+
+@node('intersection', 'R', 'q', 'xD', 'zF')
+def _intersection(R, q, xD, zF):
+    return solver.operating_intersection(R, q, xD, zF)
+
+@node('valid', 'spec', 'intersection')
+def _valid(spec, point):
+    return solver.is_valid(spec, point)
+
+@node('shortcut', 'spec')
+def _shortcut(spec):
+    return estimate(spec)
+
+@node('rmin', 'model', 'q', 'zF', 'xD')
+def _rmin(model, q, zF, xD):
+    return minimum_reflux(model, q, zF, xD).rmin
+
+@node('flows', 'zF', 'xD', 'xB', 'energy')
+def _flows(zF, xD, xB, energy):
+    return flows(zF, xD, xB, energy[2])
+
+@node('duties', 'R', 'zF', 'xD', 'xB', 'energy')
+def _duties(R, zF, xD, xB, energy):
+    return duties(R, zF, xD, xB, *energy)
+
+@node('duty_curve', 'zF', 'xD', 'xB', 'energy')
+def _duty_curve(zF, xD, xB, energy):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return duties(R_GRID, zF, xD, xB, *energy)
+
+@node('sensitivity', 'spec', 'energy')
+def _sensitivity(spec, energy):
+    state = {name: getattr(spec, name) for name in ('R', 'q', 'xD', 'zF', 'xB')}
+    return sensitivity(state, spec.model, energy)
+
+class DerivedState:
+    def __init__(self, nodes=NODES):
+        self.nodes = nodes
+        self.values = {'energy': (Constants.HVAP_LIGHT, Constants.HVAP_HEAVY, Constants.FEED_FLOW), 'stages': 0}
+        self.versions = dict.fromkeys(INPUTS, 0)
+        self.model_key = None
+        self.memo = {}
+        self.reach = {}
+        self.seen = weakref.WeakKeyDictionary()
+
+    def set(self, name, value):
+        if name == 'model':
+            # El modelo de Raoult cambia en el lugar con set_alpha: se compara la huella
+            key = value.fingerprint()
+            changed = key != self.model_key or value is not self.values.get('model')
+            self.model_key = key
+        else:
+            changed = name not in self.values or self.values[name] != value
+        self.values[name] = value
+        if changed:
+            self.versions[name] += 1
+        return changed
+
+    def touch(self, name):
+        # Entrada sin valor propio: solo avanza su versión
+        self.versions[name] += 1
+        self.values[name] = self.versions[name]
+
+    def sync(self, state, model):
+        for name in ('R', 'q', 'xD', 'zF', 'xB'):
+            self.set(name, float(state[name]))
+        self.set('model', model)
+
+    def inputs_of(self, name):
+        # Entradas alcanzables desde un nodo, calculadas una vez
+        if name in self.versions:
+            return (name,)
+        if name not in self.reach:
+            found = []
+            for dep in self.nodes[name][0]:
+                found.extend(i for i in self.inputs_of(dep) if i not in found)
+            self.reach[name] = tuple(found)
+        return self.reach[name]
+
+    def stamp(self, name):
+        return tuple(self.versions[i] for i in self.inputs_of(name))
+
+    def get(self, name):
+        if name in self.versions:
+            return self.values[name]
+        stamp = self.stamp(name)
+        cached = self.memo.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        deps, func = self.nodes[name]
+        PROFILER.count(f'derived:{name}')
+        value = func(*(self.get(dep) for dep in deps))
+        self.memo[name] = (stamp, value)
+        return value
+
+    def changed(self, owner, names):
+        # True si alguno de los nodos cambió desde la última consulta de este suscriptor
+        stamps = {name: self.stamp(name) for name in names}
+        previous = self.seen.get(owner)
+        self.seen[owner] = stamps
+        return previous != stamps
+
+    def notify(self, views):
+        # Las vistas declaran en depends_on los nodos que usan; None las refresca siempre
+        for view in list(views):
+            names = getattr(view, 'depends_on', None)
+            if names is None or self.changed(view, names):
+                view.refresh()
@@ -1,6 +1,47 @@
+from dataclasses import dataclass
 import numpy as np
 from constants import Constants
 
+# Balance de materia y energía sin estado, sobre escalares o arreglos de R, zF, xD y xB.
+# EnergyBalance y calculate_energy_balance adaptan estas funciones al estado de la ventana.
+
+@dataclass(frozen=True)
+class EnergyResult:
+    F: np.ndarray
+    D: np.ndarray
+    B: np.ndarray
+    V: np.ndarray
+    Q_R: np.ndarray
+    Q_C: np.ndarray
+
+SCALAR = (int, float)  # float cubre también np.float64
+
+def flows(zF, xD, xB, feed_flow=Constants.FEED_FLOW):
+    if isinstance(zF, SCALAR) and isinstance(xD, SCALAR) and isinstance(xB, SCALAR):
+        D = (zF - xB) / (xD - xB) * feed_flow
+        return feed_flow, D, feed_flow - D
+    zF, xD, xB = (np.asarray(v, dtype=float) for v in (zF, xD, xB))
+    D = (zF - xB) / (xD - xB) * feed_flow
+    B = feed_flow - D
+    return np.broadcast_to(np.asarray(feed_flow, dtype=float), D.shape)[()], D[()], B[()]
+
+def duties(R, zF, xD, xB, hvap_light=Constants.HVAP_LIGHT, hvap_heavy=Constants.HVAP_HEAVY,
+           feed_flow=Constants.FEED_FLOW):
+    # Q_R con el ΔHvap medio del fondo y Q_C con el del destilado, ambos con V = (R + 1) D
+    if isinstance(R, SCALAR) and isinstance(zF, SCALAR) and isinstance(xD, SCALAR) and isinstance(xB, SCALAR):
+        # Camino escalar sin numpy: la ventana de energía lo llama en cada tick de slider
+        D = (zF - xB) / (xD - xB) * feed_flow
+        V = (R + 1) * D
+        return EnergyResult(feed_flow, D, feed_flow - D, V, V * (xB * hvap_heavy + (1 - xB) * hvap_light),
+                            V * (xD * hvap_light + (1 - xD) * hvap_heavy))
+    R, xD, xB = (np.asarray(v, dtype=float) for v in (R, xD, xB))
+    F, D, B = flows(zF, xD, xB, feed_flow)
+    V = (R + 1) * D
+    Q_R = V * (xB * hvap_heavy + (1 - xB) * hvap_light)
+    Q_C = V * (xD * hvap_light + (1 - xD) * hvap_heavy)
+    F, D, B = (np.broadcast_to(v, V.shape)[()] for v in (F, D, B))
+    return EnergyResult(F, D, B, V[()], Q_R[()], Q_C[()])
+
 class EnergyBalance:
     def __init__(self, window, hvap_light, hvap_heavy, feed_flow):
         self.window = window
@@ -8,46 +49,37 @@ class EnergyBalance:
         self.Hvap_heavy = hvap_heavy  # Entalpía del componente pesado (kJ/mol)
         self.F = feed_flow           # Flujo de alimentación (mol/s)
 
+    def _duties(self):
+        state = self.window.state
+        return duties(state['R'], state['zF'], state['xD'], state['xB'],
+                      self.Hvap_light, self.Hvap_heavy, self.F)
+
     def calculate_flows(self):
-        zF = self.window.state['zF']
-        xD = self.window.state['xD']
-        xB = self.window.state['xB']
-        D = (zF - xB) / (xD - xB) * self.F
-        B = self.F - D
-        return self.F, D, B
+        result = self._duties()
+        return result.F, result.D, result.B
 
     def calculate_reboiler_heat(self):
-        _, D, B = self.calculate_flows()
-        R = self.window.state['R']
-        V = (R + 1) * D
-        xB = self.window.state['xB']
-        Hvap_avg = xB * self.Hvap_heavy + (1 - xB) * self.Hvap_light
-        Q_R = V * Hvap_avg  # kJ/s
-        return Q_R
+        return self._duties().Q_R  # kJ/s
 
     def calculate_condenser_heat(self):
-        _, D, _ = self.calculate_flows()
-        R = self.window.state['R']
-        V = (R + 1) * D
-        xD = self.window.state['xD']
-        Hvap_avg = xD * self.Hvap_light + (1 - xD) * self.Hvap_heavy
-        Q_C = V * Hvap_avg  # kJ/s
-        return Q_C
+        return self._duties().Q_C  # kJ/s
 
     def get_energy_summary(self):
-        Q_R = self.calculate_reboiler_heat()
-        Q_C = self.calculate_condenser_heat()
-        F, D, B = self.calculate_flows()
-        summary = {
-            'Feed Flow (F, mol/s)': F,
-            'Distillate Flow (D, mol/s)': D,
-            'Bottoms Flow (B, mol/s)': B,
-            'Reboiler Heat (Q_R, kJ/s)': Q_R,
-            'Condenser Heat (Q_C, kJ/s)': Q_C,
-            'Energy Ratio (Q_R/Q_C)': Q_R / Q_C if Q_C != 0 else float('inf')
-        }
-        return summary
-
-def calculate_energy_balance(window, hvap_light=38.56, hvap_heavy=40.65, feed_flow=1.0):
+        return energy_summary(self._duties())
+
+def energy_summary(result):
+    Q_R, Q_C = result.Q_R, result.Q_C
+    summary = {
+        'Feed Flow (F, mol/s)': result.F,
+        'Distillate Flow (D, mol/s)': result.D,
+        'Bottoms Flow (B, mol/s)': result.B,
+        'Reboiler Heat (Q_R, kJ/s)': Q_R,
+        'Condenser Heat (Q_C, kJ/s)': Q_C,
+        'Energy Ratio (Q_R/Q_C)': Q_R / Q_C if Q_C != 0 else float('inf')
+    }
+    return summary
+
+def calculate_energy_balance(window, hvap_light=Constants.HVAP_LIGHT, hvap_heavy=Constants.HVAP_HEAVY,
+                             feed_flow=Constants.FEED_FLOW):
     eb = EnergyBalance(window, hvap_light, hvap_heavy, feed_flow)
     return eb.get_energy_summary()
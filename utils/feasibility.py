@@ -0,0 +1,128 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from models.raoult import RaoultModel
+from utils.batch import solve_batch
+from utils.solver import MAX_STAGES
+
+# Mapa de factibilidad y número de etapas sobre dos parámetros de diseño. Se evalúa una malla
+# gruesa y, nivel a nivel, solo se subdividen (quadtree) los bloques que tocan la frontera
+# factible/no factible o donde el número de etapas salta; el resto hereda el valor de su
+# esquina ya evaluada.
+
+RANGES = {'R': (0.05, 5.0), 'q': (-2.0, 3.0), 'xD': (0.70, 0.95), 'xB': (0.05, 0.25)}
+VIEWS = {'R-q': ('R', 'q'), 'xD-xB': ('xD', 'xB')}
+COARSE = 16
+LEVELS = 3
+STAGE_STEP = 2
+KEY_DECIMALS = 4
+CACHE_ENTRIES = 32
+
+@dataclass(frozen=True)
+class FeasibilityMap:
+    axes: tuple
+    x: np.ndarray
+    y: np.ndarray
+    n_stages: np.ndarray
+    feasible: np.ndarray
+    level: int
+    evaluated: int
+
+    @property
+    def complete(self):
+        return self.level == LEVELS
+
+def feasibility_key(model, state, axes):
+    fixed = tuple(round(float(state[p]), KEY_DECIMALS) for p in ('R', 'q', 'xD', 'zF', 'xB') if p not in axes)
+    return (model.fingerprint(), tuple(axes), fixed)
+
+def _evaluate(model, state, axes, a, b):
+    values = {p: np.full(a.shape, float(state[p])) for p in ('R', 'q', 'xD', 'zF', 'xB')}
+    values[axes[0]], values[axes[1]] = a, b
+    if isinstance(model, RaoultModel):
+        alpha, model = model.alpha, None
+    else:
+        alpha = 1.0
+    result = solve_batch(values['R'], values['q'], values['xD'], values['zF'], values['xB'], alpha,
+                         model=model, trajectories=False)
+    feasible = result.valid & (result.n_stages > 0) & (result.n_stages < MAX_STAGES)
+    return np.where(feasible, result.n_stages, np.nan), feasible
+
+def _fill(target, rows, cols, size, values):
+    # Cada punto evaluado representa el bloque size×size que empieza en él
+    offsets = np.arange(size)
+    target[rows[:, None, None] + offsets[None, :, None], cols[:, None, None] + offsets[None, None, :]] = \
+        values[:, None, None]
+
+def _boundary(feasible, n_stages):
+    # Bloques en la frontera de factibilidad o con saltos grandes en el número de etapas
+    edge = np.zeros_like(feasible)
+    with np.errstate(invalid='ignore'):
+        rows = (feasible[:-1, :] != feasible[1:, :]) | (np.abs(n_stages[:-1, :] - n_stages[1:, :]) > STAGE_STEP)
+        cols = (feasible[:, :-1] != feasible[:, 1:]) | (np.abs(n_stages[:, :-1] - n_stages[:, 1:]) > STAGE_STEP)
+    edge[:-1, :] |= rows
+    edge[1:, :] |= rows
+    edge[:, :-1] |= cols
+    edge[:, 1:] |= cols
+    return edge
+
+def iter_feasibility(model, state, axes=VIEWS['R-q'], coarse=COARSE, levels=LEVELS):
+    # Genera un FeasibilityMap por nivel de refinamiento, de grueso a fino
+    size = coarse * 2 ** levels
+    x = np.linspace(*RANGES[axes[0]], size)
+    y = np.linspace(*RANGES[axes[1]], size)
+    n_stages = np.full((size, size), np.nan)
+    feasible = np.zeros((size, size), dtype=bool)
+    stride = size // coarse
+    rows, cols = (v.ravel() for v in np.meshgrid(np.arange(0, size, stride), np.arange(0, size, stride),
+                                                 indexing='ij'))
+    evaluated = 0
+    for level in range(levels + 1):
+        stages, ok = _evaluate(model, state, axes, x[rows], y[cols])
+        evaluated += len(rows)
+        _fill(n_stages, rows, cols, stride, stages)
+        _fill(feasible, rows, cols, stride, ok)
+        yield FeasibilityMap(tuple(axes), x, y, n_stages.copy(), feasible.copy(), level, evaluated)
+        if level == levels:
+            break
+        block_i, block_j = np.nonzero(_boundary(feasible[::stride, ::stride], n_stages[::stride, ::stride]))
+        half = stride // 2
+        rows = np.concatenate([block_i * stride + di for di, _ in ((half, 0), (0, half), (half, half))])
+        cols = np.concatenate([block_j * stride + dj for _, dj in ((half, 0), (0, half), (half, half))])
+        stride = half
+
+def compute_feasibility(model, state, axes=VIEWS['R-q'], **kwargs):
+    for result in iter_feasibility(model, state, axes, **kwargs):
+        pass
+    return result
+
+class FeasibilityCache:
+    # Mapas terminados por (huella del modelo, ejes, parámetros fijos). La huella ya distingue
+    # cada alpha, así que no hace falta vaciarla al cambiar el modelo: la acota el LRU
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            result = self.entries.get(key)
+            if result is not None:
+                self.entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, fingerprint=None):
+        with self.lock:
+            if fingerprint is None:
+                self.entries.clear()
+                return
+            for key in [k for k in self.entries if k[0] == fingerprint]:
+                del self.entries[key]
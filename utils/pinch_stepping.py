@@ -0,0 +1,96 @@
+import math
+import numpy as np
+
+# Escalonado McCabe-Thiele exacto hasta xB con aceleración cerca de los pinch. Cuando los
+# avances por etapa forman una progresión geométrica estable (equilibrio localmente lineal),
+# se salta analíticamente un bloque de etapas al estilo Kremser y se vuelve a medir con pasos
+# explícitos. La última etapa se informa como fracción exacta en lugar de cortar en 1.05·xB.
+
+EXACT_MAX_STAGES = 100000
+PINCH_TOL = 1e-12
+MIN_JUMP = 8
+RATIO_MIN = 0.5
+DRIFT_BUDGET = 0.01
+
+def _operating_lines(spec, point):
+    x_int, y_int = point
+    slope_r = spec.R / (spec.R + 1)
+    intercept_r = spec.xD / (spec.R + 1)
+    run = x_int - spec.xB
+    slope_s = (y_int - spec.xB) / run if run != 0 else np.inf
+    def operating(x):
+        if np.ndim(x) == 0:
+            return slope_r * x + intercept_r if x > x_int else y_int + slope_s * (x - x_int)
+        return np.where(x > x_int, slope_r * x + intercept_r, y_int + slope_s * (x - x_int))
+    return operating
+
+def _geometric_jump(steps, x, target, budget):
+    # Número de etapas a saltar (0 si la progresión aún no es estable), razón estimada y pinch
+    r1 = steps[-1] / steps[-2]
+    r0 = steps[-2] / steps[-3]
+    drift = abs(r1 - r0)
+    if not (RATIO_MIN < r1 < 1):
+        return 0, r1, False
+    # La razón deriva con la curvatura del equilibrio: se acota su cambio acumulado en el salto
+    if drift > 0:
+        budget = min(budget, int(DRIFT_BUDGET * (1 - r1) / drift))
+    d = steps[-1]
+    remaining = x - target
+    if remaining < d * r1 / (1 - r1):
+        k = math.log(1 - remaining * (1 - r1) / (d * r1)) / math.log(r1)
+        k = int(k // 2)
+    else:
+        if d * r1 / (1 - r1) < PINCH_TOL:
+            return 0, r1, True
+        # Inalcanzable con esta razón: se reduce a la mitad la distancia al punto límite
+        k = math.ceil(math.log(0.5) / math.log(r1))
+    k = min(k, budget)
+    return (k if k >= MIN_JUMP else 0), r1, False
+
+def step_stages_exact(spec, point, max_stages=EXACT_MAX_STAGES, accelerate=True):
+    # Devuelve filas (x_in, y_out, x_out, y_in), etapas fraccionarias y si hubo pinch
+    model = spec.model
+    x_int = point[0]
+    operating = _operating_lines(spec, point)
+    blocks = []
+    x, y = spec.xD, spec.xD
+    n = 0
+    steps = []
+    rectifying = x > x_int
+    fractional, pinched = None, False
+    while n < max_stages:
+        x_out = float(model.calculate_x(y))
+        if not x_out < x - PINCH_TOL:
+            pinched = True
+            break
+        if x_out <= spec.xB:
+            blocks.append((x, y, x_out, x_out))
+            fractional = n + (x - spec.xB) / (x - x_out)
+            n += 1
+            break
+        y_new = float(operating(x_out))
+        blocks.append((x, y, x_out, y_new))
+        n += 1
+        if (x_out > x_int) != rectifying:
+            rectifying = x_out > x_int
+            steps = []
+        steps.append(x - x_out)
+        x, y = x_out, y_new
+        if not accelerate or len(steps) < 3:
+            continue
+        target = x_int if rectifying else spec.xB
+        k, ratio, pinched = _geometric_jump(steps, x, target, max_stages - n)
+        if pinched:
+            break
+        if k:
+            j = np.arange(1, k + 1)
+            xs = x - steps[-1] * ratio * (1 - ratio ** j) / (1 - ratio)
+            ys = operating(xs)
+            blocks.append(np.column_stack([np.r_[x, xs[:-1]], np.r_[y, ys[:-1]], xs, ys]))
+            n += k
+            x, y = float(xs[-1]), float(ys[-1])
+            steps = []
+    else:
+        pinched = True
+    rows = np.concatenate([np.atleast_2d(b) for b in blocks]) if blocks else np.zeros((0, 4))
+    return rows, fractional, pinched
@@ -1,9 +1,104 @@
 import numpy as np
+from matplotlib.collections import LineCollection
 from constants import Constants
-from utils.calculations import q_line
+from utils.calculations import shortcut_estimate
 from models.raoult import RaoultModel
+from utils.profiling import PROFILER, format_frame, timed
+
+# Los artistas se crean una sola vez; en cada actualización solo se cambian sus datos
+# y se redibujan sobre el fondo estático cacheado (blitting). La escalera de etapas es
+# una única LineCollection sobre el búfer de segmentos calculado por el solver.
+
+def _create_artists(window):
+    ax = window.ax
+    ax.clear()
+    ax.set_xlim(*Constants.X_RANGE)
+    ax.set_ylim(*Constants.Y_RANGE)
+    ax.set_aspect('equal')
+    ax.grid(True, color='lightgray')
+    ax.set_xlabel("Fracción molar en líquido (x)")
+    ax.set_ylabel("Fracción molar en vapor (y)")
+    x_45 = np.linspace(Constants.X_RANGE[0], 1.0, 100)
+    ax.plot(x_45, x_45, 'b-', label="y = x")
+    artists = {}
+    artists['equilibrium'], = ax.plot([], [], 'r-', label="Curva de Equilibrio")
+    artists['q_line'], = ax.plot([], [], color='purple', label="Línea q")
+    artists['rectifying'], = ax.plot([], [], 'g-', label="Rectificación")
+    artists['stripping'], = ax.plot([], [], color='orange', label="Agotamiento")
+    artists['intersection'], = ax.plot([], [], 'yo', label="Intersección")
+    for key, label in [('xB', "xB"), ('zF', "xF"), ('xD', "xD")]:
+        artists[key], = ax.plot([], [], 'ro', label=label)
+    artists['stages'] = ax.add_collection(LineCollection([], colors='k', linewidths=1), autolim=False)
+    for artist in artists.values():
+        artist.set_animated(True)
+    ax.legend(loc='lower right', bbox_to_anchor=(1.1, 0),
+              bbox_transform=ax.transData, borderaxespad=0., fontsize=10)
+    window.artists = artists
+    window.background = None
+    window.canvas.mpl_connect('draw_event', lambda event: _on_draw(window, event))
+
+def _on_draw(window, event):
+    # Un redibujado completo (inicio, cambio de tamaño) invalida el fondo cacheado. Los
+    # dibujados de savefig (PDF, PNG) usan otro lienzo y tamaño: no tocan el fondo
+    if event.canvas is not window.canvas or window.canvas.is_saving():
+        return
+    window.background = window.canvas.copy_from_bbox(window.fig.bbox)
+    _draw_artists(window)
+
+def _draw_artists(window):
+    for artist in window.artists.values():
+        window.ax.draw_artist(artist)
+
+def _update_artists(window):
+    artists = window.artists
+    state, inter, derived = window.state, window.intersection, window.derived
+    # La curva y la línea q solo se tocan cuando cambian sus entradas
+    if derived.changed(artists['equilibrium'], ('curve',)):
+        artists['equilibrium'].set_data(*derived.get('curve'))
+    if derived.changed(artists['q_line'], ('q_line',)):
+        artists['q_line'].set_data(*derived.get('q_line'))
+    artists['rectifying'].set_data([state['xD'], inter['x']], [state['xD'], inter['y']])
+    artists['stripping'].set_data([state['xB'], inter['x']], [state['xB'], inter['y']])
+    artists['intersection'].set_data([inter['x']], [inter['y']])
+    for key in ('xB', 'zF', 'xD'):
+        artists[key].set_data([state[key]], [state[key]])
+    if window.stages_calculated and not window.point_outside and not window.slider_active:
+        artists['stages'].set_segments(window.stage_segments)
+    else:
+        artists['stages'].set_segments([])
+
+@timed('canvas_draw')
+def _refresh(window):
+    canvas = window.canvas
+    if window.background is None:
+        canvas.draw_idle()
+        return
+    canvas.restore_region(window.background)
+    _draw_artists(window)
+    canvas.blit(window.fig.bbox)
 
 def update_plot(window):
+    _render(window)
+    log = f"Etapas: {len(window.stages_table)} Último x: {window.state['xB']:.2f}"
+    if window.fractional_stages is not None:
+        log += f" Etapas fraccionarias: {window.fractional_stages:.2f}"
+    if window.point_outside:
+        log += " (Sin solución)"
+    elif window.slider_active:
+        log = _shortcut_text(shortcut_estimate(window))
+    if PROFILER.enabled:
+        log += "\n" + format_frame(PROFILER.end_frame())
+    window.log_text.setText(log)
+    window.derived.notify(window.views)
+
+def _shortcut_text(result):
+    if not np.isfinite(result.n_stages):
+        return f"Estimación FUG: R ≤ Rmin ({result.rmin:.2f})"
+    return (f"Estimación FUG: Etapas ≈ {result.n_stages:.1f} Nmin: {result.nmin:.1f} "
+            f"Rmin: {result.rmin:.2f} Alimentación ≈ {result.feed_stage:.0f}")
+
+@timed('update_plot')
+def _render(window):
     from utils.calculations import update_intersection, is_point_valid
     update_intersection(window)
     window.point_outside = not is_point_valid(window)
@@ -11,46 +106,7 @@ def update_plot(window):
         window.valid_state = window.state.copy()
         if isinstance(window.current_model, RaoultModel):
             window.valid_alpha = window.current_model.alpha
-    window.ax.clear()
-    window.ax.set_xlim(*Constants.X_RANGE)
-    window.ax.set_ylim(*Constants.Y_RANGE)
-    window.ax.set_aspect('equal')
-    window.ax.grid(True, color='lightgray')
-    window.ax.set_xlabel("Fracción molar en líquido (x)")
-    window.ax.set_ylabel("Fracción molar en vapor (y)")
-    
-    x_45 = np.linspace(Constants.X_RANGE[0], 1.0, 100)
-    window.ax.plot(x_45, x_45, 'b-', label="y = x")
-    x_eq = np.linspace(Constants.X_RANGE[0], 1.0, 100)
-    y_eq = [window.current_model.calculate_y(x) for x in x_eq]
-    window.ax.plot(x_eq, y_eq, 'r-', label="Curva de Equilibrio")
-    x_q = np.linspace(*Constants.X_RANGE, 100)
-    y_q = [q_line(window, x) for x in x_q]
-    if abs(window.state['q'] - 1) < 1e-6:
-        window.ax.vlines(window.state['zF'], Constants.Y_RANGE[0], Constants.Y_RANGE[1], 
-                        colors='purple', label="Línea q")
-    else:
-        window.ax.plot(x_q, y_q, 'purple', label="Línea q")
-    window.ax.plot([window.state['xD'], window.intersection['x']], 
-                  [window.state['xD'], window.intersection['y']], 'g-', label="Rectificación")
-    window.ax.plot([window.state['xB'], window.intersection['x']], 
-                  [window.state['xB'], window.intersection['y']], 'orange', label="Agotamiento")
-    window.ax.plot(window.intersection['x'], window.intersection['y'], 'yo', label="Intersección")
-    for p, label in [(window.state['xB'], "xB"), (window.state['zF'], "xF"), (window.state['xD'], "xD")]:
-        window.ax.plot(p, p, 'ro', label=label)
-    
-    if window.stages_calculated and not window.point_outside:
-        for i in range(0, len(window.stages_horiz), 2):
-            x_vals, y_vals = zip(window.stages_horiz[i], window.stages_horiz[i+1])
-            window.ax.plot(x_vals, y_vals, 'k-', linewidth=1)
-        for i in range(0, len(window.stages_vert), 2):
-            x_vals, y_vals = zip(window.stages_vert[i], window.stages_vert[i+1])
-            window.ax.plot(x_vals, y_vals, 'k-', linewidth=1)
-    
-    window.ax.legend(loc='lower right', bbox_to_anchor=(1.1, 0), 
-                    bbox_transform=window.ax.transData, borderaxespad=0., fontsize=10)
-    window.canvas.draw()
-    log = f"Etapas: {len(window.stages_table)} Último x: {window.state['xB']:.2f}"
-    if window.point_outside:
-        log += " (Sin solución)"
-    window.log_text.setText(log)
+    if window.artists is None:
+        _create_artists(window)
+    _update_artists(window)
+    _refresh(window)
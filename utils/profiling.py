@@ -0,0 +1,103 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+# Instrumentación ligera de los caminos críticos. Desactivada cuesta una comprobación de un
+# booleano por llamada; activada acumula tiempos por cuadro, contadores y eventos en formato
+# Chrome trace (chrome://tracing, Perfetto).
+
+MAX_EVENTS = 200000
+
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.events = deque(maxlen=MAX_EVENTS)
+            self.frame = defaultdict(float)
+            self.frame_calls = defaultdict(int)
+            self.counters = defaultdict(int)
+            self.totals = defaultdict(float)
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def record(self, name, start, end):
+        duration = end - start
+        with self.lock:
+            self.frame[name] += duration
+            self.frame_calls[name] += 1
+            self.counters[name] += 1
+            self.totals[name] += duration
+            self.events.append({
+                'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': (start - self.origin) * 1e6, 'dur': duration * 1e6,
+            })
+
+    def count(self, name, n=1):
+        if self.enabled:
+            with self.lock:
+                self.counters[name] += n
+
+    def end_frame(self):
+        # Devuelve {nombre: (segundos, llamadas)} acumulado desde el cuadro anterior
+        with self.lock:
+            frame = {name: (self.frame[name], self.frame_calls[name]) for name in self.frame}
+            self.frame.clear()
+            self.frame_calls.clear()
+        return frame
+
+    def summary(self):
+        with self.lock:
+            return {name: {'calls': self.counters[name], 'total_s': self.totals.get(name, 0.0)}
+                    for name in self.counters}
+
+    def dump(self, path):
+        with self.lock:
+            data = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+        data['otherData'] = {'summary': self.summary()}
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+PROFILER = Profiler()
+
+def format_frame(frame):
+    parts = sorted(frame.items(), key=lambda item: -item[1][0])
+    return " · ".join(f"{name} {seconds * 1e3:.2f} ms ({calls})" for name, (seconds, calls) in parts)
+
+class span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if PROFILER.enabled:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.start is not None:
+            PROFILER.record(self.name, self.start, time.perf_counter())
+
+def timed(name):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, start, time.perf_counter())
+        return wrapper
+    return decorate
@@ -0,0 +1,251 @@
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image
+from constants import Constants
+from utils import solver
+from utils.batch import solve_batch
+from utils.rmin import minimum_reflux
+from utils.temperature import bubble_temperature, has_temperature
+
+# Informes por lotes sin Qt: cada proceso construye una sola vez una figura plantilla (Agg)
+# y solo cambia los datos de sus artistas para cada caso. Las páginas se rasterizan en los
+# procesos de trabajo y el proceso principal únicamente las concatena en un PDF de varias
+# páginas y reúne las tablas de etapas por columnas.
+
+PAGE_SIZE = (11.69, 8.27)
+REPORT_DPI = 120
+CHUNK_CASES = 8
+STAGE_COLUMNS = ('case', 'stage', 'x_in', 'y_out', 'x_out', 'y_in', 'T')
+CASE_COLUMNS = ('R', 'q', 'xD', 'zF', 'xB')
+
+_TEMPLATE = None
+
+def _template():
+    global _TEMPLATE
+    if _TEMPLATE is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        fig = Figure(figsize=PAGE_SIZE)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes([0.06, 0.08, 0.6, 0.84])
+        ax.set_xlim(*Constants.X_RANGE)
+        ax.set_ylim(*Constants.Y_RANGE)
+        ax.set_aspect('equal')
+        ax.grid(True, color='lightgray')
+        ax.set_xlabel("Fracción molar en líquido (x)")
+        ax.set_ylabel("Fracción molar en vapor (y)")
+        x_45 = np.linspace(Constants.X_RANGE[0], 1.0, 100)
+        ax.plot(x_45, x_45, 'b-', label="y = x")
+        artists = {}
+        artists['equilibrium'], = ax.plot([], [], 'r-', label="Curva de Equilibrio")
+        artists['q_line'], = ax.plot([], [], color='purple', label="Línea q")
+        artists['rectifying'], = ax.plot([], [], 'g-', label="Rectificación")
+        artists['stripping'], = ax.plot([], [], color='orange', label="Agotamiento")
+        artists['intersection'], = ax.plot([], [], 'yo', label="Intersección")
+        artists['points'], = ax.plot([], [], 'ro', label="xB, xF, xD")
+        artists['stages'] = ax.add_collection(LineCollection([], colors='k', linewidths=1), autolim=False)
+        ax.legend(loc='lower right', fontsize=9)
+        artists['title'] = fig.text(0.06, 0.95, "", fontsize=14, weight='bold')
+        artists['summary'] = fig.text(0.7, 0.9, "", fontsize=11, family='monospace', va='top')
+        for artist in artists.values():
+            artist.set_animated(True)
+        _TEMPLATE = {'fig': fig, 'canvas': canvas, 'artists': artists, 'background': None, 'dpi': None}
+    return _TEMPLATE
+
+def _background(template, dpi):
+    # Ejes, rejilla, marcas y leyenda se dibujan una vez por proceso y resolución
+    if template['dpi'] != dpi:
+        template['fig'].set_dpi(dpi)
+        template['canvas'].draw()
+        template['background'] = template['canvas'].copy_from_bbox(template['fig'].bbox)
+        template['dpi'] = dpi
+    return template['background']
+
+def _case_rows(batch, j):
+    n = int(batch.n_stages[j])
+    return np.column_stack([batch.x_in[j, :n], batch.y_out[j, :n], batch.x_out[j, :n], batch.y_in[j, :n]])
+
+def _draw_case(index, case, model, batch, j, rmin, dpi):
+    template = _template()
+    fig, canvas, artists = template['fig'], template['canvas'], template['artists']
+    background = _background(template, dpi)
+    spec = solver.ColumnSpec(model=model, **{name: float(case[name]) for name in CASE_COLUMNS})
+    x_int, y_int = float(batch.intersection_x[j]), float(batch.intersection_y[j])
+    x_eq = np.linspace(Constants.X_RANGE[0], 1.0, 100)
+    artists['equilibrium'].set_data(x_eq, model.calculate_y(x_eq))
+    if abs(spec.q - 1) < 1e-6:
+        artists['q_line'].set_data([spec.zF, spec.zF], list(Constants.Y_RANGE))
+    else:
+        x_q = np.linspace(*Constants.X_RANGE, 100)
+        artists['q_line'].set_data(x_q, solver.q_line(spec, x_q))
+    artists['rectifying'].set_data([spec.xD, x_int], [spec.xD, y_int])
+    artists['stripping'].set_data([spec.xB, x_int], [spec.xB, y_int])
+    artists['intersection'].set_data([x_int], [y_int])
+    artists['points'].set_data([spec.xB, spec.zF, spec.xD], [spec.xB, spec.zF, spec.xD])
+    valid = bool(batch.valid[j])
+    _, segments = solver.stage_arrays(_case_rows(batch, j)) if valid else (None, solver.empty_segments())
+    artists['stages'].set_segments(segments)
+    artists['title'].set_text(f"Caso {index + 1}")
+    lines = [f"R  = {spec.R:.3f}", f"q  = {spec.q:.3f}", f"xD = {spec.xD:.3f}",
+             f"zF = {spec.zF:.3f}", f"xB = {spec.xB:.3f}", ""]
+    if valid:
+        lines += [f"Etapas      {int(batch.n_stages[j])}", f"Alimentación {int(batch.feed_stage[j])}"]
+    else:
+        lines.append("Sin solución posible")
+    lines.append(f"Rmin        {rmin:.3f}" if np.isfinite(rmin) else "Rmin        sin solución")
+    artists['summary'].set_text("\n".join(lines))
+    canvas.restore_region(background)
+    for artist in artists.values():
+        fig.draw_artist(artist)
+    return canvas
+
+def _render_chunk(start, cases, models, png_dir, pages, dpi):
+    # Resuelve el bloque (un lote por modelo), dibuja cada caso y devuelve páginas y tabla
+    groups = {}
+    for j, model in enumerate(models):
+        groups.setdefault(model.fingerprint(), []).append(j)
+    solved = [None] * len(cases)
+    for rows in groups.values():
+        model = models[rows[0]]
+        values = {name: np.array([float(cases[j][name]) for j in rows]) for name in CASE_COLUMNS}
+        batch = solve_batch(values['R'], values['q'], values['xD'], values['zF'], values['xB'], model=model)
+        pinch = minimum_reflux(model, values['q'], values['zF'], values['xD'])
+        for k, j in enumerate(rows):
+            solved[j] = (batch, k, float(pinch.rmin[k]))
+    rendered, tables, summary = [], [], {name: [] for name in ('n_stages', 'feed_stage', 'valid', 'rmin')}
+    for j, (case, model) in enumerate(zip(cases, models)):
+        batch, k, rmin = solved[j]
+        index = start + j
+        if png_dir or pages:
+            canvas = _draw_case(index, case, model, batch, k, rmin, dpi)
+            width, height = canvas.get_width_height()
+            image = Image.frombuffer('RGBA', (width, height), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).convert('RGB')
+            if png_dir:
+                image.save(os.path.join(png_dir, f"caso_{index + 1:04d}.png"), compress_level=1)
+            if pages:
+                rendered.append((width, height, zlib.compress(image.tobytes(), 1)))
+        rows = _case_rows(batch, k) if batch.valid[k] else np.zeros((0, 4))
+        # T solo con modelos que tienen componentes; en el resto la columna queda en NaN
+        T = bubble_temperature(model, rows[:, 2]) if has_temperature(model) else np.full(len(rows), np.nan)
+        tables.append(np.column_stack([np.full(len(rows), index), np.arange(1, len(rows) + 1), rows, T]))
+        summary['n_stages'].append(int(batch.n_stages[k]))
+        summary['feed_stage'].append(int(batch.feed_stage[k]))
+        summary['valid'].append(bool(batch.valid[k]))
+        summary['rmin'].append(rmin)
+    return start, rendered, np.concatenate(tables), summary
+
+def _chunks(cases, models, chunk_cases):
+    for start in range(0, len(cases), chunk_cases):
+        yield start, cases[start:start + chunk_cases], models[start:start + chunk_cases]
+
+def iter_report(cases, models, png_dir=None, pages=True, dpi=REPORT_DPI, max_workers=None,
+                chunk_cases=CHUNK_CASES):
+    # Genera los bloques en orden; las páginas del PDF deben escribirse en secuencia
+    chunks = list(_chunks(cases, models, chunk_cases))
+    extra = (png_dir, pages, dpi)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        for start, chunk, chunk_models in chunks:
+            yield _render_chunk(start, chunk, chunk_models, *extra)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_chunk, start, chunk, chunk_models, *extra)
+                   for start, chunk, chunk_models in chunks]
+        for future in futures:
+            yield future.result()
+
+class ImagePdfWriter:
+    # PDF mínimo de páginas raster: cada página es una imagen RGB ya comprimida (FlateDecode),
+    # así que escribir una página no vuelve a codificar nada
+    def __init__(self, path, dpi=REPORT_DPI):
+        self.file = open(path, 'wb')
+        self.dpi = dpi
+        self.offsets = {}
+        self.pages = []
+        self.next_id = 3
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _object(self, number, body, stream=None):
+        self.offsets[number] = self.file.tell()
+        self.file.write(f"{number} 0 obj\n".encode() + body)
+        if stream is not None:
+            self.file.write(b"\nstream\n" + stream + b"\nendstream")
+        self.file.write(b"\nendobj\n")
+
+    def add_page(self, width, height, data):
+        image, content, page = self.next_id, self.next_id + 1, self.next_id + 2
+        self.next_id += 3
+        w_pt, h_pt = width * 72 / self.dpi, height * 72 / self.dpi
+        self._object(image, (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                             f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+                             f"/Length {len(data)} >>").encode(), data)
+        drawing = f"q {w_pt:.2f} 0 0 {h_pt:.2f} 0 0 cm /Im0 Do Q".encode()
+        self._object(content, f"<< /Length {len(drawing)} >>".encode(), drawing)
+        self._object(page, (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {w_pt:.2f} {h_pt:.2f}] "
+                            f"/Resources << /XObject << /Im0 {image} 0 R >> >> "
+                            f"/Contents {content} 0 R >>").encode())
+        self.pages.append(page)
+
+    def close(self):
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self._object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode())
+        self._object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.file.tell()
+        count = self.next_id
+        self.file.write(f"xref\n0 {count}\n0000000000 65535 f \n".encode())
+        for number in range(1, count):
+            self.file.write(f"{self.offsets.get(number, 0):010d} 00000 n \n".encode())
+        self.file.write(f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        self.file.close()
+
+def write_table(path, columns):
+    import pandas as pd
+    df = pd.DataFrame(columns)
+    if path.lower().endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+def _check_table(path):
+    # Parquet depende de pyarrow o fastparquet: se comprueba antes de renderizar nada
+    if not path.lower().endswith('.parquet'):
+        return
+    try:
+        from pandas.io.parquet import get_engine
+        get_engine('auto')
+    except ImportError:
+        raise ValueError("Para escribir Parquet se necesita pyarrow o fastparquet; use una tabla .csv.")
+
+def render_report(cases, models, pdf=None, png_dir=None, table=None, dpi=REPORT_DPI, max_workers=None,
+                  chunk_cases=CHUNK_CASES):
+    # Devuelve el resumen por caso; pdf, png_dir y table son salidas opcionales
+    if table:
+        _check_table(table)
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+    writer = ImagePdfWriter(pdf, dpi) if pdf else None
+    tables = []
+    summary = {name: [] for name in ('n_stages', 'feed_stage', 'valid', 'rmin')}
+    try:
+        for _, pages, rows, chunk_summary in iter_report(cases, models, png_dir, writer is not None, dpi,
+                                                         max_workers, chunk_cases):
+            for page in pages:
+                writer.add_page(*page)
+            tables.append(rows)
+            for name, values in chunk_summary.items():
+                summary[name].extend(values)
+    finally:
+        if writer is not None:
+            writer.close()
+    if table:
+        rows = np.concatenate(tables) if tables else np.zeros((0, len(STAGE_COLUMNS)))
+        case = rows[:, 0].astype(np.int64)
+        columns = {'case': case + 1, 'stage': rows[:, 1].astype(np.int64)}
+        for name in CASE_COLUMNS:
+            columns[name] = np.array([float(c[name]) for c in cases])[case]
+        columns.update({name: rows[:, i] for i, name in enumerate(STAGE_COLUMNS[2:], start=2)})
+        write_table(table, columns)
+    return summary
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+import numpy as np
+from utils.profiling import PROFILER, span
+
+# Reflujo mínimo con detección de pinch tangente. La curva de equilibrio se muestrea una sola
+# vez; el cruce con la línea q se acota por cambio de signo y se refina (Brent para un caso,
+# bisección vectorizada para muchos), y el pinch es la pendiente máxima desde (xD, xD).
+
+SAMPLES = 1001
+CHUNK_ROWS = 2048
+BISECTION_STEPS = 52
+
+@dataclass(frozen=True)
+class RminResult:
+    rmin: np.ndarray
+    x_pinch: np.ndarray
+    y_pinch: np.ndarray
+    tangent: np.ndarray
+    x_q: np.ndarray
+    y_q: np.ndarray
+
+def sample_curve(model, samples=SAMPLES):
+    x = np.linspace(0, 1, samples)
+    return x, np.asarray(model.calculate_y(x), dtype=float)
+
+def _q_line(q, zF, x):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (q * x - zF) / (q - 1)
+
+def _bracket(q, zF, curve):
+    # Intervalo de muestreo con cambio de signo más cercano a zF, por fila
+    x_s, y_s = curve
+    f = _q_line(q[:, None], zF[:, None], x_s[None, :]) - y_s[None, :]
+    crossing = (np.sign(f[:, :-1]) * np.sign(f[:, 1:])) <= 0
+    distance = np.where(crossing, np.abs(x_s[None, :-1] - zF[:, None]), np.inf)
+    i = np.argmin(distance, axis=1)
+    found = np.isfinite(distance[np.arange(len(q)), i])
+    return x_s[i], x_s[i + 1], found
+
+def q_intersection(model, q, zF, curve=None):
+    # Caso escalar: acotación sobre la curva muestreada y refinamiento con Brent
+    if abs(q - 1) < 1e-6:
+        return float(zF)
+    curve = curve or sample_curve(model)
+    a, b, found = _bracket(np.array([q], dtype=float), np.array([zF], dtype=float), curve)
+    if not found[0]:
+        return float('nan')
+    from scipy.optimize import brentq
+    def func(x):
+        return float(_q_line(q, zF, x) - model.calculate_y(x))
+    fa, fb = func(a[0]), func(b[0])
+    if fa == 0:
+        return float(a[0])
+    if fb == 0:
+        return float(b[0])
+    PROFILER.count('root_finder')
+    with span('brentq'):
+        return float(brentq(func, a[0], b[0], xtol=1e-14))
+
+def q_intersections(model, q, zF, curve=None):
+    # Caso vectorizado: bisección simultánea dentro de cada intervalo acotado
+    q, zF = (np.atleast_1d(np.asarray(v, dtype=float)) for v in np.broadcast_arrays(q, zF))
+    curve = curve or sample_curve(model)
+    vertical = np.abs(q - 1) < 1e-6
+    a, b, found = _bracket(np.where(vertical, 2.0, q), zF, curve)
+    def func(x):
+        return _q_line(q, zF, x) - np.asarray(model.calculate_y(x), dtype=float)
+    fa = func(a)
+    for _ in range(BISECTION_STEPS):
+        mid = 0.5 * (a + b)
+        fm = func(mid)
+        left = np.sign(fm) == np.sign(fa)
+        a, fa = np.where(left, mid, a), np.where(left, fm, fa)
+        b = np.where(left, b, mid)
+    x = np.where(vertical, zF, np.where(found, 0.5 * (a + b), np.nan))
+    return x
+
+def _pinch_rows(model, q, zF, xD, curve, x_q):
+    x_s, y_s = curve
+    y_q = np.asarray(model.calculate_y(x_q), dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope_q = (xD - y_q) / (xD - x_q)
+        slope = (xD[:, None] - y_s[None, :]) / (xD[:, None] - x_s[None, :])
+    inside = (x_s[None, :] > x_q[:, None]) & (x_s[None, :] < xD[:, None])
+    slope = np.where(inside, slope, -np.inf)
+    i = np.argmax(slope, axis=1)
+    rows = np.arange(len(xD))
+    best = slope[rows, i]
+    # Refinamiento parabólico alrededor del máximo muestreado
+    interior = (i > 0) & (i < len(x_s) - 1) & np.isfinite(best)
+    lo, hi = np.clip(i - 1, 0, len(x_s) - 1), np.clip(i + 1, 0, len(x_s) - 1)
+    s0, s2 = slope[rows, lo], slope[rows, hi]
+    interior &= np.isfinite(s0) & np.isfinite(s2)
+    with np.errstate(invalid='ignore'):
+        curvature = np.where(interior, s0 - 2 * best + s2, 0.0)
+        offset = np.where(interior & (curvature < 0), 0.5 * (s0 - s2) / np.where(curvature < 0, curvature, -1.0), 0.0)
+    h = x_s[1] - x_s[0]
+    x_t = np.clip(x_s[i] + offset * h, x_q, xD)
+    y_t = np.asarray(model.calculate_y(x_t), dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope_t = np.where(interior, (xD - y_t) / (xD - x_t), best)
+    tangent = np.isfinite(slope_t) & (slope_t > slope_q + 1e-9)
+    s = np.where(tangent, slope_t, slope_q)
+    x_p = np.where(tangent, x_t, x_q)
+    y_p = np.where(tangent, y_t, y_q)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rmin = s / (1 - s)
+    invalid = ~np.isfinite(x_q) | (x_q >= xD)
+    return np.where(invalid, np.nan, rmin), x_p, y_p, tangent & ~invalid, y_q
+
+def minimum_reflux(model, q, zF, xD, samples=SAMPLES):
+    # Rmin para uno o muchos (q, zF, xD) con un solo muestreo de la curva de equilibrio
+    scalar = all(np.ndim(v) == 0 for v in (q, zF, xD))
+    shape = np.broadcast(q, zF, xD).shape
+    q, zF, xD = (np.atleast_1d(v).astype(float).ravel() for v in np.broadcast_arrays(q, zF, xD))
+    curve = sample_curve(model, samples)
+    if scalar:
+        x_q = np.array([q_intersection(model, q[0], zF[0], curve)])
+    else:
+        x_q = q_intersections(model, q, zF, curve)
+    parts = []
+    for start in range(0, len(q), CHUNK_ROWS):
+        rows = slice(start, start + CHUNK_ROWS)
+        parts.append(_pinch_rows(model, q[rows], zF[rows], xD[rows], curve, x_q[rows]))
+    rmin, x_p, y_p, tangent, y_q = (np.concatenate(v) for v in zip(*parts))
+    if scalar:
+        return RminResult(*(v[0].item() for v in (rmin, x_p, y_p, tangent, x_q, y_q)))
+    return RminResult(*(v.reshape(shape) for v in (rmin, x_p, y_p, tangent, x_q, y_q)))
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+import numpy as np
+from constants import Constants
+from models.raoult import RaoultModel
+from utils.batch import solve_batch
+from utils.energy_balance import duties
+from utils.rmin import minimum_reflux
+
+# Sensibilidad del diseño frente a cada parámetro. El caso base, los pares ±h de las
+# diferencias centrales y los pares ±Δ del gráfico de tornado se resuelven en un solo lote;
+# las etapas se miden de forma continua (etapa fraccionaria) para que la derivada exista.
+# Las perturbaciones se recortan al intervalo admisible (0 < xB < zF < xD < 1, R > 0, α > 1).
+# La etapa de alimentación es entera: en lugar de derivada se informa su salto en ±Δ.
+
+PARAMETERS = ('R', 'q', 'xD', 'zF', 'xB', 'alpha')
+OUTPUTS = ('fractional_stages', 'feed_stage', 'rmin', 'Q_R', 'Q_C')
+DERIVATIVE_OUTPUTS = ('fractional_stages', 'rmin', 'Q_R', 'Q_C')
+EDGE = 1e-4
+STEPS = {'R': 0.005, 'q': 0.005, 'xD': 0.001, 'zF': 0.001, 'xB': 0.001, 'alpha': 0.005}
+SWINGS = {'R': 0.1, 'q': 0.1, 'xD': 0.02, 'zF': 0.02, 'xB': 0.02, 'alpha': 0.1}
+LABELS = {
+    'fractional_stages': "Etapas (fraccionarias)",
+    'feed_stage': "Etapa de alimentación",
+    'rmin': "Rmin",
+    'Q_R': "Q_R (kJ/s)",
+    'Q_C': "Q_C (kJ/s)",
+}
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    parameters: tuple
+    base: dict
+    derivatives: dict
+    low: dict
+    high: dict
+    swing_low: np.ndarray
+    swing_high: np.ndarray
+    feed_shift: np.ndarray
+    stage_margin: np.ndarray
+
+def limits(name, base):
+    # Intervalo admisible de un parámetro con los demás fijos en el caso base
+    if name == 'R':
+        return EDGE, np.inf
+    if name == 'alpha':
+        return 1 + EDGE, np.inf
+    if name == 'xB':
+        return EDGE, base['zF'] - EDGE
+    if name == 'zF':
+        return base['xB'] + EDGE, base['xD'] - EDGE
+    if name == 'xD':
+        return base['zF'] + EDGE, 1 - EDGE
+    return -np.inf, np.inf
+
+def _cases(state, alpha, parameters, steps, swings):
+    # Fila 0: caso base; luego, por parámetro, base-h, base+h, base-Δ, base+Δ (recortados)
+    base = dict(state, alpha=alpha)
+    rows = [base]
+    deltas = np.zeros((len(parameters), 4))
+    for i, name in enumerate(parameters):
+        lo, hi = limits(name, base)
+        # Un caso base ya fuera del margen no se empuja hacia dentro
+        lo, hi = min(lo, base[name]), max(hi, base[name])
+        for j, delta in enumerate((-steps[name], steps[name], -swings[name], swings[name])):
+            value = float(np.clip(base[name] + delta, lo, hi))
+            deltas[i, j] = value - base[name]
+            rows.append(dict(base, **{name: value}))
+    return {name: np.array([row[name] for row in rows], dtype=float) for name in PARAMETERS}, deltas
+
+def _outputs(cases, model, energy):
+    raoult = isinstance(model, RaoultModel)
+    batch = solve_batch(cases['R'], cases['q'], cases['xD'], cases['zF'], cases['xB'], cases['alpha'],
+                        model=None if raoult else model, trajectories=False, fractional=True)
+    stages = np.where(batch.valid, batch.fractional_stages, np.nan)
+    feed = np.where(batch.valid, batch.feed_stage, np.nan).astype(float)
+    # Rmin: un solo muestreo de la curva por valor distinto de alpha
+    rmin = np.full(len(stages), np.nan)
+    for alpha in np.unique(cases['alpha']):
+        rows = cases['alpha'] == alpha
+        curve_model = RaoultModel(alpha) if raoult else model
+        rmin[rows] = minimum_reflux(curve_model, cases['q'][rows], cases['zF'][rows], cases['xD'][rows]).rmin
+    with np.errstate(divide='ignore', invalid='ignore'):
+        energy_result = duties(cases['R'], cases['zF'], cases['xD'], cases['xB'], *energy)
+    return {'fractional_stages': stages, 'feed_stage': feed, 'rmin': rmin,
+            'Q_R': np.asarray(energy_result.Q_R, dtype=float), 'Q_C': np.asarray(energy_result.Q_C, dtype=float)}
+
+def stage_margin(stages, derivative):
+    # Cambio del parámetro que lleva las etapas fraccionarias al siguiente entero
+    with np.errstate(divide='ignore', invalid='ignore'):
+        up = (np.floor(stages) + 1 - stages) / derivative
+        down = (np.floor(stages) - stages) / derivative
+    return np.where(derivative > 0, up, np.where(derivative < 0, down, np.inf))
+
+def sensitivity(state, model, energy=(Constants.HVAP_LIGHT, Constants.HVAP_HEAVY, Constants.FEED_FLOW),
+                steps=STEPS, swings=SWINGS):
+    raoult = isinstance(model, RaoultModel)
+    # alpha solo es un parámetro del modelo de Raoult
+    parameters = PARAMETERS if raoult else PARAMETERS[:-1]
+    alpha = model.alpha if raoult else Constants.RELATIVE_VOLATILITY
+    cases, deltas = _cases(state, alpha, parameters, steps, swings)
+    values = _outputs(cases, model, energy)
+    base, derivatives, low, high = {}, {}, {}, {}
+    for output, column in values.items():
+        perturbed = column[1:].reshape(len(parameters), 4)
+        base[output] = float(column[0])
+        if output in DERIVATIVE_OUTPUTS:
+            # Con un lado recortado la diferencia usa el paso real de cada lado
+            with np.errstate(divide='ignore', invalid='ignore'):
+                derivatives[output] = (perturbed[:, 1] - perturbed[:, 0]) / (deltas[:, 1] - deltas[:, 0])
+        low[output], high[output] = perturbed[:, 2], perturbed[:, 3]
+    margin = stage_margin(base['fractional_stages'], derivatives['fractional_stages'])
+    return SensitivityResult(parameters, base, derivatives, low, high, np.abs(deltas[:, 2]), deltas[:, 3],
+                             high['feed_stage'] - low['feed_stage'], margin)
+
+def sensitivity_table(result):
+    # Columnas para utils.report.write_table (CSV o Parquet), una fila por parámetro
+    columns = {'parameter': list(result.parameters), 'swing_low': result.swing_low,
+               'swing_high': result.swing_high}
+    for output in OUTPUTS:
+        columns[f'{output}_base'] = np.full(len(result.parameters), result.base[output])
+        if output in DERIVATIVE_OUTPUTS:
+            columns[f'd_{output}'] = result.derivatives[output]
+        columns[f'{output}_low'] = result.low[output]
+        columns[f'{output}_high'] = result.high[output]
+    columns['feed_stage_shift'] = result.feed_shift
+    columns['stage_margin'] = result.stage_margin
+    return columns
@@ -0,0 +1,114 @@
+import csv
+import functools
+import gzip
+import json
+import os
+import time
+import numpy as np
+from constants import Constants
+
+# Grabación de sesiones interactivas: cada cambio de parámetro, cambio de modelo y acción de
+# botón se guarda con su instante relativo en un archivo JSON Lines comprimido con gzip. La
+# primera línea lleva el estado y el modelo iniciales; benchmarks/replay.py la reproduce.
+
+SESSION_VERSION = 1
+
+def model_spec(model):
+    # Descripción serializable de un modelo de equilibrio (mismos campos que los casos del CLI)
+    from models.custom_data import CustomDataModel
+    from models.peng_robinson import PengRobinsonModel
+    from models.raoult import RaoultModel
+    if isinstance(model, RaoultModel):
+        return {'model': 'raoult', 'alpha': float(model.alpha)}
+    if isinstance(model, PengRobinsonModel):
+        return {'model': 'peng-robinson', 'mixture': model.mixture, 'T': float(model.T), 'P': float(model.P)}
+    if isinstance(model, CustomDataModel):
+        return {'model': 'custom', 'x': model.x_data.tolist(), 'y': model.y_data.tolist(),
+                'grid_points': model.grid_points}
+    raise ValueError(f"Modelo sin descripción para la sesión: {type(model).__name__}")
+
+def _field(spec, name, default=None):
+    # Una celda vacía de un CSV de casos cuenta como ausente
+    value = spec.get(name)
+    return default if value is None or value == '' else value
+
+def _read_xy(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    if rows and not {'x', 'y'} <= set(rows[0]):
+        raise ValueError(f"El archivo CSV debe tener columnas 'x' y 'y': {path}")
+    return [float(r['x']) for r in rows], [float(r['y']) for r in rows]
+
+def build_model(spec, base_dir='.', cache=None):
+    # Modelo a partir de su descripción, para las sesiones y los casos del CLI. 'custom' acepta
+    # los puntos en línea (x, y) o un CSV en 'data'; con cache cada CSV se lee una sola vez
+    kind = _field(spec, 'model', 'raoult')
+    if kind == 'raoult':
+        from models.raoult import RaoultModel
+        return RaoultModel(float(_field(spec, 'alpha', Constants.RELATIVE_VOLATILITY)))
+    if kind == 'peng-robinson':
+        from models.peng_robinson import PengRobinsonModel
+        return PengRobinsonModel(mixture=_field(spec, 'mixture', 'ethanol-water'), T=float(_field(spec, 'T', 300)),
+                                 P=float(_field(spec, 'P', Constants.PRESSURE)))
+    if kind == 'custom':
+        from models.custom_data import CustomDataModel
+        grid_points = _field(spec, 'grid_points')
+        grid_points = int(grid_points) if grid_points is not None else None
+        if _field(spec, 'x') is not None and _field(spec, 'y') is not None:
+            return CustomDataModel(np.asarray(spec['x'], dtype=float), np.asarray(spec['y'], dtype=float),
+                                   grid_points=grid_points)
+        data = _field(spec, 'data')
+        if data is None:
+            raise ValueError("El modelo 'custom' necesita 'data' con un CSV de columnas x, y.")
+        key = (kind, os.path.abspath(os.path.join(base_dir, data)), grid_points)
+        if cache is not None and key in cache:
+            return cache[key]
+        model = CustomDataModel(*_read_xy(key[1]), grid_points=grid_points)
+        if cache is not None:
+            cache[key] = model
+        return model
+    raise ValueError(f"Modelo desconocido: {kind}")
+
+class SessionRecorder:
+    def __init__(self, state, model):
+        self.header = {'version': SESSION_VERSION, 'state': dict(state), 'model': model_spec(model)}
+        self.events = []
+        self.start = time.perf_counter()
+        self.suspended = False
+
+    def record(self, kind, payload=None):
+        self.events.append([round(time.perf_counter() - self.start, 4), kind, payload or {}])
+
+    def save(self, path):
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps(self.header) + "\n")
+            for event in self.events:
+                f.write(json.dumps(event, separators=(',', ':')) + "\n")
+
+def load_session(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        if header.get('version') != SESSION_VERSION:
+            raise ValueError(f"Versión de sesión no soportada: {header.get('version')}")
+        events = [json.loads(line) for line in f if line.strip()]
+    return header, events
+
+def recorded(kind, payload=None, silence=False):
+    # Decorador para métodos de DistillationWindow. Con silence=True no se graban los eventos
+    # que el propio método provoca (p. ej. los setValue de los sliders durante un reset)
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            recorder = self.recorder
+            if recorder is None or recorder.suspended:
+                return method(self, *args, **kwargs)
+            recorder.record(kind, payload(*args, **kwargs) if payload else None)
+            if not silence:
+                return method(self, *args, **kwargs)
+            recorder.suspended = True
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                recorder.suspended = False
+        return wrapper
+    return decorate
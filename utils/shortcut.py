@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+import numpy as np
+from models.raoult import RaoultModel
+
+# Estimación rápida Fenske-Underwood-Gilliland en forma cerrada para volatilidad relativa
+# constante. Sirve de vista previa mientras se arrastra un slider; la escalera completa
+# de McCabe-Thiele se calcula al soltarlo. Acepta escalares o arreglos.
+
+FIT_SAMPLES = 101
+
+@dataclass(frozen=True)
+class ShortcutResult:
+    nmin: np.ndarray
+    rmin: np.ndarray
+    n_stages: np.ndarray
+    feed_stage: np.ndarray
+    alpha: np.ndarray
+
+def effective_alpha(model, samples=FIT_SAMPLES):
+    # Raoult usa su alpha; para otros modelos, media geométrica de alpha(x) sobre la curva
+    if isinstance(model, RaoultModel):
+        return model.alpha
+    x = np.linspace(0, 1, samples)[1:-1]
+    y = np.asarray(model.calculate_y(x), dtype=float)
+    inside = (y > 0) & (y < 1)
+    if not inside.any():
+        return np.nan
+    x, y = x[inside], y[inside]
+    return float(np.exp(np.mean(np.log(y * (1 - x) / (x * (1 - y))))))
+
+def fenske(xD, xB, alpha):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(xD / (1 - xD) * (1 - xB) / xB) / np.log(alpha)
+
+def underwood(q, xD, zF, alpha):
+    # Raíz theta entre 1 y alpha de alpha·zF/(alpha-θ) + (1-zF)/(1-θ) = 1-q
+    a = 1 - q
+    b = -(a * (alpha + 1) - (alpha - 1) * zF - 1)
+    c = -q * alpha
+    with np.errstate(divide='ignore', invalid='ignore'):
+        linear = np.abs(a) < 1e-9
+        root = np.sqrt(np.maximum(b * b - 4 * a * c, 0))
+        a_safe = np.where(linear, 1.0, a)
+        theta_1 = (-b + root) / (2 * a_safe)
+        theta_2 = (-b - root) / (2 * a_safe)
+        theta = np.where((theta_1 > 1) & (theta_1 < alpha), theta_1, theta_2)
+        theta = np.where(linear, alpha / (1 + (alpha - 1) * zF), theta)
+        return alpha * xD / (alpha - theta) + (1 - xD) / (1 - theta) - 1
+
+def gilliland(R, rmin, nmin):
+    # Correlación de Molokanov; sin solución (inf) para R <= Rmin
+    with np.errstate(divide='ignore', invalid='ignore'):
+        X = np.clip((R - rmin) / (R + 1), 1e-12, 1.0)
+        Y = 1 - np.exp((1 + 54.4 * X) / (11 + 117.2 * X) * (X - 1) / np.sqrt(X))
+        return np.where(R > rmin, (nmin + Y) / (1 - Y), np.inf)
+
+def kirkbride(n_stages, xD, zF, xB):
+    # Fracción de etapas de rectificación; la alimentación es la etapa siguiente
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = ((1 - zF) / zF * (xB / (1 - xD)) ** 2 * (xD - zF) / (zF - xB)) ** 0.206
+        return n_stages * ratio / (1 + ratio) + 1
+
+def fug(R, q, xD, zF, xB, alpha):
+    R, q, xD, zF, xB, alpha = (np.asarray(v, dtype=float) for v in (R, q, xD, zF, xB, alpha))
+    nmin = fenske(xD, xB, alpha)
+    rmin = underwood(q, xD, zF, alpha)
+    n_stages = gilliland(R, rmin, nmin)
+    feed_stage = kirkbride(n_stages, xD, zF, xB)
+    return ShortcutResult(*(v[()] for v in np.broadcast_arrays(nmin, rmin, n_stages, feed_stage, alpha)))
+
+def estimate(spec):
+    return fug(spec.R, spec.q, spec.xD, spec.zF, spec.xB, effective_alpha(spec.model))
@@ -0,0 +1,151 @@
+from dataclasses import dataclass, field
+import numpy as np
+from constants import Constants
+from models.equilibrium import EquilibriumModel, STAGE_DTYPE
+from utils.pinch_stepping import EXACT_MAX_STAGES, step_stages_exact
+from utils.rmin import q_intersection, minimum_reflux as pinch_minimum_reflux
+
+# Núcleo McCabe-Thiele sin estado: no depende de Qt ni de la ventana, por lo que
+# cada caso puede resolverse en hilos o procesos de trabajo de forma independiente.
+
+MAX_STAGES = 100
+
+def _frozen(array):
+    array.flags.writeable = False
+    return array
+
+def empty_stages():
+    return _frozen(np.zeros(0, dtype=STAGE_DTYPE))
+
+def empty_segments():
+    return _frozen(np.zeros((0, 2, 2)))
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    R: float
+    q: float
+    xD: float
+    zF: float
+    xB: float
+    model: EquilibriumModel
+
+    @classmethod
+    def from_state(cls, state, model):
+        return cls(state['R'], state['q'], state['xD'], state['zF'], state['xB'], model)
+
+@dataclass(frozen=True)
+class ColumnResult:
+    spec: ColumnSpec
+    intersection: tuple
+    valid: bool
+    stages: np.ndarray = field(default_factory=empty_stages)
+    segments: np.ndarray = field(default_factory=empty_segments)
+    rmin: float = None
+    fractional_stages: float = None
+    pinched: bool = False
+
+    @property
+    def n_stages(self):
+        return len(self.stages)
+
+def q_line(spec, x):
+    if abs(spec.q - 1) < 1e-6:
+        return spec.zF
+    slope = spec.q / (spec.q - 1)
+    intercept = -spec.zF / (spec.q - 1)
+    return slope * x + intercept
+
+def rectifying_line(spec, x):
+    return (spec.R / (spec.R + 1)) * x + (spec.xD / (spec.R + 1))
+
+def intersection(spec):
+    return operating_intersection(spec.R, spec.q, spec.xD, spec.zF)
+
+def operating_intersection(R, q, xD, zF):
+    # Cruce de la recta de rectificación con la línea q; no depende del modelo ni de xB
+    if abs(q - 1) < 1e-6:
+        x = zF
+        y = (R / (R + 1)) * zF + (xD / (R + 1))
+    else:
+        slope_q = q / (q - 1)
+        intercept_q = -zF / (q - 1)
+        slope_rect = R / (R + 1)
+        intercept_rect = xD / (R + 1)
+        denom = slope_q - slope_rect
+        x = zF if abs(denom) < 1e-6 else (intercept_rect - intercept_q) / denom
+        y = slope_q * x + intercept_q
+    return float(np.clip(x, *Constants.X_RANGE)), float(np.clip(y, *Constants.Y_RANGE))
+
+def is_valid(spec, point):
+    x, y = point
+    y_eq = spec.model.calculate_y(x)
+    return bool((spec.xB <= x <= spec.xD) and (y <= y_eq))
+
+def step_stages(spec, point, max_stages=MAX_STAGES):
+    model = spec.model
+    x_int, y_int = point
+    # Segmentos (horizontal, vertical) por etapa en un búfer (2n, 2, 2) preasignado
+    stages = np.zeros(max_stages, dtype=STAGE_DTYPE)
+    segments = np.empty((2 * max_stages, 2, 2))
+    x, y = spec.xD, spec.xD
+    stage = 0
+    xB_threshold = spec.xB * 1.05
+    while x > xB_threshold and stage < max_stages:
+        x_out = x
+        y_out = model.calculate_y(x_out)
+        y_out = float(np.clip(y_out, *Constants.Y_RANGE))
+        if abs(y_out - y) > 1e-3:
+            x_out = model.calculate_x(y)
+            y_out = y
+        x_out = float(np.clip(x_out, *Constants.X_RANGE))
+        if x_out > x_int:
+            y_new = rectifying_line(spec, x_out)
+        else:
+            if x_out <= spec.xB:
+                y_new = x_out
+            else:
+                m = (y_int - spec.xB) / (x_int - spec.xB)
+                b = y_int - m * x_int
+                y_new = m * x_out + b
+        y_new = float(np.clip(y_new, *Constants.Y_RANGE))
+        segments[2 * stage] = ((x, y), (x_out, y_out))
+        segments[2 * stage + 1] = ((x_out, y_out), (x_out, y_new))
+        stages[stage] = (stage + 1, x, y_out, x_out, y_new)
+        stage += 1
+        x, y = x_out, y_new
+    return _frozen(stages[:stage]), _frozen(segments[:2 * stage])
+
+def stage_arrays(rows):
+    # Filas (x_in, y_out, x_out, y_in) a arreglo estructurado y segmentos de la escalera
+    n = len(rows)
+    stages = np.zeros(n, dtype=STAGE_DTYPE)
+    stages['number'] = np.arange(1, n + 1)
+    for i, name in enumerate(('x_in', 'y_out', 'x_out', 'y_in')):
+        stages[name] = rows[:, i]
+    segments = np.empty((2 * n, 2, 2))
+    x_in, y_out, x_out, y_in = rows.T
+    segments[0::2] = np.stack([np.column_stack([x_in, y_out]), np.column_stack([x_out, y_out])], axis=1)
+    segments[1::2] = np.stack([np.column_stack([x_out, y_out]), np.column_stack([x_out, y_in])], axis=1)
+    return _frozen(stages), _frozen(segments)
+
+def curve_intersection(spec):
+    return q_intersection(spec.model, spec.q, spec.zF)
+
+def minimum_reflux(spec):
+    # Incluye el pinch tangente, no solo el corte de la línea q con el equilibrio
+    return pinch_minimum_reflux(spec.model, spec.q, spec.zF, spec.xD).rmin
+
+def solve(spec, stages=True, rmin=False, max_stages=MAX_STAGES, exact=False):
+    # exact=True escalona hasta xB con aceleración en los pinch e informa la etapa fraccionaria
+    point = intersection(spec)
+    valid = is_valid(spec, point)
+    result = {}
+    if stages and exact:
+        rows, result['fractional_stages'], result['pinched'] = step_stages_exact(
+            spec, point, max(max_stages, EXACT_MAX_STAGES))
+        result['stages'], result['segments'] = stage_arrays(rows)
+    elif stages:
+        result['stages'], result['segments'] = step_stages(spec, point, max_stages)
+    if rmin:
+        result['rmin'] = minimum_reflux(spec)
+    return ColumnResult(spec, point, valid, **result)
@@ -0,0 +1,109 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import numpy as np
+from constants import Constants
+from utils.batch import solve_batch
+from utils.energy_balance import duties
+from utils.solver import MAX_STAGES
+
+# Barridos paramétricos: la malla se reparte en bloques entre procesos y cada bloque se
+# resuelve con el motor por lotes y el balance de energía sobre arreglos.
+
+PARAMETERS = ('R', 'q', 'xD', 'zF', 'xB', 'alpha')
+CHUNK_SIZE = 20000
+
+@dataclass(frozen=True)
+class SweepResult:
+    axes: dict
+    n_stages: np.ndarray
+    feed_stage: np.ndarray
+    valid: np.ndarray
+    feasible: np.ndarray
+    Q_R: np.ndarray
+    Q_C: np.ndarray
+
+def build_grid(ranges):
+    # Los parámetros ausentes toman el valor inicial de la ventana; los escalares no son ejes
+    values = dict(Constants.INITIAL_VALUES, alpha=Constants.RELATIVE_VOLATILITY)
+    values.update(ranges)
+    axes = {p: np.atleast_1d(np.asarray(values[p], dtype=float)) for p in PARAMETERS if np.ndim(values[p]) > 0}
+    fixed = {p: float(values[p]) for p in PARAMETERS if p not in axes}
+    mesh = np.meshgrid(*axes.values(), indexing='ij') if axes else []
+    flat = {p: m.ravel() for p, m in zip(axes, mesh)}
+    flat.update({p: np.full(mesh[0].size if axes else 1, v) for p, v in fixed.items()})
+    return axes, flat
+
+def _solve_chunk(start, chunk, model, hvap_light, hvap_heavy, feed_flow, max_stages):
+    result = solve_batch(chunk['R'], chunk['q'], chunk['xD'], chunk['zF'], chunk['xB'], chunk['alpha'],
+                         model=model, max_stages=max_stages, trajectories=False)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        energy = duties(chunk['R'], chunk['zF'], chunk['xD'], chunk['xB'], hvap_light, hvap_heavy, feed_flow)
+    feasible = result.valid & (result.n_stages > 0) & (result.n_stages < max_stages)
+    return start, {
+        'n_stages': result.n_stages,
+        'feed_stage': result.feed_stage,
+        'valid': result.valid,
+        'feasible': feasible,
+        'Q_R': energy.Q_R,
+        'Q_C': energy.Q_C,
+    }
+
+def iter_sweep(ranges, model=None, hvap_light=Constants.HVAP_LIGHT, hvap_heavy=Constants.HVAP_HEAVY,
+               feed_flow=Constants.FEED_FLOW, chunk_size=CHUNK_SIZE, max_workers=None, max_stages=MAX_STAGES):
+    # Genera (inicio, bloque) a medida que terminan los bloques, en cualquier orden
+    axes, flat = build_grid(ranges)
+    size = next(iter(flat.values())).size
+    starts = range(0, size, chunk_size)
+    chunks = ((s, {p: v[s:s + chunk_size] for p, v in flat.items()}) for s in starts)
+    extra = (model, hvap_light, hvap_heavy, feed_flow, max_stages)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(starts) == 1:
+        for start, chunk in chunks:
+            yield _solve_chunk(start, chunk, *extra)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_solve_chunk, start, chunk, *extra) for start, chunk in chunks]
+        for future in as_completed(futures):
+            yield future.result()
+
+def run_sweep(ranges, **kwargs):
+    axes, _ = build_grid(ranges)
+    shape = tuple(len(v) for v in axes.values())
+    size = int(np.prod(shape))
+    fields = {}
+    for start, chunk in iter_sweep(ranges, **kwargs):
+        for name, values in chunk.items():
+            if name not in fields:
+                fields[name] = np.empty(size, dtype=values.dtype)
+            fields[name][start:start + len(values)] = values
+    return SweepResult(axes, **{name: values.reshape(shape) for name, values in fields.items()})
+
+def _reflux_axis(result):
+    if 'R' not in result.axes:
+        raise ValueError("El barrido debe incluir un rango de R.")
+    return list(result.axes).index('R')
+
+def stages_vs_reflux(result):
+    # Curva clásica N frente a R; los puntos no factibles quedan como NaN
+    axis = _reflux_axis(result)
+    stages = np.where(result.feasible, result.n_stages, np.nan)
+    return result.axes['R'], np.moveaxis(stages, axis, -1)
+
+def min_cost_reflux(result, stage_cost=1.0, duty_cost=1.0):
+    # Reflujo de coste mínimo (etapas + servicio del hervidor) para cada punto de los demás ejes
+    axis = _reflux_axis(result)
+    cost = np.where(result.feasible, stage_cost * result.n_stages + duty_cost * result.Q_R, np.inf)
+    cost = np.moveaxis(cost, axis, -1)
+    best = np.argmin(cost, axis=-1)
+    best_cost = np.take_along_axis(cost, best[..., None], axis=-1)[..., 0]
+    R_opt = np.where(np.isfinite(best_cost), result.axes['R'][best], np.nan)
+    return R_opt, best_cost
+
+def sweep_table(ranges, result):
+    # Una fila por punto de la malla (mismo orden que run_sweep), para utils.report.write_table
+    _, flat = build_grid(ranges)
+    columns = {p: flat[p] for p in PARAMETERS}
+    for name in ('n_stages', 'feed_stage', 'valid', 'feasible', 'Q_R', 'Q_C'):
+        columns[name] = np.ravel(getattr(result, name))
+    return columns
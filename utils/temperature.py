@@ -0,0 +1,33 @@
+import numpy as np
+from models.equilibrium import STAGE_DTYPE
+from utils.profiling import timed
+
+# Temperatura de burbuja por etapa. Solo Peng-Robinson la da: interpola su tabla T(x), que
+# sale del Newton vectorizado sobre la ecuación de estado al construir el modelo. Raoult (solo
+# alpha) y los datos personalizados (solo x-y) no conocen sus componentes, así que sus etapas
+# quedan sin temperatura (NaN) y la columna T no se exporta.
+
+TEMPERATURE_DTYPE = np.dtype(STAGE_DTYPE.descr + [('T', np.float64)])
+
+def has_temperature(model):
+    return hasattr(model, 'bubble_temperature')
+
+def bubble_temperature(model, x):
+    # Temperatura de burbuja (K) para todas las composiciones de x a la vez
+    if not has_temperature(model):
+        raise ValueError("Las temperaturas requieren un modelo con componentes (Peng-Robinson).")
+    return np.asarray(model.bubble_temperature(x), dtype=float)
+
+@timed('stage_temperatures')
+def stage_temperatures(model, stages):
+    # Cada etapa está a la temperatura de burbuja del líquido que la abandona; NaN sin componentes
+    if not len(stages) or not has_temperature(model):
+        return np.full(len(stages), np.nan)
+    return bubble_temperature(model, stages['x_out'])
+
+def with_temperature(stages, T):
+    table = np.zeros(len(stages), dtype=TEMPERATURE_DTYPE)
+    for name in STAGE_DTYPE.names:
+        table[name] = stages[name]
+    table['T'] = T
+    return table